@@ -3,7 +3,7 @@ import pathlib
 import typing as t
 from abc import abstractmethod
 
-from backend.meta import *
+from backend.meta import EntityTrackerMeta
 
 
 JSONStr = t.NewType('JSONStr', str)
@@ -1,6 +1,6 @@
 import typing as t
 
-from backend.registry import register_collection
+from backend.registry import register_collection, resolve, Category
 from backend.bases import (CustomDictCollection,
                            BaseAttributeNode,
                            BasePortNode,
@@ -14,15 +14,12 @@ class DataTypeCollection(CustomDictCollection):
 
     @classmethod
     def _decode(cls, data: t.Dict[str, t.Any]) -> t.Any:
-        from backend import registry
-
         # remove class to avoid issues with dict constructor
         data.pop('class')
 
         for name, item_data in data.items():
-            subclass: t.Optional[t.Type[BaseType]] = registry.registered_type(registry.Category.TYPE,
-                                                                              item_data['class'])
-            data[name] = subclass.deserialize(item_data)
+            subclass: t.Type[BaseType] = resolve(item_data['class'], Category.TYPE)
+            data[name] = subclass._decode(item_data)
 
         return cls(**data)
 
@@ -33,17 +30,12 @@ class AttributeCollection(CustomDictCollection):
 
     @classmethod
     def _decode(cls, data: t.Dict[str, t.Any]) -> t.Any:
-        from backend import registry
-
         # remove class to avoid issues with dict constructor
         data.pop('class')
 
         for name, item_data in data.items():
-            subclass: t.Optional[t.Type[DataTypeCollection]] = (registry.registered_type(registry.Category.TYPE,
-                                                                                         item_data['class'])
-                                                                or registry.registered_type(registry.Category.ATTRIBUTE,
-                                                                                            item_data['class']))
-            data[name] = subclass.deserialize(item_data)
+            subclass: t.Type[BaseAttributeNode] = resolve(item_data['class'], Category.TYPE, Category.ATTRIBUTE)
+            data[name] = subclass._decode(item_data)
 
         return cls(**data)
 
@@ -54,18 +46,12 @@ class PortCollection(CustomDictCollection):
 
     @classmethod
     def _decode(cls, data: t.Dict[str, t.Any]) -> t.Any:
-        from backend import registry
-
         # remove class to avoid issues with dict constructor
         data.pop('class')
 
         for name, item_data in data.items():
-            subclass: t.Optional[t.Type[DataTypeCollection]] = (registry.registered_type(registry.Category.TYPE,
-                                                                                         item_data['class'])
-                                                                or registry.registered_type(registry.Category.PORT,
-                                                                                            item_data['class']))
-
-            data[name] = subclass.deserialize(item_data)
+            subclass: t.Type[BasePortNode] = resolve(item_data['class'], Category.TYPE, Category.PORT)
+            data[name] = subclass._decode(item_data)
 
         return cls(**data)
 
@@ -73,3 +59,15 @@ class PortCollection(CustomDictCollection):
 @register_collection
 class NodeCollection(CustomDictCollection):
     valid_types = (BaseNode,)
+
+    @classmethod
+    def _decode(cls, data: t.Dict[str, t.Any]) -> t.Any:
+        # remove class to avoid issues with dict constructor
+        data.pop('class')
+
+        for name, item_data in data.items():
+            subclass: t.Type[BaseNode] = resolve(item_data['class'], Category.NODE)
+            data[name] = subclass._decode(item_data)
+
+        return cls(**data)
+
@@ -1,6 +1,9 @@
 import typing as t
 
-from backend.registry import register_attribute
+from backend.logger import get_logger
+from backend.meta import SingletonMeta, InstanceManager
+from backend.events import EventManager, Events
+from backend.registry import register_attribute, resolve, Category
 from backend.aggregations import DataTypeCollection
 from backend.data_types import (ReferencedNode,
                                 GenericStr,
@@ -9,6 +12,125 @@ from backend.data_types import (ReferencedNode,
 from backend.bases import BaseAttributeNode
 
 
+logger = get_logger(__name__)
+
+
+class ReferenceCycleError(RuntimeError):
+    pass
+
+
+class AttributeResolver(metaclass=SingletonMeta):
+    def __init__(self) -> None:
+        self._values: t.Dict[str, t.Any] = {}
+        # instance id -> attribute ids whose value reads it, and the reverse
+        self._dependents: t.Dict[str, t.Set[str]] = {}
+        self._dependencies: t.Dict[str, t.Set[str]] = {}
+        self._generation = InstanceManager().generation()
+
+        event_manager = EventManager()
+        event_manager.get_event_by_name(Events.PostTypeDataChanged.name).register(self._on_data_changed)
+        for event in (Events.PostTypeDeleted, Events.PostNodeDeleted):
+            event_manager.get_event_by_name(event.name).register(self._on_deleted)
+
+    def resolve(self, attribute: 'GenericAttribute') -> t.Any:
+        if self._generation != InstanceManager().generation():
+            self.clear()
+
+        attribute_id = attribute.get_id()
+        if attribute_id in self._values:
+            return self._values[attribute_id]
+
+        chain = [attribute]
+        visited = {attribute_id}
+        dependencies = set()
+        resolved = True
+
+        current = attribute
+        while True:
+            reference = current.attributes.get('reference')
+            if reference is None:
+                break
+
+            dependencies.add(reference.get_id())
+
+            reference_id = reference.data()
+            if not reference_id:
+                break
+
+            target = InstanceManager().get_instance(reference_id)
+            if target is None:
+                logger.warning(f'Referenced attribute does not exist: {reference_id}')
+                resolved = False
+                break
+
+            if reference_id in visited:
+                raise ReferenceCycleError(f'Attribute reference cycle detected: '
+                                          f'{" -> ".join(link.get_id() for link in chain)} -> {reference_id}')
+
+            chain.append(target)
+            visited.add(reference_id)
+            current = target
+
+        value = current.local_data() if isinstance(current, GenericAttribute) else current.data()
+        if not resolved:
+            return value
+
+        for key in ('value', 'default'):
+            if key in current.attributes:
+                dependencies.add(current.attributes[key].get_id())
+
+        # the attributes of the chain are dependencies too, deleting one of them changes the resolved value
+        dependencies.update(visited)
+
+        for link in chain:
+            self._values[link.get_id()] = value
+            self._dependencies.setdefault(link.get_id(), set()).update(dependencies)
+
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).update(visited)
+
+        return value
+
+    def invalidate(self, attribute_id: str) -> None:
+        self._values.pop(attribute_id, None)
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._dependents.clear()
+        self._dependencies.clear()
+        self._generation = InstanceManager().generation()
+
+    def _on_data_changed(self, instance, *args, **kwargs) -> None:
+        dependents = self._dependents.pop(instance.get_id(), None)
+        if not dependents:
+            return
+
+        for attribute_id in dependents:
+            self._values.pop(attribute_id, None)
+
+    def _on_deleted(self, instance, *args, **kwargs) -> None:
+        # removals seen here are evicted one by one, any other change of generation still clears everything
+        generation = InstanceManager().generation()
+        if generation != self._generation + 1:
+            self.clear()
+            return
+
+        self._generation = generation
+
+        instance_id = instance.get_id()
+        self._on_data_changed(instance)
+        self._values.pop(instance_id, None)
+
+        for dependency in self._dependencies.pop(instance_id, ()):
+            dependents = self._dependents.get(dependency)
+            if dependents is None:
+                continue
+
+            dependents.discard(instance_id)
+            if not dependents:
+                del self._dependents[dependency]
+
+
 class GenericAttribute(BaseAttributeNode):
 
     def init_attributes(self):
@@ -24,17 +146,21 @@ class GenericAttribute(BaseAttributeNode):
 
     @classmethod
     def deserialize_attributes(cls, data):
-        from backend import registry
-        subclass: t.Optional[t.Type[DataTypeCollection]] = registry.registered_type(registry.Category.COLLECTION,
-                                                                                    data['class'])
+        subclass: t.Type[DataTypeCollection] = resolve(data['class'], Category.COLLECTION)
 
-        return {'attributes': subclass.deserialize(data)}
+        return {'attributes': subclass._decode(data)}
 
     def data(self):
-        reference = self.attributes['reference']
+        return AttributeResolver().resolve(self)
+
+    def local_data(self):
+        value = self.attributes.get('value')
+        if value is not None and value.data() is not None:
+            return value.data()
 
-        if reference is not None:
-            return reference.data()
+        default = self.attributes.get('default')
+        if default is not None:
+            return default.data()
 
 
 @register_attribute
@@ -49,18 +175,6 @@ class StringAttribute(GenericAttribute):
 
         return collection
 
-    def data(self):
-        super_result = super().data()
-        if super_result is not None:
-            return super_result
-
-        value = self.attributes['value'].data()
-        if value is not None:
-            return value
-
-        default = self.attributes['default'].data()
-        return default
-
 
 @register_attribute
 class IntAttribute(GenericAttribute):
@@ -72,15 +186,3 @@ class IntAttribute(GenericAttribute):
         collection['default'] = GenericStr()
 
         return collection
-
-    def data(self):
-        super_result = super().data()
-        if super_result is not None:
-            return super_result
-
-        value = self.attributes['value'].data()
-        if value is not None:
-            return value
-
-        default = self.attributes['default'].data()
-        return default
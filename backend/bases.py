@@ -1,14 +1,28 @@
 import json
-import copy
 import pathlib
+import typing as t
 from collections.abc import MutableMapping
 
 from backend.abstracts import (AbstractType,
                                AbstractNode,
                                AbstractEntitySerializer,
                                EntityType)
-from backend.events import *
-from backend.validators import *
+from backend.logger import get_logger
+from backend.events import register_events_decorator, Events
+
+
+logger = get_logger(__name__)
+
+
+def _copy_payload(data: t.Any) -> t.Any:
+    # serialized data only nests dictionaries and lists around immutable values
+    if isinstance(data, dict):
+        return {key: _copy_payload(value) for key, value in data.items()}
+
+    if isinstance(data, list):
+        return [_copy_payload(value) for value in data]
+
+    return data
 
 
 class EntitySerializer(AbstractEntitySerializer):
@@ -20,7 +34,8 @@ class EntitySerializer(AbstractEntitySerializer):
 
     @classmethod
     def deserialize(cls, data, **kwargs) -> t.Any:
-        return cls._decode(copy.deepcopy(data))
+        # decoders consume their data, nested decoders are given the copy made here and do not copy it again
+        return cls._decode(_copy_payload(data))
 
     def dump(self, file_path: pathlib.Path, *args, **kwargs):
         file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -73,12 +88,15 @@ class DictCollection(MutableMapping):
         if not self.validate_item(value):
             return False
 
-        self._internal_data[key] = value
+        self._set_item(key, value)
         return True
 
     def __delitem__(self, key):
         del self._internal_data[key]
 
+    def _set_item(self, key, value):
+        self._internal_data[key] = value
+
     def __iter__(self):
         return iter(self._internal_data)
 
@@ -98,7 +116,9 @@ class DictCollection(MutableMapping):
         if not self.validate_items(items):
             return False
 
-        self.update(items)
+        for key, value in items.items():
+            self._set_item(key, value)
+
         return True
 
     def del_items(self):
@@ -118,28 +138,82 @@ class CustomDictCollection(EntitySerializer, DictCollection):
     serializable_attributes = ['class',
                                'items']
 
+    def __init__(self, **kwargs):
+        # item id -> [item, number of keys holding it], items can be held twice without uniqueness validation
+        self._members: t.Dict[str, t.List[t.Any]] = {}
+
+        super().__init__(**kwargs)
+
+    def __delitem__(self, key):
+        item = self._internal_data[key]
+        super().__delitem__(key)
+
+        self._remove_member(item)
+
+    def _set_item(self, key, value):
+        previous = self._internal_data.get(key)
+        if previous is not None:
+            self._remove_member(previous)
+
+        super()._set_item(key, value)
+
+        member = self._members.get(value.get_id())
+        if member is not None and member[0] is value:
+            member[1] += 1
+        else:
+            self._members[value.get_id()] = [value, 1]
+
+    def _remove_member(self, item):
+        member = self._members.get(item.get_id())
+        if member is None or member[0] is not item:
+            return
+
+        member[1] -= 1
+        if not member[1]:
+            del self._members[item.get_id()]
+
     def get_class(self, serialize=False):
         if serialize:
             return {'class': self.__class__.__name__}
 
         return self.__class__
 
+    def contains_item(self, item):
+        member = self._members.get(item.get_id())
+        return member is not None and member[0] is item
+
+    def contains_id(self, item_id):
+        return item_id in self._members
+
+    def get_item_by_id(self, item_id):
+        member = self._members.get(item_id)
+        return member[0] if member is not None else None
+
     def validate_item(self, item):
         if not isinstance(item, self.valid_types):
             logger.warning(f'{self.__class__.__name__} item value must be of type {self.valid_types} : {item}')
             return False
 
-        if self.validate_uniqueness and item in self.values():
+        if self.validate_uniqueness and self.contains_item(item):
             logger.warning(f'{item} is already present in the collection')
             return False
 
         return True
 
     def validate_items(self, items):
+        batch_ids = set()
+
         for item in items.values():
             if not self.validate_item(item):
                 return False
 
+            if self.validate_uniqueness:
+                if item.get_id() in batch_ids:
+                    logger.warning(f'{item} is present more than once in the items')
+                    return False
+
+                batch_ids.add(item.get_id())
+
         return True
 
 
@@ -194,23 +268,100 @@ class BaseType(EntitySerializer, AbstractType):
 
     @register_events_decorator([Events.PreTypeDataChanged, Events.PostTypeDataChanged])
     def set_data(self, data):
+        data = self.convert(data)
         if not self.validate_data(data):
             return False
 
-        self._data = data
+        return self._write(data)
+
+    @register_events_decorator([Events.PreTypeDataChanged, Events.PostTypeDataChanged])
+    def set_data_unchecked(self, data):
+        """Writes trusted data of the stored type without validating or converting it."""
+        return self._write(data)
+
+    @classmethod
+    def set_data_many(cls, instances, values, validate=True):
+        """Writes one value per instance of this class, validating every value before any is written.
+
+        A write refused by its instance, such as a port type its connections do not accept, restores the values
+        written before it and returns False.
+        """
+        instances = list(instances)
+        values = list(values)
+
+        if len(instances) != len(values):
+            raise ValueError(f'Got {len(values)} values for {len(instances)} instances.')
+
+        if cls.convert.__func__ is not BaseType.convert.__func__:
+            values = [cls.convert(value) for value in values]
+
+        if validate:
+            validator = cls.validator()
+            for index, value in enumerate(values):
+                if not validator(value):
+                    logger.warning(f'{cls.__name__} value {index} is not valid : {type(value)}')
+                    return False
+
+        written = []
+        for index, (instance, value) in enumerate(zip(instances, values)):
+            previous = instance.get_data()
+            if not instance.set_data_unchecked(value):
+                logger.warning(f'{cls.__name__} value {index} was refused by {instance.get_id()}')
+
+                for written_instance, written_value in reversed(written):
+                    written_instance.set_data_unchecked(written_value)
+                return False
+
+            written.append((instance, previous))
+
         return True
 
+    @register_events_decorator([Events.PreTypeDataChanged, Events.PostTypeDataChanged])
     def del_data(self):
         self._data = self.default
 
+    @classmethod
+    def convert(cls, data):
+        """Returns data in the stored form of the class, values are converted before they are validated."""
+        return data
+
+    def _write(self, data):
+        self._data = data
+        return True
+
+    def _restore_data(self, data):
+        self._data = data
+
+    def _restore_slice(self, offset, data):
+        self._data[offset:] = data
+
     def validate_data(self, data):
-        if not isinstance(data, self.valid_types):
-            logger.warning(
-                f'{self.__class__} attribute value must be an instance of {self.valid_types} not {type(data)}.')
+        if not self.validator()(data):
+            self._log_invalid(data)
             return False
 
         return True
 
+    def _log_invalid(self, data):
+        logger.warning(
+            f'{self.__class__} attribute value must be an instance of {self.valid_types} not {type(data)}.')
+
+    @classmethod
+    def validator(cls):
+        """Returns the validation predicate of converted values of the class, compiled once and free of logging."""
+        validator = cls.__dict__.get('_validator')
+        if validator is None:
+            validator = cls._compile_validator()
+            setattr(cls, '_validator', validator)
+
+        return validator
+
+    @classmethod
+    def _compile_validator(cls):
+        valid_types = cls.valid_types
+
+        return lambda data: isinstance(data, valid_types)
+
     @classmethod
     def _decode(cls, data: t.Dict[str, t.Any]) -> t.Any:
         from backend.meta import InstanceManager
@@ -220,9 +371,21 @@ class BaseType(EntitySerializer, AbstractType):
 
 
 class BaseNode(EntitySerializer, AbstractNode):
+    persistent_cache: bool = False
+    memoize: bool = False
+    deterministic: bool = True
+    streaming: bool = False
+    output_dependencies: t.Dict[str, t.Tuple[str, ...]] = {}
+    # input routed to every output while bypassed, defaults to the first input
+    bypass_input: t.Optional[str] = None
+    # value of every output while disabled or bypassed without an input
+    disabled_value: t.Any = None
+
     serializable_attributes = ['class',
                                'type',
                                'id',
+                               'bypassed',
+                               'disabled',
                                'attributes',
                                'inputs',
                                'outputs']
@@ -234,6 +397,8 @@ class BaseNode(EntitySerializer, AbstractNode):
     @register_events_decorator([Events.PreNodeInitialized, Events.PostNodeInitialized])
     def __init__(self, **kwargs):
         self._id = kwargs.pop('id')
+        self._bypassed = bool(kwargs.pop('bypassed', False))
+        self._disabled = bool(kwargs.pop('disabled', False))
 
         self._attributes = None
         self._inputs = None
@@ -295,6 +460,35 @@ class BaseNode(EntitySerializer, AbstractNode):
 
         return self._id
 
+    def get_bypassed(self, serialize=False):
+        if serialize:
+            return {'bypassed': self._bypassed}
+
+        return self._bypassed
+
+    @register_events_decorator([Events.PreNodeStateChanged, Events.PostNodeStateChanged])
+    def set_bypassed(self, bypassed: bool):
+        self._bypassed = bool(bypassed)
+        return True
+
+    def get_disabled(self, serialize=False):
+        if serialize:
+            return {'disabled': self._disabled}
+
+        return self._disabled
+
+    @register_events_decorator([Events.PreNodeStateChanged, Events.PostNodeStateChanged])
+    def set_disabled(self, disabled: bool):
+        self._disabled = bool(disabled)
+        return True
+
+    def bypassed_input(self):
+        name = self.bypass_input or next(iter(self.inputs), None)
+        if name is None or name not in self.inputs:
+            return None
+
+        return name, self.inputs[name]
+
     @property
     def attributes(self):
         return self.get_attributes()
@@ -376,6 +570,54 @@ class BaseNode(EntitySerializer, AbstractNode):
     def deserialize_outputs(cls, data):
         raise NotImplementedError('This method is not implemented and must be defined in the subclass.')
 
+    def output_name(self, port):
+        for name, output_port in self.outputs.items():
+            if output_port is port:
+                return name
+
+        return None
+
+    def output_function(self, name):
+        if name is None:
+            return None
+
+        return getattr(self, f'compute_{name}', None)
+
+    def evaluate_output(self, port=None):
+        function = self.output_function(self.output_name(port)) if port is not None else None
+        if function is not None:
+            return function()
+
+        return self.data()
+
+    def dependencies(self, port=None):
+        if self._disabled:
+            return []
+
+        if self._bypassed:
+            bypassed_input = self.bypassed_input()
+            return [bypassed_input] if bypassed_input else []
+
+        return self.active_inputs(port)
+
+    def inner_nodes(self):
+        """Nodes evaluated on behalf of the node outside of its connections, such as the body of a compound."""
+        return []
+
+    def outer_dependencies(self, owner):
+        """Inputs of the owner of the enclosing evaluation scope that the node reads, such as compound inputs."""
+        return []
+
+    def active_inputs(self, port=None):
+        names = None
+        if port is not None and self.output_dependencies:
+            names = self.output_dependencies.get(self.output_name(port))
+
+        if names is None:
+            return list(self.inputs.items())
+
+        return [(name, self.inputs[name]) for name in names]
+
     def data(self):
         raise NotImplementedError('This method is not implemented and must be defined in the subclass.')
 
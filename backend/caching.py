@@ -0,0 +1,431 @@
+import os
+import json
+import time
+import pickle
+import sqlite3
+import hashlib
+import pathlib
+import typing as t
+from collections import OrderedDict
+
+from backend.logger import get_logger
+from backend.meta import SingletonMeta
+from backend.abstracts import AbstractEntitySerializer
+from backend.data_types import encode_buffer
+from backend.evaluation import EvaluationManager
+from backend.utils import estimate_size
+
+
+logger = get_logger(__name__)
+
+
+def _encode_value(value: t.Any) -> t.Any:
+    # values outside of JSON are encoded as their types serialize them, their repr is neither stable nor complete
+    if isinstance(value, AbstractEntitySerializer):
+        return value.serialize()
+
+    try:
+        return encode_buffer(value)
+    except TypeError:
+        raise TypeError(f'{value.__class__.__name__} values have no stable encoding') from None
+
+
+class NodeHasher:
+    """Merkle-style content hash of a node: its class, its attribute values and the hashes of its upstream nodes.
+
+    Hashing raises a ``TypeError`` for attribute values that neither JSON nor a serializer can encode.
+    """
+
+    def __init__(self) -> None:
+        self._fallback: t.Dict[t.Tuple[t.Tuple[str, ...], str], str] = {}
+
+    def hash(self, node: t.Any) -> str:
+        hashes = self._hashes()
+
+        # nodes shared by several scopes, such as compound bodies, hash differently in each of them
+        key = (EvaluationManager().current_scope(), node.get_id())
+        if key not in hashes:
+            hashes[key] = self._hash(node)
+
+        return hashes[key]
+
+    def port_hash(self, node: t.Any, port: t.Optional[t.Any]) -> str:
+        return f'{self.hash(node)}:{self._port_name(node, port)}'
+
+    @staticmethod
+    def _port_name(node: t.Any, port: t.Optional[t.Any]) -> str:
+        if port is None:
+            return ''
+
+        return node.output_name(port) or port.get_id()
+
+    def _hashes(self) -> t.Dict[t.Tuple[t.Tuple[str, ...], str], str]:
+        evaluation_manager = EvaluationManager()
+        if evaluation_manager.is_evaluating():
+            return evaluation_manager.pass_cache(self)
+
+        self._fallback.clear()
+        return self._fallback
+
+    def _hash(self, node: t.Any) -> str:
+        digest = hashlib.sha256()
+        digest.update(f'{node.__class__.__module__}.{node.__class__.__qualname__}'.encode())
+        digest.update(f'|{node.get_bypassed():d}{node.get_disabled():d}'.encode())
+
+        attributes = {name: attribute.data() for name, attribute in node.attributes.items()}
+        digest.update(json.dumps(attributes, sort_keys=True, default=_encode_value).encode())
+
+        self._hash_inputs(digest, node.dependencies())
+
+        with EvaluationManager().outer_scope() as owner:
+            if owner is not None:
+                self._hash_inputs(digest, node.outer_dependencies(owner))
+
+        return digest.hexdigest()
+
+    def _hash_inputs(self, digest: t.Any, inputs: t.List[t.Tuple[str, t.Any]]) -> None:
+        for name, input_port in sorted(inputs, key=lambda item: item[0]):
+            digest.update(f'|{name}'.encode())
+
+            for output_port in input_port.attributes['connections'].references():
+                parent = output_port.attributes['parent'].reference()
+                digest.update(self.port_hash(parent, output_port).encode())
+
+
+class AbstractResultStore:
+    def get(self, key: str) -> t.Optional[bytes]:
+        raise NotImplementedError('This method must be defined in the subclass.')
+
+    def set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError('This method must be defined in the subclass.')
+
+    def size(self) -> int:
+        raise NotImplementedError('This method must be defined in the subclass.')
+
+    def evict(self, max_bytes: int) -> int:
+        raise NotImplementedError('This method must be defined in the subclass.')
+
+    def clear(self) -> None:
+        raise NotImplementedError('This method must be defined in the subclass.')
+
+
+class SQLiteResultStore(AbstractResultStore):
+    """Result store in one SQLite table.
+
+    Access times of hits are kept in memory and written with the next write, eviction or close, so reads do not
+    commit. Hits of a store that is never written or closed do not refresh the stored access order.
+    """
+
+    def __init__(self, file_path: pathlib.Path):
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._connection = sqlite3.connect(file_path.absolute().as_posix())
+        self._connection.execute('CREATE TABLE IF NOT EXISTS results '
+                                 '(key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed REAL)')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+        self._connection.commit()
+
+        self._size = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        self._accessed: t.Dict[str, float] = {}
+
+    def get(self, key: str) -> t.Optional[bytes]:
+        row = self._connection.execute('SELECT value FROM results WHERE key = ?', (key, )).fetchone()
+        if row is None:
+            return None
+
+        self._accessed[key] = time.time()
+        return row[0]
+
+    def set(self, key: str, value: bytes) -> None:
+        row = self._connection.execute('SELECT size FROM results WHERE key = ?', (key, )).fetchone()
+        self._size -= row[0] if row else 0
+
+        self._accessed.pop(key, None)
+        self._write_accessed()
+        self._connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                                 (key, value, len(value), time.time()))
+        self._connection.commit()
+        self._size += len(value)
+
+    def size(self) -> int:
+        return self._size
+
+    def evict(self, max_bytes: int) -> int:
+        evicted = 0
+
+        self._write_accessed()
+        cursor = self._connection.execute('SELECT key, size FROM results ORDER BY accessed')
+        for key, size in cursor.fetchall():
+            if self._size <= max_bytes:
+                break
+
+            self._connection.execute('DELETE FROM results WHERE key = ?', (key, ))
+            self._size -= size
+            evicted += 1
+
+        self._connection.commit()
+        return evicted
+
+    def clear(self) -> None:
+        self._accessed.clear()
+        self._connection.execute('DELETE FROM results')
+        self._connection.commit()
+        self._size = 0
+
+    def close(self) -> None:
+        self._write_accessed()
+        self._connection.commit()
+        self._connection.close()
+
+    def _write_accessed(self) -> None:
+        # pending access times are committed by the caller
+        if self._accessed:
+            self._connection.executemany('UPDATE results SET accessed = ? WHERE key = ?',
+                                         [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed.clear()
+
+
+class DirectoryResultStore(AbstractResultStore):
+    suffix = '.result'
+
+    def __init__(self, directory: pathlib.Path):
+        directory.mkdir(parents=True, exist_ok=True)
+
+        self._directory = directory
+        self._size = sum(path.stat().st_size for path in self._paths())
+        self._clock = 0
+
+    def get(self, key: str) -> t.Optional[bytes]:
+        path = self._path(key)
+        if not path.is_file():
+            return None
+
+        self._touch(path)
+        return path.read_bytes()
+
+    def set(self, key: str, value: bytes) -> None:
+        path = self._path(key)
+        if path.is_file():
+            self._size -= path.stat().st_size
+
+        path.write_bytes(value)
+        self._touch(path)
+        self._size += len(value)
+
+    def size(self) -> int:
+        return self._size
+
+    def evict(self, max_bytes: int) -> int:
+        evicted = 0
+
+        for path in sorted(self._paths(), key=lambda item: item.stat().st_mtime_ns):
+            if self._size <= max_bytes:
+                break
+
+            self._size -= path.stat().st_size
+            path.unlink()
+            evicted += 1
+
+        return evicted
+
+    def clear(self) -> None:
+        for path in self._paths():
+            path.unlink()
+
+        self._size = 0
+
+    def _touch(self, path: pathlib.Path) -> None:
+        # access order is kept in the modification time, forced to increase even on coarse clocks
+        self._clock = max(time.time_ns(), self._clock + 1000)
+        os.utime(path, ns=(self._clock, self._clock))
+
+    def _path(self, key: str) -> pathlib.Path:
+        # keys may hold any character, their digest is a valid file name that does not collide
+        return self._directory / f'{hashlib.sha256(key.encode()).hexdigest()}{self.suffix}'
+
+    def _paths(self) -> t.List[pathlib.Path]:
+        return list(self._directory.glob(f'*{self.suffix}'))
+
+
+class PersistentResultCache:
+    """Evaluation middleware serving outputs of nodes with ``persistent_cache`` enabled from a result store."""
+
+    def __init__(self, store: AbstractResultStore, max_bytes: int = 1024 * 1024 * 1024):
+        self._store = store
+        self._max_bytes = max_bytes
+        self._hasher = NodeHasher()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, node: t.Any, port: t.Optional[t.Any], proceed: t.Callable) -> t.Any:
+        if not node.persistent_cache:
+            return proceed(node, port)
+
+        try:
+            key = self._hasher.port_hash(node, port)
+        except TypeError as e:
+            logger.warning(f'{node.__class__.__name__} result can not be cached : {e}')
+            return proceed(node, port)
+
+        cached = self._store.get(key)
+        if cached is not None:
+            self.hits += 1
+            return pickle.loads(cached)
+
+        self.misses += 1
+        value = proceed(node, port)
+
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning(f'{node.__class__.__name__} result can not be cached : {e}')
+            return value
+
+        self._store.set(key, payload)
+        if self._store.size() > self._max_bytes:
+            self._store.evict(self._max_bytes)
+
+        return value
+
+    def install(self) -> 'PersistentResultCache':
+        EvaluationManager().register_middleware(self)
+        return self
+
+    def uninstall(self) -> None:
+        EvaluationManager().deregister_middleware(self)
+
+    def store(self) -> AbstractResultStore:
+        return self._store
+
+
+class MemoizationCache(metaclass=SingletonMeta):
+    """Evaluation middleware reusing recent outputs of ``memoize`` nodes for identical attribute and input values.
+
+    Entries are shared by all memoized node classes and bounded by one memory budget with least recently used
+    eviction. Nodes declaring ``deterministic = False`` are always computed. Inputs connected to streams are not
+    materialized for the key, they are compared by the content hash of their upstream nodes instead.
+    """
+    default_max_bytes = 64 * 1024 * 1024
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[t.Hashable, t.Tuple[t.Any, int]] = OrderedDict()
+        self._hasher = NodeHasher()
+        self._max_bytes = self.default_max_bytes
+        self._size = 0
+        self._installed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._class_stats: t.Dict[str, t.List[int]] = {}
+
+    def __call__(self, node: t.Any, port: t.Optional[t.Any], proceed: t.Callable) -> t.Any:
+        if not node.memoize or not node.deterministic:
+            return proceed(node, port)
+
+        key = self._key(node, port)
+        if key is None:
+            return proceed(node, port)
+
+        stats = self._class_stats.setdefault(node.__class__.__name__, [0, 0])
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            stats[0] += 1
+            return entry[0]
+
+        self.misses += 1
+        stats[1] += 1
+
+        value = proceed(node, port)
+        self._store(key, value)
+        return value
+
+    def install(self) -> 'MemoizationCache':
+        if not self._installed:
+            EvaluationManager().register_middleware(self)
+            self._installed = True
+
+        return self
+
+    def uninstall(self) -> None:
+        if self._installed:
+            EvaluationManager().deregister_middleware(self)
+            self._installed = False
+
+    def configure(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def size(self) -> int:
+        return self._size
+
+    def stats(self) -> t.Dict[str, t.Any]:
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size': self._size,
+                'classes': {name: {'hits': hits, 'misses': misses}
+                            for name, (hits, misses) in self._class_stats.items()}}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+        self.hits = self.misses = self.evictions = 0
+        self._class_stats.clear()
+
+    def _key(self, node: t.Any, port: t.Optional[t.Any]) -> t.Optional[t.Hashable]:
+        try:
+            attributes = tuple((name, self._freeze(attribute.data()))
+                               for name, attribute in node.attributes.items())
+            inputs = tuple((name, self._input_key(input_port)) for name, input_port in node.dependencies(port))
+
+            key = (node.__class__, NodeHasher._port_name(node, port), node.get_bypassed(), node.get_disabled(),
+                   attributes, inputs)
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
+
+    def _input_key(self, input_port: t.Any) -> t.Hashable:
+        connections = input_port.attributes['connections'].references()
+
+        # streams are keyed on the content hash of their upstream nodes instead of being materialized
+        if any(output_port.is_streaming() for output_port in connections):
+            return tuple(self._hasher.port_hash(output_port.attributes['parent'].reference(), output_port)
+                         for output_port in connections)
+
+        return self._freeze(input_port.data())
+
+    def _freeze(self, value: t.Any) -> t.Hashable:
+        if isinstance(value, (list, tuple)):
+            return value.__class__, tuple(self._freeze(item) for item in value)
+
+        if isinstance(value, dict):
+            return dict, tuple(sorted((key, self._freeze(item)) for key, item in value.items()))
+
+        if isinstance(value, (set, frozenset)):
+            return frozenset, frozenset(self._freeze(item) for item in value)
+
+        return value
+
+    def _store(self, key: t.Hashable, value: t.Any) -> None:
+        size = estimate_size(value)
+        if size > self._max_bytes:
+            return
+
+        self._entries[key] = (value, size)
+        self._size += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._entries and self._size > self._max_bytes:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
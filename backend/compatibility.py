@@ -0,0 +1,67 @@
+import typing as t
+
+from backend.meta import SingletonMeta
+from backend.data_types import DataTypeEnum
+
+
+DataType = DataTypeEnum.DataType
+Converter = t.Callable[[t.Any], t.Any]
+
+
+class CompatibilityTable(metaclass=SingletonMeta):
+    """Precomputed compatibility of port data types.
+
+    Direct conversions are registered per pair of types and the table is expanded to every pair reachable
+    through a chain of conversions, so checking a connection is a single lookup. Untyped ports are compatible
+    with every type and receive values unchanged.
+    """
+
+    def __init__(self) -> None:
+        self._conversions: t.Dict[t.Tuple[DataType, DataType], Converter] = {}
+        self._table: t.Dict[t.Tuple[DataType, DataType], t.Optional[Converter]] = {}
+
+        self.register_conversion(DataType.Bool, DataType.Int, int)
+        self.register_conversion(DataType.Int, DataType.Float, float)
+
+    def register_conversion(self, source: DataType, target: DataType, converter: Converter) -> None:
+        self._conversions[(source, target)] = converter
+        self._build()
+
+    def deregister_conversion(self, source: DataType, target: DataType) -> None:
+        del self._conversions[(source, target)]
+        self._build()
+
+    def is_compatible(self, source: t.Optional[DataType], target: t.Optional[DataType]) -> bool:
+        return source is None or target is None or (source, target) in self._table
+
+    def converter(self, source: t.Optional[DataType], target: t.Optional[DataType]) -> t.Optional[Converter]:
+        """Returns the conversion applied to values along a compatible connection, None when values pass as is."""
+        if source is None or target is None:
+            return None
+
+        return self._table[(source, target)]
+
+    def _build(self) -> None:
+        table = {(data_type, data_type): None for data_type in DataType}
+
+        for source in DataType:
+            converters = {source: None}
+            pending = [source]
+            while pending:
+                current = pending.pop(0)
+                for (start, target), converter in self._conversions.items():
+                    if start is not current or target in converters:
+                        continue
+
+                    converters[target] = self._compose(converters[current], converter)
+                    table[(source, target)] = converters[target]
+                    pending.append(target)
+
+        self._table = table
+
+    @staticmethod
+    def _compose(first: t.Optional[Converter], second: Converter) -> Converter:
+        if first is None:
+            return second
+
+        return lambda value: second(first(value))
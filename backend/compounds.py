@@ -0,0 +1,315 @@
+import functools
+import typing as t
+
+from backend.logger import get_logger
+from backend.meta import SingletonMeta, InstanceManager
+from backend.registry import register_node
+from backend.events import EventManager, Events
+from backend.topology import TopologyManager
+from backend.evaluation import EvaluationManager
+from backend.attributes import StringAttribute
+from backend.aggregations import AttributeCollection, PortCollection
+from backend.data_types import ReferencedPortList
+from backend.ports import InputPort, OutputPort
+from backend.graphs import Graph
+from backend.nodes import Node
+
+
+logger = get_logger(__name__)
+
+
+Step = t.Tuple[t.Any, OutputPort]
+
+
+@register_node
+class CompoundInputNode(Node):
+    """Provides the value of an input port of the compound instance being evaluated to the compound body."""
+
+    def init_attributes(self):
+        collection = AttributeCollection()
+
+        collection['name'] = StringAttribute(parent=self)
+
+        return collection
+
+    def init_outputs(self):
+        collection = PortCollection()
+
+        collection['product'] = OutputPort(parent=self)
+
+        return collection
+
+    def data(self) -> t.Optional[t.Any]:
+        with EvaluationManager().outer_scope() as instance:
+            if instance is None:
+                return self.disabled_value
+
+            dependencies = self.outer_dependencies(instance)
+            return dependencies[0][1].data() if dependencies else self.disabled_value
+
+    def outer_dependencies(self, owner):
+        name = self.attributes['name'].data()
+        input_port = owner.inputs.get(name)
+
+        return [(name, input_port)] if input_port is not None else []
+
+
+class CompoundPlan:
+    """Evaluation order of the body nodes an exposed output is computed from."""
+    __slots__ = ('output', 'steps')
+
+    def __init__(self, output: Step, steps: t.List[Step]):
+        self.output = output
+        self.steps = steps
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(steps={len(self.steps)})'
+
+
+class CompoundDefinition:
+    """Subgraph shared by every instance of a compound.
+
+    The body exists once, whatever the number of instances. Its nodes are evaluated in a separate scope per
+    instance and read the instance inputs through ``CompoundInputNode``. The evaluation plan of every exposed
+    output is compiled on first use and reused by all instances until the body connections change.
+    """
+
+    def __init__(self, name: str, body: t.Optional[Graph] = None):
+        self.name = name
+        self.body = body if body is not None else Graph()
+
+        self._inputs: t.Dict[str, str] = {}
+        self._outputs: t.Dict[str, t.Tuple[str, str]] = {}
+
+        self._plans: t.Dict[str, CompoundPlan] = {}
+        self._plans_generation: t.Optional[int] = None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.name!r})'
+
+    def inputs(self) -> t.List[str]:
+        return list(self._inputs)
+
+    def outputs(self) -> t.List[str]:
+        return list(self._outputs)
+
+    def add_input(self, name: str) -> CompoundInputNode:
+        if name in self._inputs:
+            raise KeyError(f'{self} already exposes an input named {name}.')
+
+        node_name = f'input_{name}'
+        node = CompoundInputNode(name=name)
+        self.body[node_name] = node
+
+        self._inputs[name] = node_name
+        self._plans.clear()
+        return node
+
+    def input_node(self, name: str) -> CompoundInputNode:
+        return self.body[self._inputs[name]]
+
+    def expose_output(self, name: str, port: OutputPort) -> bool:
+        node = port.attributes['parent'].reference()
+        node_name = next((key for key, value in self.body.items() if value is node), None)
+
+        if node_name is None:
+            logger.warning(f'{port.__class__.__name__} parent node is not part of the body of {self} : '
+                           f'{port.get_id()}')
+            return False
+
+        self._outputs[name] = (node_name, node.output_name(port))
+        self._plans.pop(name, None)
+        return True
+
+    def plan(self, name: str) -> CompoundPlan:
+        generation = InstanceManager().generation()
+        if generation != self._plans_generation:
+            self._plans.clear()
+            self._plans_generation = generation
+
+        plan = self._plans.get(name)
+        if plan is None:
+            plan = self._plans[name] = self._compile(name)
+
+        return plan
+
+    def evaluate(self, instance: t.Any, name: str) -> t.Any:
+        plan = self.plan(name)
+        manager = EvaluationManager()
+
+        with manager.evaluation(), manager.scope(instance):
+            # upstream ports are evaluated iteratively in plan order so the body never recurses deeply
+            active = self._active_ports(plan.output)
+            for node, port in plan.steps:
+                if port.get_id() in active:
+                    manager.evaluate(node, port)
+
+            return manager.evaluate(*plan.output)
+
+    def invalidate(self) -> None:
+        self._plans.clear()
+
+    def serialize(self) -> t.Dict[str, t.Any]:
+        return {'name': self.name,
+                'body': self.body.serialize(),
+                'inputs': dict(self._inputs),
+                'outputs': {name: list(output) for name, output in self._outputs.items()}}
+
+    @classmethod
+    def deserialize(cls, data: t.Dict[str, t.Any]) -> 'CompoundDefinition':
+        definition = cls(data['name'], Graph.deserialize(data['body']))
+
+        definition._inputs = dict(data['inputs'])
+        definition._outputs = {name: tuple(output) for name, output in data['outputs'].items()}
+        return definition
+
+    def _compile(self, name: str) -> CompoundPlan:
+        node_name, port_name = self._outputs[name]
+        node = self.body[node_name]
+        output = (node, node.outputs[port_name])
+
+        steps: t.Dict[str, Step] = {}
+        watched: t.List[str] = []
+        stack = [node]
+        visited = {node.get_id()}
+        while stack:
+            for input_port in stack.pop().inputs.values():
+                watched.append(input_port.attributes['connections'].get_id())
+
+                for upstream_port in input_port.attributes['connections'].references():
+                    upstream_node = upstream_port.attributes['parent'].reference()
+                    steps[upstream_port.get_id()] = (upstream_node, upstream_port)
+
+                    if upstream_node.get_id() not in visited:
+                        visited.add(upstream_node.get_id())
+                        stack.append(upstream_node)
+
+        topology = TopologyManager()
+        topology.flush()
+
+        ordered = sorted(steps.values(), key=lambda step: topology.position(step[0].get_id()) or 0)
+        CompoundLibrary().watch(self, watched)
+
+        return CompoundPlan(output, ordered)
+
+    @staticmethod
+    def _active_ports(output: Step) -> t.Set[str]:
+        active = {output[1].get_id()}
+
+        stack = [output]
+        while stack:
+            node, port = stack.pop()
+            for _, input_port in node.dependencies(port):
+                for upstream_port in input_port.attributes['connections'].references():
+                    if upstream_port.get_id() not in active:
+                        active.add(upstream_port.get_id())
+                        stack.append((upstream_port.attributes['parent'].reference(), upstream_port))
+
+        return active
+
+
+class CompoundLibrary(metaclass=SingletonMeta):
+    """Definitions of the compounds available to ``CompoundNode`` instances, by name."""
+
+    def __init__(self) -> None:
+        self._definitions: t.Dict[str, CompoundDefinition] = {}
+        # connection list id -> definition whose plans were compiled from it
+        self._watched: t.Dict[str, CompoundDefinition] = {}
+
+        EventManager().get_event_by_name(Events.PostTypeDataChanged.name).register(self._on_data_changed)
+
+    def register(self, definition: CompoundDefinition) -> CompoundDefinition:
+        if definition.name in self._definitions:
+            raise KeyError(f'A compound named {definition.name} is already registered.')
+
+        self._definitions[definition.name] = definition
+        return definition
+
+    def deregister(self, name: str) -> None:
+        del self._definitions[name]
+
+    def get(self, name: str) -> t.Optional[CompoundDefinition]:
+        return self._definitions.get(name)
+
+    def definitions(self) -> t.List[CompoundDefinition]:
+        return list(self._definitions.values())
+
+    def clear(self) -> None:
+        self._definitions.clear()
+        self._watched.clear()
+
+    def watch(self, definition: CompoundDefinition, connection_ids: t.Iterable[str]) -> None:
+        for connection_id in connection_ids:
+            self._watched[connection_id] = definition
+
+    def _on_data_changed(self, instance, *args, **kwargs) -> None:
+        if not isinstance(instance, ReferencedPortList):
+            return
+
+        definition = self._watched.get(instance.get_id())
+        if definition is not None:
+            definition.invalidate()
+
+
+@register_node
+class CompoundNode(Node):
+    """Instance of a compound definition, exposing its inputs and outputs as ports."""
+
+    def __init__(self, **kwargs):
+        self._definition_name = kwargs.get('definition')
+
+        super().__init__(**kwargs)
+
+    def init_attributes(self):
+        collection = AttributeCollection()
+
+        collection['definition'] = StringAttribute(parent=self)
+
+        return collection
+
+    def init_inputs(self):
+        collection = PortCollection()
+
+        definition = CompoundLibrary().get(self._definition_name)
+        for name in definition.inputs() if definition else ():
+            collection[name] = InputPort(parent=self)
+
+        return collection
+
+    def init_outputs(self):
+        collection = PortCollection()
+
+        definition = CompoundLibrary().get(self._definition_name)
+        for name in definition.outputs() if definition else ():
+            collection[name] = OutputPort(parent=self)
+
+        return collection
+
+    def definition(self) -> t.Optional[CompoundDefinition]:
+        return CompoundLibrary().get(self.attributes['definition'].data())
+
+    def inner_nodes(self):
+        definition = self.definition()
+        return list(definition.body.values()) if definition is not None else []
+
+    def output_function(self, name):
+        if name not in self.outputs:
+            return None
+
+        return functools.partial(self.compute_output, name)
+
+    def compute_output(self, name: str) -> t.Any:
+        definition = self.definition()
+        if definition is None:
+            logger.warning(f'{self.__class__.__name__} definition is not registered : '
+                           f'{self.attributes["definition"].data()}')
+            return self.disabled_value
+
+        return definition.evaluate(self, name)
+
+    def data(self) -> t.Optional[t.Any]:
+        name = next(iter(self.outputs), None)
+        if name is None:
+            return self.disabled_value
+
+        return self.outputs[name].data()
@@ -1,11 +1,22 @@
 import typing as t
 import enum
-
-from backend.logger import logger
+import json
+import array
+import base64
+import struct
+import sys
+
+from backend.logger import get_logger
+from backend.meta import InstanceManager
 from backend.registry import register_data_type
+from backend.events import register_events_decorator, Events
+from backend.topology import TopologyManager
 from backend.bases import BaseType, BasePortNode, BaseAttributeNode, BaseNode
 
 
+logger = get_logger(__name__)
+
+
 @register_data_type
 class GenericStr(BaseType):
     valid_types = (str, )
@@ -22,11 +33,9 @@ class GenericInt(BaseType):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-    def set_data(self, data):
-        if isinstance(data, float):
-            data = int(data)
-
-        return super().set_data(data)
+    @classmethod
+    def convert(cls, data):
+        return int(data) if isinstance(data, float) else data
 
 
 @register_data_type
@@ -37,11 +46,9 @@ class GenericFloat(BaseType):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-    def set_data(self, data):
-        if isinstance(data, int):
-            data = float(data)
-
-        return super().set_data(data)
+    @classmethod
+    def convert(cls, data):
+        return float(data) if isinstance(data, int) else data
 
 
 @register_data_type
@@ -52,14 +59,201 @@ class GenericList(BaseType):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-    def validate_data(self, data):
-        for sub_data in data:
-            if not isinstance(sub_data, self.valid_types):
-                logger.warning(f'{self.__class__} attribute value must be an instance of '
-                               f'{self.valid_types} not {type(sub_data)}.')
-                return False
+    @classmethod
+    def _compile_validator(cls):
+        valid_types = cls.valid_types
 
-        return True
+        def validate(data):
+            # each distinct element type is checked once instead of every element
+            return all(issubclass(data_type, valid_types) for data_type in set(map(type, data)))
+
+        return validate
+
+    def _log_invalid(self, data):
+        invalid_type = next(type(sub_data) for sub_data in data if not isinstance(sub_data, self.valid_types))
+        logger.warning(f'{self.__class__} attribute value must be an instance of '
+                       f'{self.valid_types} not {invalid_type}.')
+
+
+def _is_ndarray(value: t.Any) -> bool:
+    # arrays can only exist once numpy is imported, so it is never imported here just to check for them
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def _buffer_kind(value: t.Any) -> str:
+    if _is_ndarray(value):
+        return 'numpy'
+
+    if isinstance(value, array.array):
+        return 'array'
+
+    return 'memoryview'
+
+
+_NATIVE_ORDER = '<' if sys.byteorder == 'little' else '>'
+
+
+def _buffer_code(view: memoryview) -> str:
+    # memoryview formats may carry a byte order prefix that does not change the element type
+    return view.format.lstrip('@=<>!')
+
+
+def _buffer_format(view: memoryview) -> str:
+    # the byte order is written explicitly, so the values decode the same on machines of either order
+    order = view.format[0] if view.format[0] in '<>!' else _NATIVE_ORDER
+    return ('>' if order == '!' else order) + _buffer_code(view)
+
+
+def _byteswap(raw: memoryview, itemsize: int) -> memoryview:
+    raw = bytes(raw)
+    swapped = bytearray(len(raw))
+    for offset in range(itemsize):
+        swapped[offset::itemsize] = raw[itemsize - 1 - offset::itemsize]
+
+    return memoryview(swapped)
+
+
+def encode_buffer(value: t.Any, binary: bool = False) -> t.Union[t.Dict[str, t.Any], bytes]:
+    """Encodes a buffer as a JSON compatible mapping with base64 content, or as one raw binary block.
+
+    A binary block is a 4 byte header length, the JSON header and the buffer content.
+    """
+    view = memoryview(value)
+    header = {'kind': _buffer_kind(value),
+              'format': _buffer_format(view),
+              'shape': list(view.shape)}
+
+    if binary:
+        encoded_header = json.dumps(header).encode()
+        return struct.pack('<I', len(encoded_header)) + encoded_header + view.tobytes()
+
+    header['bytes'] = base64.b64encode(view if view.c_contiguous else view.tobytes()).decode('ascii')
+    return header
+
+
+def decode_buffer(payload: t.Union[t.Dict[str, t.Any], bytes]) -> t.Any:
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        payload = memoryview(payload)
+        header_size = struct.unpack_from('<I', payload)[0]
+        header = json.loads(payload[4:4 + header_size].tobytes())
+        raw = payload[4 + header_size:]
+    else:
+        header = payload
+        raw = memoryview(base64.b64decode(header['bytes']))
+
+    kind, buffer_format, shape = header['kind'], header['format'], tuple(header['shape'])
+
+    if kind == 'numpy':
+        # numpy is only imported once a buffer actually needs it, it is a costly import at startup
+        try:
+            import numpy
+            return numpy.frombuffer(raw, dtype=buffer_format).reshape(shape)
+        except ImportError:
+            logger.warning('NumPy is not available, the buffer is loaded as a memoryview.')
+
+    # formats written without a byte order are native
+    order = buffer_format[0] if buffer_format[0] in '<>' else _NATIVE_ORDER
+    buffer_format = buffer_format.lstrip('@=<>!')
+    if order != _NATIVE_ORDER:
+        raw = _byteswap(raw, struct.calcsize(buffer_format))
+
+    if kind == 'array':
+        buffer = array.array(buffer_format)
+        buffer.frombytes(raw)
+        return buffer
+
+    return memoryview(bytearray(raw)).cast(buffer_format, shape)
+
+
+@register_data_type
+class GenericBuffer(BaseType):
+    """Contiguous numeric buffer stored by reference.
+
+    Values are validated from their buffer protocol description only, so validation does not depend on the
+    buffer length and values pass between ports without copies. Subclasses restrict the element type with
+    ``kind`` and ``itemsize`` and the dimensions with ``shape``, where ``None`` accepts any extent.
+    """
+    valid_types = (array.array, memoryview, bytes, bytearray)
+    kind: t.Optional[str] = None
+    itemsize: t.Optional[int] = None
+    shape: t.Optional[t.Tuple[t.Optional[int], ...]] = None
+
+    _kinds = {**dict.fromkeys('bhilqn', 'i'),
+              **dict.fromkeys('BHILQN', 'u'),
+              **dict.fromkeys('efd', 'f'),
+              **dict.fromkeys('cs?', 'b')}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def get_data(self, serialize=False):
+        if serialize:
+            return {'data': encode_buffer(self._data) if self._data is not None else None}
+
+        return self._data
+
+    @classmethod
+    def convert(cls, data):
+        return decode_buffer(data) if isinstance(data, dict) else data
+
+    @classmethod
+    def _compile_validator(cls):
+        valid_types = cls.valid_types
+        mismatch = cls._mismatch
+
+        def validator(data):
+            return (isinstance(data, valid_types) or _is_ndarray(data)) and mismatch(memoryview(data)) is None
+
+        return validator
+
+    def _log_invalid(self, data):
+        if not isinstance(data, self.valid_types) and not _is_ndarray(data):
+            return super()._log_invalid(data)
+
+        logger.warning(f'{self.__class__.__name__} {self._mismatch(memoryview(data))}.')
+
+    @classmethod
+    def _mismatch(cls, view: memoryview) -> t.Optional[str]:
+        if cls.kind is not None and cls._kinds.get(_buffer_code(view)) != cls.kind:
+            return f'elements must be of kind {cls.kind} not {view.format}'
+
+        if cls.itemsize is not None and view.itemsize != cls.itemsize:
+            return f'elements must be {cls.itemsize} bytes not {view.itemsize}'
+
+        if cls.shape is not None and (len(view.shape) != len(cls.shape) or
+                                      any(expected is not None and expected != extent
+                                          for expected, extent in zip(cls.shape, view.shape))):
+            return f'shape must be {cls.shape} not {view.shape}'
+
+        return None
+
+
+@register_data_type
+class FloatBuffer(GenericBuffer):
+    kind = 'f'
+    itemsize = 8
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+
+@register_data_type
+class IntBuffer(GenericBuffer):
+    kind = 'i'
+    itemsize = 8
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+
+@register_data_type
+class ByteBuffer(GenericBuffer):
+    kind = 'u'
+    itemsize = 1
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
 
 
 @register_data_type
@@ -95,10 +289,40 @@ class DataTypeEnum(GenericEnum):
         Bool = bool
 
     def __init__(self, **kwargs):
+        self._owner = None
         kwargs['options'] = self.DataType
 
         super().__init__(**kwargs)
 
+    def owner(self):
+        return self._owner
+
+    def set_owner(self, owner):
+        self._owner = owner
+
+    def get_data(self, serialize=False):
+        if serialize:
+            return {'data': self._data.name if self._data is not None else None}
+
+        return self._data
+
+    def _write(self, data):
+        # the port checks its connections against the new type and rebuilds their conversions
+        if self._owner is not None and data is not self._data and not self._owner.accept_data_type(data):
+            return False
+
+        return super()._write(data)
+
+    def _restore_data(self, data):
+        super()._restore_data(data)
+
+        if self._owner is not None and not self._owner.accept_data_type(data):
+            logger.error(f'Restored {self.__class__.__name__} does not match the connections : {self.get_id()}')
+
+    @classmethod
+    def convert(cls, data):
+        return getattr(cls.DataType, data, None) if isinstance(data, str) else data
+
 
 @register_data_type
 class PortModeEnum(GenericEnum):
@@ -111,11 +335,9 @@ class PortModeEnum(GenericEnum):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-    def set_data(self, data):
-        if isinstance(data, str):
-            data = getattr(self.PortType, data, None)
-
-        return super().set_data(data)
+    @classmethod
+    def convert(cls, data):
+        return getattr(cls.PortType, data, None) if isinstance(data, str) else data
 
 
 class GenericReferencedType(GenericStr):
@@ -123,14 +345,41 @@ class GenericReferencedType(GenericStr):
     reference_type = None
 
     def __init__(self, **kwargs):
+        self._reference = None
+        self._reference_source = None
+        self._reference_generation = None
+
         super().__init__(**kwargs)
 
+    @register_events_decorator([Events.PreTypeDataChanged, Events.PostTypeDataChanged])
     def set_data(self, data):
-        if isinstance(data, self.reference_type):
-            self._data = data.get_id()
-            return True
+        if not self.validate_data(data):
+            return False
+
+        return self._write(data)
+
+    def _write(self, data):
+        self._data = data.get_id()
+        self._cache_reference(data)
+        return True
+
+    def reference(self):
+        if (self._reference_source is not self._data
+                or self._reference_generation != InstanceManager().generation()):
+            reference = InstanceManager().get_instance(self._data) if self._data else None
 
-        return super().set_data(data)
+            # the generation only changes on removal, a missing instance may still be added back later
+            if reference is None and self._data:
+                return None
+
+            self._cache_reference(reference)
+
+        return self._reference
+
+    def _cache_reference(self, reference):
+        self._reference = reference
+        self._reference_source = self._data
+        self._reference_generation = InstanceManager().generation()
 
     @classmethod
     def _decode(cls, data: t.Dict[str, t.Any]) -> t.Any:
@@ -148,25 +397,133 @@ class GenericReferencedType(GenericStr):
 
 class GenericReferencedList(GenericList):
     def __init__(self, **kwargs):
+        self._references = []
+        self._references_source = None
+        self._references_length = None
+        self._references_generation = None
+
         super().__init__(**kwargs)
 
+    @register_events_decorator([Events.PreTypeDataChanged, Events.PostTypeDataChanged])
     def set_data(self, data):
         if not self.validate_data(data):
             return False
 
+        return self._write(data)
+
+    def _write(self, data):
+        if not self._attach_references(data, self._data or ()):
+            return False
+
         self._data = []
         for sub_item in data:
             self._data.append(sub_item.get_id())
 
+        self._cache_references(list(data))
         return True
 
+    @register_events_decorator([Events.PreTypeDataChanged, Events.PostTypeDataChanged])
     def append_data(self, data):
         if not self.validate_data([data, ]):
             return False
 
+        if not self._attach_references([data, ]):
+            return False
+
+        valid_cache = self._is_cache_valid()
+
         self._data.append(data.get_id())
+        if valid_cache:
+            self._references.append(data)
+            self._references_length = len(self._data)
+
+        return True
+
+    @register_events_decorator([Events.PreTypeDataChanged, Events.PostTypeDataChanged])
+    def extend_data(self, data):
+        if not self.validate_data(data):
+            return False
+
+        if not self._attach_references(data):
+            return False
+
+        valid_cache = self._is_cache_valid()
+
+        self._data.extend(sub_item.get_id() for sub_item in data)
+        if valid_cache:
+            self._references.extend(data)
+            self._references_length = len(self._data)
+
         return True
 
+    @register_events_decorator([Events.PreTypeDataChanged, Events.PostTypeDataChanged])
+    def remove_data(self, data):
+        if not self.validate_data(data):
+            return False
+
+        removed_ids = {sub_item.get_id() for sub_item in data}
+
+        self._detach_references([id_ for id_ in self._data if id_ in removed_ids])
+        self._data = [id_ for id_ in self._data if id_ not in removed_ids]
+        return True
+
+    @register_events_decorator([Events.PreTypeDataChanged, Events.PostTypeDataChanged])
+    def del_data(self):
+        self._detach_references(self._data or ())
+        self._data = []
+
+    def references(self):
+        if not self._is_cache_valid():
+            instance_manager = InstanceManager()
+
+            references = []
+            for id_ in self._data or []:
+                instance = instance_manager.get_instance(id_)
+                if instance is None:
+                    logger.warning(f'Referenced instance does not exist: {id_}')
+                    continue
+
+                references.append(instance)
+
+            # the generation only changes on removal, missing instances may still be added back later
+            if len(references) != len(self._data or ()):
+                return references
+
+            self._cache_references(references)
+
+        return self._references
+
+    def _attach_references(self, data, replaced_ids=()):
+        return True
+
+    def _detach_references(self, ids):
+        pass
+
+    def _restore_data(self, data):
+        self._detach_references(self._data or ())
+        super()._restore_data(data)
+
+        if not self._attach_references(self.references()):
+            logger.error(f'Restored {self.__class__.__name__} references could not be attached : {self.get_id()}')
+
+    def _restore_slice(self, offset, data):
+        self._detach_references(self._data[offset:])
+        super()._restore_slice(offset, data)
+
+        if not self._attach_references(self.references()[offset:]):
+            logger.error(f'Restored {self.__class__.__name__} references could not be attached : {self.get_id()}')
+
+    def _is_cache_valid(self):
+        return (self._references_source is self._data
+                and self._references_length == len(self._data)
+                and self._references_generation == InstanceManager().generation())
+
+    def _cache_references(self, references):
+        self._references = references
+        self._references_source = self._data
+        self._references_length = len(self._data) if self._data is not None else None
+        self._references_generation = InstanceManager().generation()
+
     @classmethod
     def _decode(cls, data: t.Dict[str, t.Any]) -> t.Any:
         from backend.meta import ReferenceManager
@@ -177,9 +534,7 @@ class GenericReferencedList(GenericList):
         reference_ids = data.pop('data', [])
         instance = cls(**data)
 
-        for id_ in reference_ids:
-            ReferenceManager().request_deferred_reference(id_, instance.append_data)
-
+        ReferenceManager().request_deferred_references(reference_ids, instance.extend_data, instance.append_data)
         return instance
 
 
@@ -188,8 +543,49 @@ class ReferencedPortList(GenericReferencedList):
     valid_types = (BasePortNode, )
 
     def __init__(self, **kwargs):
+        self._owner = None
+
         super().__init__(**kwargs)
 
+    def owner(self):
+        return self._owner
+
+    def set_owner(self, owner):
+        self._detach_references(self._data or ())
+        self._owner = owner
+
+        if not self._attach_references(self.references()):
+            logger.error(f'{self.__class__.__name__} connections of {owner.get_id()} create a cycle.')
+
+    def _attach_references(self, data, replaced_ids=()):
+        if self._owner is None:
+            return True
+
+        if not self._owner.accept_connections(data):
+            return False
+
+        replaced_ids = set(replaced_ids)
+        new_ids = {port.get_id() for port in data}
+
+        # ports connected before the write keep their converters whatever the outcome
+        if not TopologyManager().replace(self._owner, replaced_ids, data):
+            self._owner.release_connections(new_ids - set(self._data or ()))
+            return False
+
+        self._owner.release_connections(replaced_ids - new_ids)
+        return True
+
+    def _detach_references(self, ids):
+        if self._owner is None:
+            return
+
+        ids = list(ids)
+        self._owner.release_connections(ids)
+
+        topology = TopologyManager()
+        for id_ in ids:
+            topology.disconnect(id_, self._owner.get_id())
+
 
 @register_data_type
 class ReferencedNodeAttribute(GenericReferencedType):
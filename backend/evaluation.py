@@ -0,0 +1,356 @@
+import typing as t
+from contextlib import contextmanager
+
+from backend.meta import SingletonMeta, InstanceManager
+from backend.events import EventManager, Events
+from backend.topology import TopologyManager
+
+
+# evaluation scope, node id and output name of the outputs with their own evaluation function
+Key = t.Tuple[t.Tuple[str, ...], str, t.Optional[str]]
+Middleware = t.Callable[[t.Any, t.Optional[t.Any], t.Callable[[t.Any, t.Optional[t.Any]], t.Any]], t.Any]
+
+
+class EvaluationManager(metaclass=SingletonMeta):
+    """Entry point for node evaluation.
+
+    Every value pulled through an output port is computed here, once per evaluation pass, and passes through
+    the registered middlewares which can serve it from a cache, time it or replace it. Disabled nodes produce
+    their ``disabled_value`` and bypassed nodes pass their bypassed input through unchanged.
+
+    With result retention enabled, outputs of deterministic nodes are also kept across passes. A change of
+    node state, attribute value or connection, including those of inner nodes such as compound bodies, then
+    only invalidates the node and its downstream cone. Nodes reading any other value are not deterministic.
+
+    Pulling an output evaluates its upstream recursively. Past ``max_recursion_depth`` nested evaluations, the
+    upstream of a node is evaluated iteratively, most upstream first, so chains of any length fit in the stack.
+    """
+    max_recursion_depth = 24
+
+    def __init__(self) -> None:
+        self._middlewares: t.List[Middleware] = []
+        self._chain: t.Callable[[t.Any, t.Optional[t.Any]], t.Any] = self._compute
+
+        self._depth = 0
+        self._walking = False
+        self._scope: t.Tuple[str, ...] = ()
+        self._scope_owners: t.List[t.Any] = []
+        self._values: t.Dict[t.Tuple[t.Tuple[str, ...], str, t.Optional[str]], t.Any] = {}
+        self._pass_caches: t.Dict[int, t.Dict[t.Any, t.Any]] = {}
+        self._output_keys: t.Dict[str, t.Optional[str]] = {}
+
+        self._retaining = False
+        self._results: t.Dict[t.Tuple[t.Tuple[str, ...], str, t.Optional[str]], t.Any] = {}
+        self._result_keys: t.Dict[str, t.Set[t.Tuple[t.Tuple[str, ...], str, t.Optional[str]]]] = {}
+        self._type_owners: t.Dict[str, t.Set[str]] = {}
+        self._generation: t.Optional[int] = None
+
+        self._callbacks = [(Events.PostTypeDataChanged, self._on_data_changed),
+                           (Events.PostNodeStateChanged, self._on_state_changed)]
+
+        self._profiler: t.Optional[t.Any] = None
+
+    def register_middleware(self, middleware: Middleware) -> bool:
+        if not callable(middleware):
+            raise TypeError(f'Middleware must be callable, got {type(middleware)}.')
+
+        self._middlewares.append(middleware)
+        self._build_chain()
+        return True
+
+    def deregister_middleware(self, middleware: Middleware) -> bool:
+        if middleware not in self._middlewares:
+            raise KeyError(f'Middleware {middleware} is not registered.')
+
+        self._middlewares.remove(middleware)
+        self._build_chain()
+        return True
+
+    def middlewares(self) -> t.List[Middleware]:
+        return list(self._middlewares)
+
+    def set_profiler(self, profiler: t.Optional[t.Any]) -> None:
+        """Reports every evaluation, cache hit and computation to the profiler, ``None`` stops reporting."""
+        self._profiler = profiler
+
+    def profiler(self) -> t.Optional[t.Any]:
+        return self._profiler
+
+    def enable_retention(self) -> None:
+        if self._retaining:
+            return
+
+        event_manager = EventManager()
+        for event, callback in self._callbacks:
+            event_manager.get_event_by_name(event.name).register(callback)
+
+        self._retaining = True
+
+    def disable_retention(self) -> None:
+        if not self._retaining:
+            return
+
+        event_manager = EventManager()
+        for event, callback in self._callbacks:
+            event_manager.get_event_by_name(event.name).deregister(callback)
+
+        self._retaining = False
+        self.clear_results()
+
+    def is_retaining(self) -> bool:
+        return self._retaining
+
+    def retained(self, node: t.Any) -> bool:
+        return node.get_id() in self._result_keys
+
+    def retained_nodes(self) -> int:
+        return len(self._result_keys)
+
+    def invalidate(self, node_id: str) -> t.Set[str]:
+        """Drops the retained results of a node and of every node downstream of it."""
+        topology = TopologyManager()
+        topology.flush()
+
+        invalidated = {node_id}
+        stack = [node_id]
+        while stack:
+            for successor in topology.successors(stack.pop()):
+                if successor not in invalidated:
+                    invalidated.add(successor)
+                    stack.append(successor)
+
+        for invalidated_id in invalidated:
+            for key in self._result_keys.pop(invalidated_id, ()):
+                self._results.pop(key, None)
+
+        return invalidated
+
+    def clear_results(self) -> None:
+        self._results.clear()
+        self._result_keys.clear()
+        self._type_owners.clear()
+
+    @contextmanager
+    def evaluation(self):
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self._end_pass()
+
+    @contextmanager
+    def scope(self, owner: t.Any):
+        """Evaluates nodes shared by several owners, such as compound bodies, separately for the given owner."""
+        self._scope_owners.append(owner)
+        self._scope = self._scope + (owner.get_id(), )
+        try:
+            yield self
+        finally:
+            self._scope_owners.pop()
+            self._scope = self._scope[:-1]
+
+    def current_scope(self) -> t.Tuple[str, ...]:
+        return self._scope
+
+    @contextmanager
+    def outer_scope(self):
+        """Leaves the innermost scope for the duration of the block and provides its owner."""
+        if not self._scope_owners:
+            yield None
+            return
+
+        owner = self._scope_owners.pop()
+        self._scope = self._scope[:-1]
+        try:
+            yield owner
+        finally:
+            self._scope_owners.append(owner)
+            self._scope = self._scope + (owner.get_id(), )
+
+    def evaluate(self, node: t.Any, port: t.Optional[t.Any] = None) -> t.Any:
+        key = self._key(node, port)
+
+        values = self._values
+        if key in values:
+            if self._profiler is not None:
+                self._profiler.hit(node)
+            return values[key]
+
+        if self._retaining:
+            self._check_generation()
+            if key in self._results:
+                if self._profiler is not None:
+                    self._profiler.hit(node)
+                value = values[key] = self._results[key]
+                return value
+
+        return self._evaluate_key(node, port, key)
+
+    def is_evaluating(self) -> bool:
+        return bool(self._depth)
+
+    def pass_cache(self, owner: t.Any) -> t.Dict[t.Any, t.Any]:
+        """Returns a dictionary owned by the caller that is cleared when the current evaluation pass ends."""
+        return self._pass_caches.setdefault(id(owner), {})
+
+    def _key(self, node: t.Any, port: t.Optional[t.Any]) -> Key:
+        if port is None:
+            return self._scope, node.get_id(), None
+
+        # outputs without their own evaluation function share the node-wide result, looked up once per pass
+        port_id = port.get_id()
+        if port_id in self._output_keys:
+            return self._scope, node.get_id(), self._output_keys[port_id]
+
+        output_name = node.output_name(port)
+        output_key = output_name if node.output_function(output_name) is not None else None
+        if self._depth:
+            self._output_keys[port_id] = output_key
+
+        return self._scope, node.get_id(), output_key
+
+    def _evaluate_key(self, node: t.Any, port: t.Optional[t.Any], key: Key) -> t.Any:
+        with self.evaluation():
+            if self._depth > self.max_recursion_depth and not self._walking:
+                self._evaluate_upstream(node, port)
+
+            if self._profiler is None:
+                value = self._values[key] = self._chain(node, port)
+            else:
+                value = self._values[key] = self._profiler.call(node, port, self._chain)
+
+        if self._retaining and node.deterministic and not key[0]:
+            self._retain(node, key, value)
+
+        return value
+
+    def _evaluate_upstream(self, node: t.Any, port: t.Optional[t.Any]) -> None:
+        # depth first over the dependencies not evaluated yet, each output is evaluated after its upstream
+        values = self._values
+        results = self._results if self._retaining else {}
+
+        order = []
+        visited = set()
+        stack = [(node, port, None, False)]
+        while stack:
+            current, current_port, key, expanded = stack.pop()
+            if expanded:
+                order.append((current, current_port, key))
+                continue
+
+            port_id = current_port.get_id() if current_port is not None else current.get_id()
+            if port_id in visited:
+                continue
+
+            visited.add(port_id)
+            stack.append((current, current_port, key, True))
+
+            for _, input_port in current.dependencies(current_port):
+                for output_port in input_port.attributes['connections'].references():
+                    upstream = output_port.attributes['parent'].reference()
+                    if upstream is None or output_port.get_id() in visited:
+                        continue
+
+                    upstream_key = self._key(upstream, output_port)
+                    if upstream_key not in values and upstream_key not in results:
+                        stack.append((upstream, output_port, upstream_key, False))
+
+        # the node itself is evaluated by the caller, the others find their upstream evaluated already
+        self._walking = True
+        try:
+            for upstream, output_port, key in order[:-1]:
+                if key not in values:
+                    self._evaluate_key(upstream, output_port, key)
+        finally:
+            self._walking = False
+
+    def _end_pass(self) -> None:
+        self._values.clear()
+        self._pass_caches.clear()
+        self._output_keys.clear()
+
+    def _check_generation(self) -> None:
+        # removed instances can leave results referring to nodes or connections that no longer exist
+        generation = InstanceManager().generation()
+        if generation != self._generation:
+            self._generation = generation
+            self.clear_results()
+
+    def _retain(self, node: t.Any, key: t.Tuple[t.Tuple[str, ...], str, t.Optional[str]], value: t.Any) -> None:
+        node_id = node.get_id()
+
+        if node_id not in self._result_keys:
+            for type_id in self._owned_types(node):
+                self._type_owners.setdefault(type_id, set()).add(node_id)
+
+        self._result_keys.setdefault(node_id, set()).add(key)
+        self._results[key] = value
+
+    @staticmethod
+    def _owned_types(node: t.Any) -> t.Iterator[str]:
+        # attribute values including the ones reached through attribute references, and input connections
+        for attribute in node.attributes.values():
+            visited = set()
+            while attribute is not None and attribute.get_id() not in visited:
+                visited.add(attribute.get_id())
+
+                if not hasattr(attribute, 'attributes'):
+                    yield attribute.get_id()
+                    break
+
+                for data_type in attribute.attributes.values():
+                    yield data_type.get_id()
+
+                reference = attribute.attributes.get('reference')
+                attribute = reference.reference() if reference is not None else None
+
+        for input_port in node.inputs.values():
+            yield input_port.attributes['connections'].get_id()
+
+        for inner_node in node.inner_nodes():
+            yield from EvaluationManager._owned_types(inner_node)
+
+    def _on_data_changed(self, instance, *args, **kwargs) -> None:
+        if not self._results:
+            return
+
+        # types read by no retained node, including every type being created, change no retained result
+        owners = self._type_owners.get(instance.get_id())
+        if owners is None:
+            return
+
+        for node_id in list(owners):
+            self.invalidate(node_id)
+
+    def _on_state_changed(self, instance, *args, **kwargs) -> None:
+        self.invalidate(instance.get_id())
+
+    def _build_chain(self) -> None:
+        chain = self._compute
+
+        for middleware in reversed(self._middlewares):
+            chain = self._wrap(middleware, chain)
+
+        self._chain = chain
+
+    @staticmethod
+    def _wrap(middleware: Middleware, proceed: t.Callable[[t.Any, t.Optional[t.Any]], t.Any]):
+        def wrapped(node, port):
+            return middleware(node, port, proceed)
+
+        return wrapped
+
+    def _compute(self, node: t.Any, port: t.Optional[t.Any]) -> t.Any:
+        if self._profiler is not None:
+            self._profiler.computed()
+
+        if node.get_disabled():
+            return node.disabled_value
+
+        if node.get_bypassed():
+            bypassed_input = node.bypassed_input()
+            return bypassed_input[1].data() if bypassed_input else node.disabled_value
+
+        return node.evaluate_output(port)
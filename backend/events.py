@@ -4,10 +4,13 @@ from functools import wraps
 import enum
 
 from backend.registry import register_event
-from backend.logger import logger
+from backend.logger import get_logger
 from backend.meta import SingletonMeta
 
 
+logger = get_logger(__name__)
+
+
 class EventExecutionPhase(enum.Enum):
     UNDEFINED = 'undefined'
     PRE = 'pre'
@@ -16,18 +19,34 @@ class EventExecutionPhase(enum.Enum):
 
 def register_events_decorator(event_enums):
     def decorator(func):
+        # event instances are resolved on first use, the events module registers them after this decorator
+        resolved = {}
+
         @wraps(func)
         def wrapped(*args, **kwargs):
             event_manager = EventManager()
-            events: t.Optional[t.List[Event]] = [event_manager.get_event_by_name(e.name).__class__ for e in event_enums]
+            if resolved.get('manager') is not event_manager:
+                events = [event_manager.get_event_by_name(e.name) for e in event_enums]
+                resolved['manager'] = event_manager
+                resolved['pre'] = [e for e in events if e.Phase == EventExecutionPhase.PRE]
+                resolved['post'] = [e for e in events if e.Phase == EventExecutionPhase.POST]
 
-            for event in (e for e in events if e.Phase == EventExecutionPhase.PRE):
-                event_manager.trigger(event, *args, **kwargs)
+            # every event is counted, only the ones somebody listens to are dispatched
+            for event in resolved['pre']:
+                event._triggered += 1
+                event._callbacks and event.dispatch(*args, **kwargs)
 
-            result = func(*args, **kwargs)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                # post events are not dispatched for a call that raised, listeners of its pre events are told
+                for event in resolved['pre']:
+                    event.cancel_callbacks() and event.cancel(*args, **kwargs)
+                raise
 
-            for event in (e for e in events if e.Phase == EventExecutionPhase.POST):
-                event_manager.trigger(event, *args, **kwargs)
+            for event in resolved['post']:
+                event._triggered += 1
+                event._callbacks and event.dispatch(*args, **kwargs)
 
             return result
         return wrapped
@@ -57,6 +76,8 @@ class Event(AbstractEvent):
 
     def __init__(self):
         self._callbacks = []
+        self._cancel_callbacks = []
+        self._triggered = 0
 
     def __str__(self) -> str:
         return self.__class__.__name__
@@ -74,6 +95,11 @@ class Event(AbstractEvent):
         return True
 
     def trigger(self, *args, **kwargs) -> bool:
+        self._triggered += 1
+        return self.dispatch(*args, **kwargs)
+
+    def dispatch(self, *args, **kwargs) -> bool:
+        """Calls the callbacks without counting a trigger, for callers that count triggers themselves."""
         for callback in self._callbacks:
             try:
                 callback(*args, **kwargs)
@@ -81,9 +107,36 @@ class Event(AbstractEvent):
                 logger.exception(e)
         return True
 
+    def register_cancel(self, callback: t.Callable) -> bool:
+        """Registers a callback called instead of the post event when the call that triggered the event raises."""
+        if not callable(callback):
+            raise TypeError(f'Callback must be a callable function, got {type(callback)}.')
+        self._cancel_callbacks.append(callback)
+        return True
+
+    def deregister_cancel(self, callback: t.Callable) -> bool:
+        if callback not in self._cancel_callbacks:
+            raise KeyError(f'Callback {callback} is not registered.')
+        self._cancel_callbacks.remove(callback)
+        return True
+
+    def cancel(self, *args, **kwargs) -> bool:
+        for callback in self._cancel_callbacks:
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                logger.exception(e)
+        return True
+
     def callbacks(self) -> t.List[t.Callable]:
         return self._callbacks
 
+    def cancel_callbacks(self) -> t.List[t.Callable]:
+        return self._cancel_callbacks
+
+    def triggered(self) -> int:
+        return self._triggered
+
 
 def create_event_class(name: str, execution_phase: EventExecutionPhase) -> t.Type[Event]:
     event_class = type(name, (Event,), {'Phase': execution_phase})
@@ -96,6 +149,8 @@ class Events(enum.Enum):
     PostNodeInitialized = enum.auto()
     PreNodeDeleted = enum.auto()
     PostNodeDeleted = enum.auto()
+    PreNodeStateChanged = enum.auto()
+    PostNodeStateChanged = enum.auto()
     PreTypeInitialized = enum.auto()
     PostTypeInitialized = enum.auto()
     PreTypeDeleted = enum.auto()
@@ -106,6 +161,10 @@ class Events(enum.Enum):
     PostPortInitialized = enum.auto()
     PrePortDeleted = enum.auto()
     PostPortDeleted = enum.auto()
+    PreGraphConnected = enum.auto()
+    PostGraphConnected = enum.auto()
+    PreGraphDisconnected = enum.auto()
+    PostGraphDisconnected = enum.auto()
 
 
 _event_classes = [
@@ -113,6 +172,8 @@ _event_classes = [
     (Events.PostNodeInitialized, EventExecutionPhase.POST),
     (Events.PreNodeDeleted, EventExecutionPhase.PRE),
     (Events.PostNodeDeleted, EventExecutionPhase.POST),
+    (Events.PreNodeStateChanged, EventExecutionPhase.PRE),
+    (Events.PostNodeStateChanged, EventExecutionPhase.POST),
     (Events.PreTypeInitialized, EventExecutionPhase.PRE),
     (Events.PostTypeInitialized, EventExecutionPhase.POST),
     (Events.PreTypeDeleted, EventExecutionPhase.PRE),
@@ -122,7 +183,11 @@ _event_classes = [
     (Events.PrePortInitialized, EventExecutionPhase.PRE),
     (Events.PostPortInitialized, EventExecutionPhase.POST),
     (Events.PrePortDeleted, EventExecutionPhase.PRE),
-    (Events.PostPortDeleted, EventExecutionPhase.POST)
+    (Events.PostPortDeleted, EventExecutionPhase.POST),
+    (Events.PreGraphConnected, EventExecutionPhase.PRE),
+    (Events.PostGraphConnected, EventExecutionPhase.POST),
+    (Events.PreGraphDisconnected, EventExecutionPhase.PRE),
+    (Events.PostGraphDisconnected, EventExecutionPhase.POST)
 ]
 
 for event_enum, phase in _event_classes:
@@ -135,6 +200,9 @@ class EventManager(metaclass=SingletonMeta):
         event_types = registry.registered_types(registry.Category.EVENT)
         self._events = {name: event() for name, event in event_types.items()}
 
+    def events(self) -> t.Dict[str, Event]:
+        return dict(self._events)
+
     def get_event(self, event: t.Type[Event]) -> t.Optional[Event]:
         return self._events.get(event.__name__)
 
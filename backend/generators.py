@@ -0,0 +1,262 @@
+import re
+import json
+import random
+import pathlib
+import typing as t
+
+from backend.meta import InstanceManager
+from backend.nodes import ParameterNode, SumNode
+from backend.graphs import Graph
+
+
+# source index, target index, target input name
+GeneratedEdge = t.Tuple[int, int, str]
+
+_placeholder = re.compile(r'"@(\w+)@"')
+
+
+class GraphSpec:
+    """Synthetic graph described by plain lists: node names, classes, parameter values and edges.
+
+    The description is cheap to generate at any size. It is either built into a ``Graph`` through the public
+    constructors, or written directly as the file ``Graph.dump`` would produce, without creating any instance,
+    which is the practical way to produce graphs of a million nodes.
+    """
+    __slots__ = ('names', 'classes', 'values', 'edges', 'seed')
+
+    def __init__(self, seed: t.Optional[int] = None):
+        self.names: t.List[str] = []
+        self.classes: t.List[t.Type] = []
+        self.values: t.List[t.Optional[int]] = []
+        self.edges: t.List[GeneratedEdge] = []
+        self.seed = seed
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(nodes={len(self.names)}, edges={len(self.edges)})'
+
+    def add_node(self, node_class: t.Type, name: t.Optional[str] = None, value: t.Optional[int] = None) -> int:
+        index = len(self.names)
+
+        self.names.append(name or f'{node_class.__name__.lower()}{index}')
+        self.classes.append(node_class)
+        self.values.append(value)
+        return index
+
+    def connect(self, source: int, target: int, input_name: str = 'entry0') -> None:
+        if source >= target:
+            raise ValueError(f'Edges must point to a later node to keep the graph acyclic: {source} -> {target}')
+
+        self.edges.append((source, target, input_name))
+
+    def sinks(self) -> t.List[int]:
+        sources = {source for source, _, _ in self.edges}
+        return [index for index in range(len(self.names)) if index not in sources]
+
+    def build(self) -> Graph:
+        graph = Graph()
+
+        nodes = []
+        for name, node_class, value in zip(self.names, self.classes, self.values):
+            node = node_class(value=value) if value is not None else node_class()
+            graph[name] = node
+            nodes.append(node)
+
+        graph.connect_many([(nodes[source].outputs['product'], nodes[target].inputs[input_name])
+                            for source, target, input_name in self.edges])
+        return graph
+
+    def dump(self, file_path: pathlib.Path) -> pathlib.Path:
+        """Writes the graph as a ``Graph`` dump, one node at a time, and returns the file path."""
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        ids = _IdFactory(self.seed)
+        output_ids = [None] * len(self.names)
+        connections: t.List[t.Dict[str, t.List[str]]] = [{} for _ in self.names]
+
+        templates: t.Dict[t.Type, _NodeTemplate] = {}
+        with open(file_path.absolute().as_posix(), 'w') as file:
+            file.write('{"class": "Graph"')
+
+            # sources always precede their targets, so output ids are known when a target is written
+            targets = sorted(range(len(self.edges)), key=lambda edge: self.edges[edge][1])
+            position = 0
+            for index, (name, node_class, value) in enumerate(zip(self.names, self.classes, self.values)):
+                while position < len(targets) and self.edges[targets[position]][1] == index:
+                    source, _, input_name = self.edges[targets[position]]
+                    connections[index].setdefault(input_name, []).append(output_ids[source])
+                    position += 1
+
+                template = templates.get(node_class)
+                if template is None:
+                    template = templates[node_class] = _NodeTemplate(node_class)
+
+                node_json, output_ids[index] = template.render(ids, value, connections[index])
+                connections[index] = None
+
+                file.write(f', {json.dumps(name)}: {node_json}')
+
+            file.write('}')
+
+        return file_path
+
+
+class _IdFactory:
+    """Version 4 uuid strings formatted straight from random bits, the ``uuid.UUID`` round trip dominates dumps."""
+    _mask = ~((0xf000 << 64) | (0xc000 << 48))
+    _bits = (0x4000 << 64) | (0x8000 << 48)
+
+    def __init__(self, seed: t.Optional[int]):
+        self._random = random.Random(seed) if seed is not None else random.SystemRandom()
+
+    def __call__(self) -> str:
+        value = '%032x' % (self._random.getrandbits(128) & self._mask | self._bits)
+        return f'{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}'
+
+
+class _NodeTemplate:
+    """Serialized form of a node class with placeholders for its ids, its value and its connections."""
+
+    def __init__(self, node_class: t.Type):
+        node = node_class()
+        data = node.serialize()
+
+        ids = list(self._ids(data))
+        self._output = data['outputs']['product']['id']
+        self._inputs = [name for name in data['inputs'] if name != 'class']
+
+        # the template instances are only needed for their serialized form
+        instance_manager = InstanceManager()
+        node.delete()
+        for instance_id in ids[1:]:
+            if instance_manager.get_instance(instance_id) is not None:
+                instance_manager.remove_instance(instance_manager.get_instance(instance_id))
+
+        for name in self._inputs:
+            data['inputs'][name]['attributes']['connections']['data'] = f'@connections_{name}@'
+
+        value = data['attributes'].get('value')
+        if value is not None:
+            value['attributes']['value']['data'] = '@value@'
+
+        text = json.dumps(data)
+        self._fields = {instance_id: f'id{index}' for index, instance_id in enumerate(ids)}
+        for instance_id, field in self._fields.items():
+            text = text.replace(f'"{instance_id}"', f'"@{field}@"')
+
+        self._parts = _placeholder.split(text)
+
+    def render(self, ids: t.Callable[[], str], value: t.Any,
+               connections: t.Dict[str, t.List[str]]) -> t.Tuple[str, str]:
+        new_ids = {field: ids() for field in self._fields.values()}
+
+        values = {field: f'"{new_id}"' for field, new_id in new_ids.items()}
+        values['value'] = json.dumps(value)
+        for name in self._inputs:
+            values[f'connections_{name}'] = json.dumps(connections.get(name, []))
+
+        # split parts alternate between literal text and placeholder names
+        parts = self._parts[:]
+        parts[1::2] = [values[field] for field in parts[1::2]]
+
+        return ''.join(parts), new_ids[self._fields[self._output]]
+
+    @classmethod
+    def _ids(cls, data: t.Dict[str, t.Any]) -> t.Iterator[str]:
+        if 'id' in data:
+            yield data['id']
+
+        for value in data.values():
+            if isinstance(value, dict):
+                yield from cls._ids(value)
+
+
+class GraphGenerator:
+    """Builds ``ParameterNode`` and ``SumNode`` graph descriptions of controllable topology.
+
+    Parameter nodes are the sources of every graph and sum nodes add up everything connected to them. Inputs
+    receiving several connections alternate between the two inputs of the sum node. Generators given a seed
+    produce the same graph, ids included, on every run.
+    """
+
+    def __init__(self, seed: t.Optional[int] = None):
+        self._seed = seed
+        self._random = random.Random(seed)
+
+    def chain(self, depth: int) -> GraphSpec:
+        spec = GraphSpec(self._seed)
+
+        previous = spec.add_node(ParameterNode, value=1)
+        for _ in range(depth):
+            node = spec.add_node(SumNode)
+            spec.connect(previous, node)
+            previous = node
+
+        return spec
+
+    def fan_out(self, width: int) -> GraphSpec:
+        spec = GraphSpec(self._seed)
+
+        source = spec.add_node(ParameterNode, value=1)
+        for _ in range(width):
+            spec.connect(source, spec.add_node(SumNode))
+
+        return spec
+
+    def tree(self, depth: int, fan_in: int = 2) -> GraphSpec:
+        """Balanced reduction of ``fan_in ** depth`` parameters into one sum node."""
+        spec = GraphSpec(self._seed)
+
+        layer = [spec.add_node(ParameterNode, value=1) for _ in range(fan_in ** depth)]
+        while len(layer) > 1:
+            next_layer = []
+            for start in range(0, len(layer), fan_in):
+                node = spec.add_node(SumNode)
+                self._connect_all(spec, layer[start:start + fan_in], node)
+                next_layer.append(node)
+
+            layer = next_layer
+
+        return spec
+
+    def layered(self, layers: int, width: int, fan_in: int = 2) -> GraphSpec:
+        """``layers`` layers of ``width`` nodes, each reading ``fan_in`` random nodes of the previous layer."""
+        spec = GraphSpec(self._seed)
+
+        layer = [spec.add_node(ParameterNode, value=self._random.randint(0, 9)) for _ in range(width)]
+        for _ in range(layers - 1):
+            next_layer = []
+            for _ in range(width):
+                node = spec.add_node(SumNode)
+                self._connect_all(spec, self._random.sample(layer, min(fan_in, len(layer))), node)
+                next_layer.append(node)
+
+            layer = next_layer
+
+        return spec
+
+    def random_dag(self, nodes: int, fan_in: int = 2, sources: int = 1, window: t.Optional[int] = None) -> GraphSpec:
+        """Random acyclic graph where every sum node reads up to ``fan_in`` earlier nodes.
+
+        With a window, upstream nodes are picked among the ``window`` preceding nodes only, which bounds the
+        length of connections and makes deep graphs instead of shallow ones.
+        """
+        spec = GraphSpec(self._seed)
+
+        for _ in range(max(sources, 1)):
+            spec.add_node(ParameterNode, value=self._random.randint(0, 9))
+
+        for index in range(len(spec), nodes):
+            start = max(index - window, 0) if window else 0
+            count = min(fan_in, index - start)
+            node = spec.add_node(SumNode)
+            self._connect_all(spec, self._random.sample(range(start, index), count), node)
+
+        return spec
+
+    @staticmethod
+    def _connect_all(spec: GraphSpec, sources: t.Iterable[int], target: int) -> None:
+        for position, source in enumerate(sources):
+            spec.connect(source, target, f'entry{position % 2}')
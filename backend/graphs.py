@@ -0,0 +1,145 @@
+import typing as t
+
+from backend.logger import get_logger
+from backend.meta import InstanceManager
+from backend.registry import register_collection
+from backend.events import EventManager, Events
+from backend.topology import TopologyManager
+from backend.aggregations import NodeCollection
+from backend.ports import InputPort, OutputPort
+
+
+logger = get_logger(__name__)
+
+
+Edge = t.Tuple[OutputPort, InputPort]
+
+
+@register_collection
+class Graph(NodeCollection):
+    """Collection of nodes connected through the ports of its members.
+
+    Edges are read from ``TopologyManager``, which records every connection, so they stay current when ports are
+    connected directly instead of through the graph.
+    """
+
+    def edges(self) -> t.List[t.Tuple[str, str]]:
+        topology_manager = TopologyManager()
+
+        return [edge
+                for node in self.values()
+                for input_port in node.inputs.values()
+                for edge in topology_manager.port_edges(input_port.get_id())]
+
+    def upstream(self, input_port: InputPort) -> t.Set[str]:
+        return {output_id for output_id, _ in TopologyManager().port_edges(input_port.get_id())}
+
+    def downstream(self, output_port: OutputPort) -> t.Set[str]:
+        instance_manager = InstanceManager()
+
+        input_ids = set()
+        for _, input_id in TopologyManager().port_edges(output_port.get_id()):
+            input_port = instance_manager.get_instance(input_id)
+            if input_port is not None and self.contains_id(input_port.attributes['parent'].data()):
+                input_ids.add(input_id)
+
+        return input_ids
+
+    def is_connected(self, output_port: OutputPort, input_port: InputPort) -> bool:
+        return TopologyManager().has_edge(output_port.get_id(), input_port.get_id())
+
+    def topological_order(self) -> t.List[t.Any]:
+        return TopologyManager().sort(self.values())
+
+    def connect(self, output_port: OutputPort, input_port: InputPort) -> bool:
+        return self.connect_many([(output_port, input_port)])
+
+    def disconnect(self, output_port: OutputPort, input_port: InputPort) -> bool:
+        return self.disconnect_many([(output_port, input_port)])
+
+    def connect_many(self, edges: t.Iterable[Edge]) -> bool:
+        """Connects all edges or none of them, with one pair of graph events for the batch.
+
+        The connections of each input port still change with one ``extend_data``, so every input port also triggers
+        its own type data events, which history and the evaluation caches rely on.
+        """
+        edges = list(edges)
+        grouped = self._group_edges(edges)
+        if grouped is None:
+            return False
+
+        new_edges = []
+        for input_port, output_ports in grouped.values():
+            known_ids = self.upstream(input_port)
+            unique_ports = {port.get_id(): port for port in output_ports if port.get_id() not in known_ids}
+            new_edges.extend((output_port, input_port) for output_port in unique_ports.values())
+
+        if not new_edges:
+            return True
+
+        event_manager = EventManager()
+        event_manager.get_event_by_name(Events.PreGraphConnected.name).trigger(self, new_edges)
+
+        applied = []
+        for input_port, output_ports in self._group_edges(new_edges, validate=False).values():
+            if not input_port.attributes['connections'].extend_data(output_ports):
+                for applied_input, applied_outputs in applied:
+                    applied_input.attributes['connections'].remove_data(applied_outputs)
+
+                return False
+
+            applied.append((input_port, output_ports))
+
+        event_manager.get_event_by_name(Events.PostGraphConnected.name).trigger(self, new_edges)
+        return True
+
+    def disconnect_many(self, edges: t.Iterable[Edge]) -> bool:
+        edges = list(edges)
+        grouped = self._group_edges(edges)
+        if grouped is None:
+            return False
+
+        removed_edges = [(output_port, input_port)
+                         for input_port, output_ports in grouped.values()
+                         for output_port in output_ports
+                         if self.is_connected(output_port, input_port)]
+
+        if not removed_edges:
+            return True
+
+        event_manager = EventManager()
+        event_manager.get_event_by_name(Events.PreGraphDisconnected.name).trigger(self, removed_edges)
+
+        for input_port, output_ports in self._group_edges(removed_edges, validate=False).values():
+            input_port.attributes['connections'].remove_data(output_ports)
+
+        event_manager.get_event_by_name(Events.PostGraphDisconnected.name).trigger(self, removed_edges)
+        return True
+
+    def _group_edges(self, edges: t.List[Edge],
+                     validate: bool = True) -> t.Optional[t.Dict[str, t.Tuple[InputPort, t.List[OutputPort]]]]:
+        grouped = {}
+        for output_port, input_port in edges:
+            if validate and not self._validate_edge(output_port, input_port):
+                return None
+
+            entry = grouped.get(input_port.get_id())
+            if entry is None:
+                entry = grouped[input_port.get_id()] = (input_port, [])
+
+            entry[1].append(output_port)
+
+        return grouped
+
+    def _validate_edge(self, output_port: t.Any, input_port: t.Any) -> bool:
+        if not isinstance(output_port, OutputPort) or not isinstance(input_port, InputPort):
+            logger.warning(f'{self.__class__.__name__} edge must connect an {OutputPort.__name__} '
+                           f'to an {InputPort.__name__} : {output_port} -> {input_port}')
+            return False
+
+        for port in (output_port, input_port):
+            if not self.contains_id(port.attributes['parent'].data()):
+                logger.warning(f'{port.__class__.__name__} parent node is not part of the graph : {port.get_id()}')
+                return False
+
+        return True
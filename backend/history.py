@@ -0,0 +1,387 @@
+import typing as t
+from collections import deque
+from contextlib import contextmanager
+
+from backend.logger import get_logger
+from backend.meta import SingletonMeta, InstanceManager
+from backend.events import EventManager, Events
+from backend.utils import estimate_size
+
+
+logger = get_logger(__name__)
+
+
+class Operation:
+    """A single reversible change recorded by the history."""
+    __slots__ = ('instance', )
+
+    overhead = 64
+
+    def __init__(self, instance: t.Any):
+        self.instance = instance
+
+    def undo(self) -> None:
+        raise NotImplementedError('This method is not implemented and must be defined in the subclass.')
+
+    def redo(self) -> None:
+        raise NotImplementedError('This method is not implemented and must be defined in the subclass.')
+
+    def size(self) -> int:
+        return self.overhead
+
+
+class DataChangedOperation(Operation):
+    __slots__ = ('old', 'new')
+
+    def __init__(self, instance: t.Any, old: t.Any, new: t.Any):
+        super().__init__(instance)
+
+        self.old = old
+        self.new = new
+
+    def undo(self) -> None:
+        self.instance._restore_data(self.old)
+
+    def redo(self) -> None:
+        self.instance._restore_data(self.new)
+
+    def size(self) -> int:
+        return self.overhead + estimate_size(self.old) + estimate_size(self.new)
+
+
+class DataAppendedOperation(Operation):
+    """In-place growth of a list value, stored as the appended tail only."""
+    __slots__ = ('offset', 'tail')
+
+    def __init__(self, instance: t.Any, offset: int, tail: t.List[t.Any]):
+        super().__init__(instance)
+
+        self.offset = offset
+        self.tail = tail
+
+    def undo(self) -> None:
+        self.instance._restore_slice(self.offset, [])
+
+    def redo(self) -> None:
+        self.instance._restore_slice(self.offset, self.tail)
+
+    def size(self) -> int:
+        return self.overhead + estimate_size(self.tail)
+
+
+class InstanceCreatedOperation(Operation):
+    __slots__ = ()
+
+    def undo(self) -> None:
+        InstanceManager().remove_instance(self.instance)
+
+    def redo(self) -> None:
+        InstanceManager().add_instance(self.instance)
+
+
+class InstanceDeletedOperation(Operation):
+    __slots__ = ()
+
+    def undo(self) -> None:
+        InstanceManager().add_instance(self.instance)
+
+    def redo(self) -> None:
+        InstanceManager().remove_instance(self.instance)
+
+
+class Transaction:
+    __slots__ = ('label', 'operations', 'size')
+
+    def __init__(self, label: str, operations: t.List[Operation]):
+        self.label = label
+        self.operations = operations
+        self.size = sum(operation.size() for operation in operations)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.label!r}, operations={len(self.operations)})'
+
+    def undo(self) -> None:
+        for operation in reversed(self.operations):
+            operation.undo()
+
+    def redo(self) -> None:
+        for operation in self.operations:
+            operation.redo()
+
+
+class HistoryManager(metaclass=SingletonMeta):
+    default_max_steps = 100
+    default_max_memory = 16 * 1024 * 1024
+
+    def __init__(self) -> None:
+        self._undo_stack: t.Deque[Transaction] = deque()
+        self._redo_stack: t.List[Transaction] = []
+
+        self._max_steps = self.default_max_steps
+        self._max_memory = self.default_max_memory
+        self._memory = 0
+
+        self._enabled = False
+        self._applying = False
+
+        self._pending: t.List[Operation] = []
+        self._transactions: t.List[str] = []
+        self._event_depth = 0
+        self._captures: t.Dict[int, t.List[t.Any]] = {}
+        self._initializing: t.Set[int] = set()
+
+        self._callbacks = [(Events.PreTypeDataChanged, self._on_pre_data_changed),
+                           (Events.PostTypeDataChanged, self._on_post_data_changed),
+                           (Events.PreTypeInitialized, self._on_pre_initialized),
+                           (Events.PostTypeInitialized, self._on_post_initialized),
+                           (Events.PreNodeInitialized, self._on_pre_initialized),
+                           (Events.PostNodeInitialized, self._on_post_initialized),
+                           (Events.PreTypeDeleted, self._on_pre_event),
+                           (Events.PostTypeDeleted, self._on_post_deleted),
+                           (Events.PreNodeDeleted, self._on_pre_event),
+                           (Events.PostNodeDeleted, self._on_post_deleted)]
+        # pre events of calls that raised
+        self._cancel_callbacks = [(Events.PreTypeDataChanged, self._on_cancelled),
+                                  (Events.PreTypeInitialized, self._on_cancelled),
+                                  (Events.PreNodeInitialized, self._on_cancelled),
+                                  (Events.PreTypeDeleted, self._on_cancelled),
+                                  (Events.PreNodeDeleted, self._on_cancelled)]
+
+    def enable(self) -> None:
+        if self._enabled:
+            return
+
+        event_manager = EventManager()
+        for event, callback in self._callbacks:
+            event_manager.get_event_by_name(event.name).register(callback)
+        for event, callback in self._cancel_callbacks:
+            event_manager.get_event_by_name(event.name).register_cancel(callback)
+
+        self._enabled = True
+
+    def disable(self) -> None:
+        if not self._enabled:
+            return
+
+        self.commit()
+
+        event_manager = EventManager()
+        for event, callback in self._callbacks:
+            event_manager.get_event_by_name(event.name).deregister(callback)
+        for event, callback in self._cancel_callbacks:
+            event_manager.get_event_by_name(event.name).deregister_cancel(callback)
+
+        self._enabled = False
+
+    def is_enabled(self) -> bool:
+        return self._enabled
+
+    def configure(self, max_steps: t.Optional[int] = None, max_memory: t.Optional[int] = None) -> None:
+        if max_steps is not None:
+            self._max_steps = max_steps
+
+        if max_memory is not None:
+            self._max_memory = max_memory
+
+        self._evict()
+
+    def memory(self) -> int:
+        return self._memory
+
+    def undo_steps(self) -> t.List[Transaction]:
+        return list(self._undo_stack)
+
+    def redo_steps(self) -> t.List[Transaction]:
+        return list(reversed(self._redo_stack))
+
+    def can_undo(self) -> bool:
+        return bool(self._undo_stack or self._pending)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo_stack)
+
+    def clear(self) -> None:
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+        self._pending.clear()
+        self._transactions.clear()
+        self._captures.clear()
+        self._initializing.clear()
+        self._event_depth = 0
+        self._memory = 0
+
+    @contextmanager
+    def transaction(self, label: str = ''):
+        self._transactions.append(label)
+        try:
+            yield self
+        finally:
+            self._transactions.pop()
+            if not self._transactions:
+                self.commit(label)
+
+    def commit(self, label: str = '') -> t.Optional[Transaction]:
+        self._event_depth = 0
+        self._captures.clear()
+        self._initializing.clear()
+
+        if not self._pending:
+            return None
+
+        transaction = Transaction(label, self._pending)
+        self._pending = []
+
+        self._undo_stack.append(transaction)
+        self._memory += transaction.size
+
+        for step in self._redo_stack:
+            self._memory -= step.size
+        self._redo_stack.clear()
+
+        self._evict()
+        return transaction
+
+    def undo(self) -> bool:
+        self.commit()
+
+        if not self._undo_stack:
+            return False
+
+        transaction = self._undo_stack.pop()
+        self._apply(transaction.undo, transaction)
+        self._redo_stack.append(transaction)
+        return True
+
+    def redo(self) -> bool:
+        self.commit()
+
+        if not self._redo_stack:
+            return False
+
+        transaction = self._redo_stack.pop()
+        self._apply(transaction.redo, transaction)
+        self._undo_stack.append(transaction)
+        return True
+
+    def _apply(self, func: t.Callable[[], None], transaction: Transaction) -> None:
+        self._applying = True
+        try:
+            func()
+
+            event_manager = EventManager()
+            for instance in {id(op.instance): op.instance for op in transaction.operations
+                             if isinstance(op, (DataChangedOperation, DataAppendedOperation))}.values():
+                event_manager.get_event_by_name(Events.PostTypeDataChanged.name).trigger(instance)
+        finally:
+            self._applying = False
+
+    def _evict(self) -> None:
+        # redo steps are the furthest from the current state, they go first when the memory is exceeded
+        while self._redo_stack and self._memory > self._max_memory:
+            evicted = self._redo_stack.pop(0)
+            self._memory -= evicted.size
+            logger.debug('Evicted redo step: %r', evicted)
+
+        while self._undo_stack and (len(self._undo_stack) > self._max_steps or self._memory > self._max_memory):
+            evicted = self._undo_stack.popleft()
+            self._memory -= evicted.size
+            logger.debug('Evicted history step: %r', evicted)
+
+    def _record(self, operation: Operation) -> None:
+        self._pending.append(operation)
+
+    def _enter(self) -> bool:
+        if self._applying:
+            return False
+
+        self._event_depth += 1
+        return True
+
+    def _exit(self) -> bool:
+        if self._applying:
+            return False
+
+        self._event_depth = max(self._event_depth - 1, 0)
+        return True
+
+    def _auto_commit(self) -> None:
+        if not self._event_depth and not self._transactions:
+            self.commit()
+
+    def _on_pre_event(self, instance, *args, **kwargs) -> None:
+        self._enter()
+
+    def _on_pre_initialized(self, instance, *args, **kwargs) -> None:
+        if self._enter():
+            self._initializing.add(id(instance))
+
+    def _on_post_initialized(self, instance, *args, **kwargs) -> None:
+        if not self._exit():
+            return
+
+        self._initializing.discard(id(instance))
+        self._record(InstanceCreatedOperation(instance))
+        self._auto_commit()
+
+    def _on_post_deleted(self, instance, *args, **kwargs) -> None:
+        if not self._exit():
+            return
+
+        self._record(InstanceDeletedOperation(instance))
+        self._auto_commit()
+
+    def _on_pre_data_changed(self, instance, *args, **kwargs) -> None:
+        if not self._enter() or id(instance) in self._initializing:
+            return
+
+        capture = self._captures.get(id(instance))
+        if capture:
+            capture[2] += 1
+            return
+
+        data = instance.get_data()
+        self._captures[id(instance)] = [data, len(data) if isinstance(data, list) else None, 1]
+
+    def _on_post_data_changed(self, instance, *args, **kwargs) -> None:
+        if not self._exit():
+            return
+
+        capture = self._captures.get(id(instance))
+        if capture:
+            capture[2] -= 1
+            if not capture[2]:
+                del self._captures[id(instance)]
+                self._record_data_change(instance, *capture[:2])
+
+        self._auto_commit()
+
+    def _on_cancelled(self, instance, *args, **kwargs) -> None:
+        # the call raised, its post event never comes, what it changed before raising is still recorded
+        if not self._exit():
+            return
+
+        self._initializing.discard(id(instance))
+
+        capture = self._captures.get(id(instance))
+        if capture:
+            capture[2] -= 1
+            if not capture[2]:
+                del self._captures[id(instance)]
+                self._record_data_change(instance, *capture[:2])
+
+        self._auto_commit()
+
+    def _record_data_change(self, instance, old: t.Any, old_length: t.Optional[int]) -> None:
+        new = instance.get_data()
+
+        if new is old and old_length is not None:
+            if len(new) > old_length:
+                self._record(DataAppendedOperation(instance, old_length, new[old_length:]))
+            elif len(new) < old_length:
+                logger.warning(f'In-place shrinking of {instance.__class__.__name__} data can not be recorded.')
+            return
+
+        if new is old or new == old:
+            return
+
+        self._record(DataChangedOperation(instance, old, new))
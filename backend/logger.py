@@ -1,9 +1,29 @@
 import logging
+import typing as t
 
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(levelname)s %(name)s %(module)s:%(funcName)s:%(lineno)d %(message)s",
-)
+LOG_FORMAT = "%(levelname)s %(name)s %(module)s:%(funcName)s:%(lineno)d %(message)s"
 
-logger = logging.getLogger(__name__)
+# the library only emits records, applications decide where they go
+logger = logging.getLogger('backend')
+logger.addHandler(logging.NullHandler())
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Returns the logger of a backend subsystem, below the package logger so it can be tuned on its own."""
+    if name != logger.name and not name.startswith(f'{logger.name}.'):
+        name = f'{logger.name}.{name}'
+
+    return logging.getLogger(name)
+
+
+def configure(level: int = logging.DEBUG,
+              handler: t.Optional[logging.Handler] = None,
+              fmt: str = LOG_FORMAT) -> logging.Handler:
+    """Sends backend records at or above the level to the handler, standard error by default."""
+    handler = handler or logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(fmt))
+
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return handler
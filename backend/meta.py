@@ -1,7 +1,11 @@
 import uuid
+import logging
 import typing as t
 
-from backend.logger import logger
+from backend.logger import get_logger
+
+
+logger = get_logger(__name__)
 
 
 class SingletonMeta(type):
@@ -35,6 +39,7 @@ class EntityTrackerMeta(type):
 class InstanceManager(metaclass=SingletonMeta):
     def __init__(self) -> None:
         self._instances: t.Dict[str, t.Any] = {}
+        self._generation = 0
 
     def is_valid(self, unique_id: str) -> bool:
         return unique_id not in self._instances
@@ -46,6 +51,7 @@ class InstanceManager(metaclass=SingletonMeta):
         instance_id = instance.get_id()
         if instance_id in self._instances:
             self._instances.pop(instance_id)
+            self._generation += 1
         else:
             logger.warning(f'Instance does not exist or already removed: {instance_id}')
 
@@ -55,20 +61,69 @@ class InstanceManager(metaclass=SingletonMeta):
     def instances(self) -> t.Dict[str, t.Any]:
         return self._instances
 
+    def generation(self) -> int:
+        return self._generation
+
     def clear_all(self) -> None:
         self._instances.clear()
+        self._generation += 1
+
+
+class UnresolvedReferencesError(LookupError):
+    """Raised by a strict ``ReferenceManager`` when referenced instances do not exist."""
+
+    def __init__(self, missing: t.Dict[str, int]):
+        # missing instance id -> number of references to it
+        self.missing = missing
+
+        preview = ', '.join(list(missing)[:5])
+        super().__init__(f'{len(missing)} referenced instances do not exist '
+                         f'({sum(missing.values())} references): {preview}{", ..." if len(missing) > 5 else ""}')
 
 
 class ReferenceManager(metaclass=SingletonMeta):
+    """Binds references between instances once every instance of a load exists.
+
+    References to one instance are bound with their setter when the ``with`` block exits. References held by
+    one list are requested together and bound with a single call, so a list is validated and attached once
+    whatever its length. References to missing instances are reported together as one error, logged by
+    default and raised once everything else is bound when the load is strict, ``with manager.load(strict=True)``.
+    """
+
     def __init__(self) -> None:
         self._references: t.Dict[str, list[t.Callable[[t.Any], None]]] = {}
+        # instance ids, setter of all the instances, optional setter of one instance used if the first fails
+        self._bulk_references: t.List[t.Tuple[t.List[str], t.Callable, t.Optional[t.Callable]]] = []
+
+        self._strict = False
+        self._unresolved: t.Dict[str, int] = {}
 
     def __enter__(self) -> 'ReferenceManager':
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
-        self._resolve_references()
-        self._references.clear()
+        strict, self._strict = self._strict, False
+        try:
+            self._resolve_references()
+        finally:
+            self._references.clear()
+            self._bulk_references.clear()
+
+        if self._unresolved and strict and exc_type is None:
+            raise UnresolvedReferencesError(dict(self._unresolved))
+
+    def load(self, strict: bool = False) -> 'ReferenceManager':
+        """Returns the manager for one ``with`` block, raising on missing references if ``strict``."""
+        self._strict = strict
+        return self
+
+    def pending(self) -> int:
+        return (sum(len(setters) for setters in self._references.values()) +
+                sum(len(instance_ids) for instance_ids, _, _ in self._bulk_references))
+
+    def unresolved(self) -> t.Dict[str, int]:
+        """Returns the missing instance ids of the last resolution with the number of references to each."""
+        return dict(self._unresolved)
 
     def request_instant_reference(self, instance_id: str) -> t.Optional[t.Any]:
         return InstanceManager().get_instance(instance_id)
@@ -78,19 +133,66 @@ class ReferenceManager(metaclass=SingletonMeta):
             return
         self._request_reference(instance_id, reference_setter)
 
+    def request_deferred_references(self,
+                                    instance_ids: t.Iterable[str],
+                                    references_setter: t.Callable[[t.List[t.Any]], t.Any],
+                                    reference_setter: t.Optional[t.Callable[[t.Any], t.Any]] = None) -> None:
+        """Requests references bound together, in order, with one call of ``references_setter``.
+
+        When it returns False, the instances are bound one at a time with ``reference_setter`` instead, so the
+        valid ones are kept.
+        """
+        instance_ids = [instance_id for instance_id in instance_ids if instance_id]
+        if not instance_ids or not references_setter:
+            return
+
+        # a single reference gains nothing from a list
+        if len(instance_ids) == 1 and reference_setter is not None:
+            self._request_reference(instance_ids[0], reference_setter)
+            return
+
+        self._bulk_references.append((instance_ids, references_setter, reference_setter))
+
     def _request_reference(self, instance_id: str, reference_setter: t.Callable[[t.Any], None]) -> None:
-        logger.debug(f'Requesting deferred reference: {instance_id} : {reference_setter}')
         if instance_id in self._references:
             self._references[instance_id].append(reference_setter)
         else:
             self._references[instance_id] = [reference_setter]
 
     def _resolve_references(self) -> None:
+        debug = logger.isEnabledFor(logging.DEBUG)
+        instances = InstanceManager().instances()
+        missing: t.Dict[str, int] = {}
+
+        # connections bound before the parents of their ports are queued by the topology manager and ordered
+        # together on flush, rather than inserted one at a time, so lists are bound first
+        for instance_ids, references_setter, reference_setter in self._bulk_references:
+            references = [instances.get(instance_id) for instance_id in instance_ids]
+
+            if any(reference is None for reference in references):
+                for instance_id, reference in zip(instance_ids, references):
+                    if reference is None:
+                        missing[instance_id] = missing.get(instance_id, 0) + 1
+
+                references = [reference for reference in references if reference is not None]
+
+            if not references:
+                continue
+
+            debug and logger.debug('Resolving references: %s : %r', len(references), references_setter)
+            if references_setter(references) is False and reference_setter is not None:
+                for reference in references:
+                    reference_setter(reference)
+
         for instance_id, setters in self._references.items():
-            instance = InstanceManager().get_instance(instance_id)
-            if not instance:
-                logger.error(f'Reference instance does not exist: {instance_id}')
+            instance = instances.get(instance_id)
+            if instance is None:
+                missing[instance_id] = missing.get(instance_id, 0) + len(setters)
                 continue
+
             for setter in setters:
-                logger.debug(f'Resolving reference: {instance} : {setter}')
                 setter(instance)
+
+        self._unresolved = missing
+        if missing:
+            logger.error(str(UnresolvedReferencesError(missing)))
@@ -0,0 +1,253 @@
+import os
+import time
+import pathlib
+import threading
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.logger import get_logger
+from backend.meta import SingletonMeta, InstanceManager, ReferenceManager
+from backend.events import EventManager
+from backend.evaluation import EvaluationManager
+from backend.caching import MemoizationCache
+
+
+logger = get_logger(__name__)
+
+
+Labels = t.Tuple[t.Tuple[str, str], ...]
+# metric name, labels, value
+Sample = t.Tuple[str, Labels, float]
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, description: str = ''):
+        self.name = name
+        self.description = description
+
+    def samples(self) -> t.List[Sample]:
+        raise NotImplementedError('This method must be defined in the subclass.')
+
+
+class Counter(Metric):
+    """Monotonic count, incremented by the code it measures."""
+    kind = 'counter'
+
+    def __init__(self, name: str, description: str = ''):
+        super().__init__(name, description)
+        self._values: t.Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> t.List[Sample]:
+        return [(self.name, labels, value) for labels, value in self._values.items()]
+
+
+class Gauge(Metric):
+    """Current value, either set by the code it measures or read from a function when collected.
+
+    Functions return a number or a mapping of label values to numbers for the ``label`` of the gauge, so
+    values already kept by the measured objects cost nothing until they are collected.
+    """
+    kind = 'gauge'
+
+    def __init__(self, name: str, description: str = '',
+                 function: t.Optional[t.Callable[[], t.Union[float, t.Mapping[str, float]]]] = None,
+                 label: t.Optional[str] = None):
+        super().__init__(name, description)
+        self._function = function
+        self._label = label
+        self._values: t.Dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[tuple(sorted(labels.items()))] = value
+
+    def samples(self) -> t.List[Sample]:
+        if self._function is None:
+            return [(self.name, labels, value) for labels, value in self._values.items()]
+
+        value = self._function()
+        if isinstance(value, t.Mapping):
+            return [(self.name, ((self._label, str(key)), ), item) for key, item in value.items()]
+
+        return [(self.name, (), value)]
+
+
+class MetricsRegistry(metaclass=SingletonMeta):
+    """Live numbers of the framework as counters and gauges.
+
+    Values are read from the managers and caches when metrics are collected, nothing is measured in between
+    except event triggers, so the registry can stay enabled in production. ``snapshot`` returns the values as
+    a dictionary and ``prometheus`` in the Prometheus text format, which can also be written to a file for a
+    node exporter or served on a local port.
+
+    Collecting does not change any state. Rates are computed from a previous snapshot kept by the caller, passed
+    to ``snapshot`` or ``rate``, and in Prometheus with ``rate()`` over the counters.
+    """
+    namespace = 'opennode'
+
+    def __init__(self) -> None:
+        self._metrics: t.Dict[str, Metric] = {}
+        self._server: t.Optional[ThreadingHTTPServer] = None
+
+        self._register_defaults()
+
+    def register(self, metric: Metric) -> Metric:
+        name = self._qualified(metric.name)
+        if name in self._metrics:
+            raise KeyError(f'A metric named {name} is already registered.')
+
+        metric.name = name
+        self._metrics[name] = metric
+        return metric
+
+    def deregister(self, name: str) -> None:
+        del self._metrics[self._qualified(name)]
+
+    def counter(self, name: str, description: str = '') -> Counter:
+        return t.cast(Counter, self._metrics.get(self._qualified(name)) or self.register(Counter(name, description)))
+
+    def gauge(self, name: str, description: str = '', function=None, label: t.Optional[str] = None) -> Gauge:
+        return t.cast(Gauge, self._metrics.get(self._qualified(name)) or
+                      self.register(Gauge(name, description, function, label)))
+
+    def metrics(self) -> t.List[Metric]:
+        return list(self._metrics.values())
+
+    def collect(self) -> t.List[t.Tuple[Metric, t.List[Sample]]]:
+        collected = []
+        for metric in list(self._metrics.values()):
+            try:
+                collected.append((metric, metric.samples()))
+            except Exception as e:
+                logger.warning(f'{self.__class__.__name__} metric can not be collected : {metric.name} : {e}')
+
+        return collected
+
+    def snapshot(self, previous: t.Optional[t.Dict[str, t.Any]] = None) -> t.Dict[str, t.Any]:
+        """Returns the values as a dictionary, with the event rate since the ``previous`` snapshot if given."""
+        values: t.Dict[str, t.Any] = {self._qualified('snapshot_seconds'): time.monotonic()}
+
+        for metric, samples in self.collect():
+            for name, labels, value in samples:
+                if labels:
+                    values.setdefault(name, {})[','.join(label for _, label in labels)] = value
+                else:
+                    values[name] = value
+
+        if previous is not None:
+            values[self._qualified('events_per_second')] = self.rate(previous, values)
+
+        return values
+
+    def rate(self, previous: t.Dict[str, t.Any], current: t.Dict[str, t.Any],
+             name: str = 'events_triggered_total') -> float:
+        """Returns the per second increase of a counter between two snapshots, summed over its labels."""
+        name = self._qualified(name)
+        seconds_name = self._qualified('snapshot_seconds')
+
+        seconds = current[seconds_name] - previous[seconds_name]
+        if seconds <= 0:
+            return 0.0
+
+        return (_total(current.get(name, 0)) - _total(previous.get(name, 0))) / seconds
+
+    def prometheus(self) -> str:
+        lines = []
+
+        for metric, samples in self.collect():
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+
+            for name, labels, value in samples:
+                label_text = ','.join(f'{key}="{self._escape(label)}"' for key, label in labels)
+                lines.append(f'{name}{{{label_text}}} {value}' if labels else f'{name} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, file_path: pathlib.Path) -> pathlib.Path:
+        """Writes the Prometheus text format atomically, for the textfile collector of a node exporter."""
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        temporary = file_path.with_name(f'.{file_path.name}.{os.getpid()}')
+        temporary.write_text(self.prometheus())
+        os.replace(temporary, file_path)
+        return file_path
+
+    def serve(self, port: int = 9464, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """Serves the Prometheus text format on ``/metrics`` from a daemon thread, on localhost by default."""
+        if self._server is not None:
+            return self._server
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+
+                body = registry.prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, message_format, *args):
+                logger.debug(message_format, *args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name='metrics', daemon=True).start()
+        return self._server
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _qualified(self, name: str) -> str:
+        return name if name.startswith(f'{self.namespace}_') else f'{self.namespace}_{name}'
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def _register_defaults(self) -> None:
+        self.gauge('instances', 'Entities tracked by the instance manager.',
+                   lambda: len(InstanceManager().instances()))
+        self.gauge('deferred_references', 'Deferred references waiting to be resolved.',
+                   lambda: ReferenceManager().pending())
+        self.gauge('event_callbacks', 'Callbacks registered per event.',
+                   lambda: {name: len(event.callbacks()) for name, event in EventManager().events().items()},
+                   label='event')
+        self.register(_EventCounter('events_triggered_total', 'Events fired, with or without callbacks.'))
+
+        self.gauge('memoization_cache', 'Memoization cache entries, size in bytes, hits, misses and evictions.',
+                   lambda: {key: value for key, value in MemoizationCache().stats().items()
+                            if not isinstance(value, dict)},
+                   label='statistic')
+        self.gauge('memoization_hit_ratio', 'Share of memoized evaluations served from the cache.',
+                   lambda: _ratio(MemoizationCache().hits, MemoizationCache().misses))
+        self.gauge('retained_nodes', 'Nodes whose results are retained across evaluation passes.',
+                   lambda: EvaluationManager().retained_nodes())
+
+
+def _ratio(hits: int, misses: int) -> float:
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def _total(value: t.Union[float, t.Mapping[str, float]]) -> float:
+    return sum(value.values()) if isinstance(value, t.Mapping) else value
+
+
+class _EventCounter(Counter):
+    # counts are kept by the events themselves, they are only read here
+    def samples(self) -> t.List[Sample]:
+        return [(self.name, (('event', name), ), event.triggered())
+                for name, event in EventManager().events().items()]
@@ -1,9 +1,10 @@
-from backend.registry import register_node
-from backend.bases import BaseNode
+import typing as t
+
+from backend.registry import register_node, resolve, Category
+from backend.bases import BaseNode, CustomDictCollection
 from backend.attributes import IntAttribute
 from backend.aggregations import AttributeCollection, PortCollection
 from backend.ports import InputPort, OutputPort
-from backend.events import *
 
 
 @register_node
@@ -27,6 +28,23 @@ class Node(BaseNode):
     def validate_outputs(self, outputs):
         return True
 
+    @classmethod
+    def deserialize_attributes(cls, data):
+        return {'attributes': cls._deserialize_collection(data)}
+
+    @classmethod
+    def deserialize_inputs(cls, data):
+        return {'inputs': cls._deserialize_collection(data)}
+
+    @classmethod
+    def deserialize_outputs(cls, data):
+        return {'outputs': cls._deserialize_collection(data)}
+
+    @staticmethod
+    def _deserialize_collection(data):
+        subclass: t.Type[CustomDictCollection] = resolve(data['class'], Category.COLLECTION)
+        return subclass._decode(data)
+
 
 @register_node
 class ParameterNode(Node):
@@ -46,7 +64,7 @@ class ParameterNode(Node):
     def init_outputs(self):
         collection = PortCollection()
 
-        collection['product'] = OutputPort(parent=self)
+        collection['product'] = OutputPort(parent=self, data_type='Int')
 
         return collection
 
@@ -84,3 +102,45 @@ class SumNode(Node):
 
         return data
 
+
+@register_node
+class SwitchNode(Node):
+    def init_attributes(self):
+        collection = AttributeCollection()
+
+        collection['selector'] = IntAttribute(parent=self)
+
+        return collection
+
+    def init_inputs(self):
+        collection = PortCollection()
+
+        collection['entry0'] = InputPort(parent=self)
+        collection['entry1'] = InputPort(parent=self)
+
+        return collection
+
+    def init_outputs(self):
+        collection = PortCollection()
+
+        collection['product'] = OutputPort(parent=self)
+
+        return collection
+
+    def selected_input(self) -> t.Optional[t.Tuple[str, InputPort]]:
+        name = f'entry{self.attributes["selector"].data()}'
+
+        if name not in self.inputs:
+            return None
+
+        return name, self.inputs[name]
+
+    def active_inputs(self, port=None):
+        selected = self.selected_input()
+
+        return [selected] if selected else []
+
+    def data(self) -> t.Optional[t.Any]:
+        selected = self.selected_input()
+
+        return selected[1].data() if selected else None
@@ -0,0 +1,214 @@
+import os
+import typing as t
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from backend.meta import InstanceManager, ReferenceManager
+from backend.registry import resolve, Category
+from backend.topology import TopologyManager
+from backend.evaluation import EvaluationManager
+from backend.aggregations import PortCollection
+from backend.ports import OutputPort
+from backend.nodes import Node
+
+
+class Partition:
+    __slots__ = ('index', 'node_ids', 'dependencies', 'imports', 'exports')
+
+    def __init__(self, index: int, node_ids: t.List[str]):
+        self.index = index
+        self.node_ids = node_ids
+
+        # partition indices this partition reads boundary values from
+        self.dependencies: t.Set[int] = set()
+        # output port id -> parent node id, for values read from outside the partition
+        self.imports: t.Dict[str, str] = {}
+        # output port ids whose values are read by other partitions
+        self.exports: t.Set[str] = set()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.index}, nodes={len(self.node_ids)})'
+
+
+class GraphPartitioner:
+    """Splits a graph into partitions that only exchange values along port connections.
+
+    Weakly connected components are packed whole into the smallest partition so far. Components larger than
+    the target partition size are cut into consecutive slices of the topological order, so every connection
+    between partitions points forward and the partitions can be evaluated in dependency order.
+    """
+
+    def __init__(self, partitions: t.Optional[int] = None):
+        self._partitions = partitions or os.cpu_count() or 1
+
+    def partition(self, graph: t.Any) -> t.List[Partition]:
+        nodes = graph.topological_order()
+        node_ids = [node.get_id() for node in nodes]
+        if not node_ids:
+            return []
+
+        port_parents = {port.get_id(): node.get_id()
+                        for node in nodes
+                        for port in node.outputs.values()}
+
+        edges = [(port_parents.get(output_id), input_id, output_id)
+                 for output_id, input_id in graph.edges()]
+
+        input_parents = {port.get_id(): node.get_id()
+                         for node in nodes
+                         for port in node.inputs.values()}
+
+        node_edges = [(source, input_parents[input_id], output_id)
+                      for source, input_id, output_id in edges
+                      if source is not None and input_id in input_parents]
+
+        components = self._components(node_ids, node_edges)
+        target_size = max(-(-len(node_ids) // self._partitions), 1)
+
+        groups: t.List[t.List[str]] = []
+        packed: t.List[t.List[str]] = []
+        for component in sorted(components, key=len, reverse=True):
+            if len(component) > target_size:
+                groups.extend(component[start:start + target_size]
+                              for start in range(0, len(component), target_size))
+                continue
+
+            if len(packed) + len(groups) < self._partitions:
+                packed.append(list(component))
+            else:
+                min(packed or groups, key=len).extend(component)
+
+        partitions = [Partition(index, group) for index, group in enumerate(groups + packed)]
+
+        owners = {node_id: partition.index for partition in partitions for node_id in partition.node_ids}
+        for source, target, output_id in node_edges:
+            source_partition = owners[source]
+            target_partition = partitions[owners[target]]
+
+            if source_partition != target_partition.index:
+                target_partition.dependencies.add(source_partition)
+                target_partition.imports[output_id] = source
+                partitions[source_partition].exports.add(output_id)
+
+        return partitions
+
+    @staticmethod
+    def _components(node_ids: t.List[str], edges: t.List[t.Tuple[str, str, str]]) -> t.List[t.List[str]]:
+        parents = {node_id: node_id for node_id in node_ids}
+
+        def find(node_id):
+            while parents[node_id] != node_id:
+                parents[node_id] = parents[parents[node_id]]
+                node_id = parents[node_id]
+
+            return node_id
+
+        for source, target, _ in edges:
+            parents[find(source)] = find(target)
+
+        components: t.Dict[str, t.List[str]] = {}
+        for node_id in node_ids:
+            components.setdefault(find(node_id), []).append(node_id)
+
+        return list(components.values())
+
+
+class BoundaryNode(Node):
+    """Stands in for a node of another partition inside a worker and provides its value."""
+
+    def __init__(self, **kwargs):
+        self._value = kwargs.pop('value', None)
+
+        super().__init__(**kwargs)
+
+    def init_outputs(self):
+        return PortCollection()
+
+    def data(self) -> t.Optional[t.Any]:
+        return self._value
+
+
+def _evaluate_partition(payload: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+    for module in payload['modules']:
+        importlib.import_module(module)
+
+    InstanceManager().clear_all()
+    TopologyManager().clear()
+
+    for port_id, value in payload['boundary'].items():
+        boundary_node = BoundaryNode(value=value)
+        boundary_node.outputs['product'] = OutputPort(id=port_id, parent=boundary_node)
+
+    with ReferenceManager():
+        nodes = [resolve(data['class'], Category.NODE).deserialize(data)
+                 for data in payload['nodes']]
+
+    # outputs go through the evaluation manager, which honors node states and per output functions
+    evaluation_manager = EvaluationManager()
+    results = {}
+    with evaluation_manager.evaluation():
+        for node in nodes:
+            for output_port in node.outputs.values():
+                results[output_port.get_id()] = evaluation_manager.evaluate(node, output_port)
+
+    return results
+
+
+class ParallelEvaluator:
+    def __init__(self,
+                 processes: t.Optional[int] = None,
+                 partitioner: t.Optional[GraphPartitioner] = None,
+                 modules: t.Sequence[str] = ('backend.nodes', ),
+                 mp_context: t.Optional[multiprocessing.context.BaseContext] = None):
+        self._processes = processes or os.cpu_count() or 1
+        self._partitioner = partitioner or GraphPartitioner(self._processes)
+        self._modules = list(modules)
+        self._mp_context = mp_context
+
+    def evaluate(self, graph: t.Any) -> t.Dict[str, t.Dict[str, t.Any]]:
+        """Returns the value of every output of every node, by node name and output name."""
+        partitions = self._partitioner.partition(graph)
+        nodes = {node.get_id(): node for node in graph.values()}
+
+        external = self._external_values(nodes)
+        port_values: t.Dict[str, t.Any] = {}
+
+        remaining = {partition.index: partition for partition in partitions}
+        completed: t.Set[int] = set()
+
+        with ProcessPoolExecutor(max_workers=self._processes, mp_context=self._mp_context) as executor:
+            running = {}
+            while remaining or running:
+                for partition in [p for p in remaining.values() if p.dependencies <= completed]:
+                    payload = {'modules': self._modules,
+                               'nodes': [nodes[node_id].serialize() for node_id in partition.node_ids],
+                               'boundary': {**external,
+                                            **{port_id: port_values.get(port_id) for port_id in partition.imports}}}
+
+                    running[executor.submit(_evaluate_partition, payload)] = partition.index
+                    del remaining[partition.index]
+
+                if not running:
+                    raise RuntimeError(f'Partitions could not be scheduled: {sorted(remaining)}')
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    completed.add(running.pop(future))
+                    port_values.update(future.result())
+
+        return {name: {output_name: port_values.get(output_port.get_id())
+                       for output_name, output_port in node.outputs.items()}
+                for name, node in graph.items()}
+
+    @staticmethod
+    def _external_values(nodes: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+        values = {}
+
+        for node in nodes.values():
+            for input_port in node.inputs.values():
+                for output_port in input_port.attributes['connections'].references():
+                    if output_port.attributes['parent'].data() not in nodes:
+                        values[output_port.get_id()] = output_port.data()
+
+        return values
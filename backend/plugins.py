@@ -0,0 +1,245 @@
+import ast
+import sys
+import json
+import pathlib
+import importlib.util
+import importlib.metadata
+import typing as t
+
+from backend.logger import get_logger
+from backend.meta import SingletonMeta
+from backend import registry
+
+
+logger = get_logger(__name__)
+
+
+ENTRY_POINT_GROUP = 'opennode.plugins'
+
+# category -> class name -> module
+Manifest = t.Dict[str, t.Dict[str, str]]
+
+_decorators = {'register_data_type': registry.Category.TYPE,
+               'register_attribute': registry.Category.ATTRIBUTE,
+               'register_node': registry.Category.NODE,
+               'register_port': registry.Category.PORT,
+               'register_collection': registry.Category.COLLECTION,
+               'register_event': registry.Category.EVENT}
+
+
+def _decorator_category(decorator: ast.expr) -> t.Optional[registry.Category]:
+    # register_node, registry.register_node and register(Category.NODE) are all recognised
+    if isinstance(decorator, ast.Call):
+        if _decorator_name(decorator.func) != 'register' or not decorator.args:
+            return None
+
+        argument = decorator.args[0]
+        if isinstance(argument, ast.Attribute) and argument.attr in registry.Category.__members__:
+            return registry.Category[argument.attr]
+
+        return None
+
+    return _decorators.get(_decorator_name(decorator))
+
+
+def _decorator_name(expression: ast.expr) -> t.Optional[str]:
+    if isinstance(expression, ast.Name):
+        return expression.id
+
+    if isinstance(expression, ast.Attribute):
+        return expression.attr
+
+    return None
+
+
+def scan_source(source: str, file_name: str = '<plugin>') -> t.Dict[str, t.List[str]]:
+    """Returns the names of the classes registered by a module source, by category, without executing it."""
+    registered: t.Dict[str, t.List[str]] = {}
+
+    for statement in ast.parse(source, file_name).body:
+        if not isinstance(statement, ast.ClassDef):
+            continue
+
+        for decorator in statement.decorator_list:
+            category = _decorator_category(decorator)
+            if category is not None:
+                registered.setdefault(category.value, []).append(statement.name)
+
+    return registered
+
+
+class PluginLoader(metaclass=SingletonMeta):
+    """Discovers the classes of plugin modules and imports each module the first time one of its classes is used.
+
+    Plugin directories are scanned for modules, and entry points of the ``opennode.plugins`` group name plugin
+    modules or packages. Module sources are parsed, not imported, to find their registered classes. The result
+    is a manifest of class names to modules that is declared to the registry, which imports a module on the first
+    lookup of one of its classes. With a cache path, the scan of every file is kept on disk and only files whose
+    size or modification time changed are parsed again.
+    """
+
+    def __init__(self) -> None:
+        self._directories: t.List[pathlib.Path] = []
+        self._entry_points = True
+        self._cache_path: t.Optional[pathlib.Path] = None
+
+        self._manifest: Manifest = {}
+        # file path -> [size, modification time, module, registered classes]
+        self._files: t.Dict[str, t.List[t.Any]] = {}
+
+    def configure(self,
+                  directories: t.Iterable[t.Union[str, pathlib.Path]] = (),
+                  entry_points: bool = True,
+                  cache_path: t.Optional[pathlib.Path] = None) -> None:
+        self._directories = [pathlib.Path(directory).absolute() for directory in directories]
+        self._entry_points = entry_points
+        self._cache_path = cache_path
+
+    def add_directory(self, directory: t.Union[str, pathlib.Path]) -> None:
+        directory = pathlib.Path(directory).absolute()
+        if directory not in self._directories:
+            self._directories.append(directory)
+
+    def directories(self) -> t.List[pathlib.Path]:
+        return list(self._directories)
+
+    def manifest(self) -> Manifest:
+        return {category: dict(classes) for category, classes in self._manifest.items()}
+
+    def discover(self) -> Manifest:
+        """Scans the plugin directories and entry points and declares their classes to the registry."""
+        self._read_cache()
+
+        files: t.Dict[str, t.List[t.Any]] = {}
+        for directory in self._directories:
+            if not directory.is_dir():
+                logger.warning(f'{self.__class__.__name__} plugin directory does not exist : {directory}')
+                continue
+
+            if directory.as_posix() not in sys.path:
+                sys.path.append(directory.as_posix())
+
+            for path in sorted(directory.rglob('*.py')):
+                module = self._module_name(directory, path)
+                if module is not None:
+                    self._scan_file(path, module, files)
+
+        if self._entry_points:
+            for module in self._entry_point_modules():
+                for path, module_name in self._module_files(module):
+                    self._scan_file(path, module_name, files)
+
+        self._files = files
+        self._write_cache()
+
+        self._manifest = {}
+        for path, (_, _, module, registered) in files.items():
+            for category, names in registered.items():
+                modules = self._manifest.setdefault(category, {})
+
+                for name in names:
+                    if name in modules and modules[name] != module:
+                        logger.warning(f'{self.__class__.__name__} {name} is registered by {modules[name]} and '
+                                       f'{module}, the latter is used.')
+                    modules[name] = module
+
+        for category, modules in self._manifest.items():
+            for name, module in modules.items():
+                registry.register_deferred(registry.Category(category), name, module)
+
+        return self.manifest()
+
+    def load_all(self) -> None:
+        """Imports every discovered plugin module, for processes that need all classes registered up front."""
+        for module in {module for modules in self._manifest.values() for module in modules.values()}:
+            importlib.import_module(module)
+
+    def clear(self) -> None:
+        for category, modules in self._manifest.items():
+            for name in modules:
+                registry.deregister_deferred(registry.Category(category), name)
+
+        self._manifest.clear()
+        self._files.clear()
+
+    @staticmethod
+    def _module_name(directory: pathlib.Path, path: pathlib.Path) -> t.Optional[str]:
+        parts = list(path.relative_to(directory).with_suffix('').parts)
+        if parts[-1] == '__init__':
+            parts.pop()
+
+        if not parts or not all(part.isidentifier() for part in parts):
+            return None
+
+        return '.'.join(parts)
+
+    def _scan_file(self, path: pathlib.Path, module: str, files: t.Dict[str, t.List[t.Any]]) -> None:
+        key = path.as_posix()
+
+        try:
+            stat = path.stat()
+        except OSError as e:
+            logger.warning(f'{self.__class__.__name__} plugin module can not be read : {e}')
+            return
+
+        cached = self._files.get(key)
+        if cached is not None and cached[:3] == [stat.st_size, stat.st_mtime_ns, module]:
+            files[key] = cached
+            return
+
+        try:
+            registered = scan_source(path.read_text(encoding='utf-8'), key)
+        except (OSError, SyntaxError, UnicodeDecodeError) as e:
+            logger.warning(f'{self.__class__.__name__} plugin module can not be scanned : {key} : {e}')
+            return
+
+        files[key] = [stat.st_size, stat.st_mtime_ns, module, registered]
+
+    @staticmethod
+    def _entry_point_modules() -> t.List[str]:
+        return [entry_point.value.split(':')[0].strip()
+                for entry_point in importlib.metadata.entry_points(group=ENTRY_POINT_GROUP)]
+
+    def _module_files(self, module: str) -> t.List[t.Tuple[pathlib.Path, str]]:
+        # finding a module spec imports its parent packages only, never the module itself
+        try:
+            spec = importlib.util.find_spec(module)
+        except (ImportError, ValueError) as e:
+            logger.warning(f'{self.__class__.__name__} plugin entry point can not be found : {module} : {e}')
+            return []
+
+        if spec is None or spec.origin is None or not spec.origin.endswith('.py'):
+            logger.warning(f'{self.__class__.__name__} plugin entry point is not a python source : {module}')
+            return []
+
+        origin = pathlib.Path(spec.origin)
+        if not spec.submodule_search_locations:
+            return [(origin, module)]
+
+        package = origin.parent
+        files = [(origin, module)]
+        for path in sorted(package.rglob('*.py')):
+            name = self._module_name(package, path) if path != origin else None
+            if name is not None:
+                files.append((path, f'{module}.{name}'))
+
+        return files
+
+    def _read_cache(self) -> None:
+        if self._cache_path is None or self._files or not self._cache_path.is_file():
+            return
+
+        try:
+            self._files = json.loads(self._cache_path.read_text(encoding='utf-8'))['files']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f'{self.__class__.__name__} plugin cache is ignored : {e}')
+
+    def _write_cache(self) -> None:
+        if self._cache_path is None:
+            return
+
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._cache_path.write_text(json.dumps({'files': self._files}), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f'{self.__class__.__name__} plugin cache can not be written : {e}')
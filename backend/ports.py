@@ -1,9 +1,17 @@
 import typing as t
 
-from backend.registry import register_port
-from backend.data_types import ReferencedNode, GenericStr, PortModeEnum, ReferencedPortList
+from backend.logger import get_logger
+from backend.meta import InstanceManager
+from backend.registry import register_port, resolve, Category
+from backend.data_types import ReferencedNode, GenericStr, PortModeEnum, DataTypeEnum, ReferencedPortList
 from backend.bases import BasePortNode
 from backend.aggregations import DataTypeCollection
+from backend.topology import TopologyManager
+from backend.evaluation import EvaluationManager
+from backend.compatibility import CompatibilityTable
+
+
+logger = get_logger(__name__)
 
 
 class GenericPort(BasePortNode):
@@ -14,6 +22,7 @@ class GenericPort(BasePortNode):
         collection['parent'] = ReferencedNode()
         collection['label'] = GenericStr()
         collection['mode'] = PortModeEnum()
+        collection['data_type'] = DataTypeEnum()
         collection['connections'] = ReferencedPortList()
 
         return collection
@@ -21,30 +30,111 @@ class GenericPort(BasePortNode):
     def validate_attributes(self, attributes):
         return True
 
+    def data_type(self):
+        data_type = self.attributes.get('data_type')
+
+        return data_type.data() if data_type is not None else None
+
+    def accept_data_type(self, data_type):
+        raise NotImplementedError('This method is not implemented and must be defined in the subclass.')
+
     @classmethod
     def deserialize_attributes(cls, data):
-        from backend import registry
-        subclass: t.Optional[t.Type[DataTypeCollection]] = registry.registered_type(registry.Category.COLLECTION,
-                                                                                    data['class'])
-        return {'attributes': subclass.deserialize(data)}
+        subclass: t.Type[DataTypeCollection] = resolve(data['class'], Category.COLLECTION)
+        return {'attributes': subclass._decode(data)}
 
 
 @register_port
 class InputPort(GenericPort):
     def __init__(self, **kwargs):
+        # output port id -> conversion of its values, for the connections that need one
+        self._converters: t.Dict[str, t.Callable[[t.Any], t.Any]] = {}
+
         super().__init__(**kwargs)
 
         self.attributes['mode'].set_data('INPUT')
+        self.attributes['connections'].set_owner(self)
+        self.attributes['data_type'].set_owner(self)
+
+    def accept_connections(self, output_ports):
+        converters = self.converters([(output_port.get_id(), output_port.data_type()) for output_port in output_ports],
+                                     self.data_type())
+        if converters is None:
+            return False
+
+        self._converters.update(converters)
+        return True
+
+    def release_connections(self, output_port_ids):
+        for output_port_id in output_port_ids:
+            self._converters.pop(output_port_id, None)
+
+    def accept_data_type(self, data_type):
+        connections = self.attributes['connections'].references()
+
+        converters = self.converters([(output_port.get_id(), output_port.data_type()) for output_port in connections],
+                                     data_type)
+        if converters is None:
+            return False
+
+        self._converters = converters
+        return True
+
+    def set_converter(self, output_port_id, converter):
+        if converter is None:
+            self._converters.pop(output_port_id, None)
+        else:
+            self._converters[output_port_id] = converter
+
+    def converters(self, sources, data_type):
+        """Returns the conversions of (output port id, type) sources to the data type, None if one is incompatible."""
+        table = CompatibilityTable()
+
+        converters = {}
+        for output_port_id, source_type in sources:
+            if not table.is_compatible(source_type, data_type):
+                logger.warning(f'{output_port_id} of type {source_type.name} can not be connected to '
+                               f'{self.get_id()} of type {data_type.name}')
+                return None
+
+            converter = table.converter(source_type, data_type)
+            if converter is not None:
+                converters[output_port_id] = converter
+
+        return converters
 
     def data(self):
-        data = 0
-        for connection in self.attributes['connections'].data():
-            from backend.meta import InstanceManager
-            connected_port = InstanceManager().get_instance(connection)
-            data += connected_port.data()
+        values = []
+        for connected_port in self.attributes['connections'].references():
+            value = connected_port.data()
+
+            # disabled upstream nodes without a disabled value contribute nothing, as if they were not connected
+            if value is None:
+                continue
+
+            # streams are materialized for consumers reading the whole value
+            if hasattr(value, 'collect'):
+                value = value.collect()
+            elif connected_port.get_id() in self._converters:
+                value = self._converters[connected_port.get_id()](value)
+
+            values.append(value)
+
+        if not values:
+            return 0
+
+        data = values[0]
+        for value in values[1:]:
+            data = data + value
 
         return data
 
+    def stream(self):
+        from backend.streaming import Stream
+
+        return Stream.concat([Stream.from_value(connected_port.data())
+                              for connected_port in self.attributes['connections'].references()])
+
 
 @register_port
 class OutputPort(GenericPort):
@@ -52,10 +142,33 @@ class OutputPort(GenericPort):
         super().__init__(**kwargs)
 
         self.attributes['mode'].set_data('OUTPUT')
+        self.attributes['data_type'].set_owner(self)
+
+    def accept_data_type(self, data_type):
+        port_id = self.get_id()
+        instance_manager = InstanceManager()
+
+        converters = []
+        for output_port_id, input_port_id in TopologyManager().port_edges(port_id):
+            input_port = instance_manager.get_instance(input_port_id) if output_port_id == port_id else None
+            if input_port is None:
+                continue
+
+            converter = input_port.converters([(port_id, data_type)], input_port.data_type())
+            if converter is None:
+                return False
+
+            converters.append((input_port, converter.get(port_id)))
+
+        for input_port, converter in converters:
+            input_port.set_converter(port_id, converter)
+
+        return True
 
     def data(self):
-        from backend.meta import InstanceManager
+        node = self.attributes['parent'].reference()
 
-        node = InstanceManager().get_instance(self.attributes['parent'].data())
+        return EvaluationManager().evaluate(node, self)
 
-        return node.data()
\ No newline at end of file
+    def is_streaming(self):
+        return self.attributes['parent'].reference().streaming
@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import pathlib
+import threading
+import typing as t
+
+from backend.evaluation import EvaluationManager
+
+
+class NodeTiming:
+    """Evaluation statistics of one node, times in nanoseconds."""
+    __slots__ = ('node_id', 'label', 'calls', 'computations', 'hits', 'cumulative', 'self_time')
+
+    def __init__(self, node_id: str, label: str):
+        self.node_id = node_id
+        self.label = label
+
+        self.calls = 0
+        # calls that reached the node itself, the others were served by a caching middleware
+        self.computations = 0
+        # values served by the evaluation pass or by retained results without going through the middlewares
+        self.hits = 0
+        self.cumulative = 0
+        self.self_time = 0
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.label!r}, calls={self.calls}, self={self.self_time / 1e6:.3f}ms)'
+
+    def cache_hits(self) -> int:
+        return self.hits + self.calls - self.computations
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return {'node': self.node_id,
+                'label': self.label,
+                'calls': self.calls,
+                'computations': self.computations,
+                'cache_hits': self.cache_hits(),
+                'cumulative_ms': self.cumulative / 1e6,
+                'self_ms': self.self_time / 1e6}
+
+
+class Profiler:
+    """Records per node call counts, wall times and cache hits of the evaluations made while it is enabled.
+
+    Cumulative time includes the upstream nodes evaluated on behalf of a node, self time excludes them. Times
+    are also aggregated by evaluation stack for flame graphs, and with ``trace`` enabled every call is kept
+    for the Chrome trace viewer. A disabled profiler costs nothing: the evaluation manager only reports to an
+    enabled one.
+
+        with Profiler(names=graph) as profiler:
+            sink.data()
+
+        print(profiler.table())
+    """
+
+    def __init__(self, names: t.Optional[t.Mapping[str, t.Any]] = None, trace: bool = False):
+        # node id -> readable name, from a mapping of names to nodes such as a graph
+        self._names = {node.get_id(): name for name, node in names.items()} if names is not None else {}
+        self._trace = trace
+
+        self._timings: t.Dict[str, NodeTiming] = {}
+        self._stacks: t.Dict[t.Tuple[str, ...], int] = {}
+        self._events: t.List[t.Dict[str, t.Any]] = []
+
+        # frames of the calls in progress : [timing, start, children time]
+        self._frames: t.List[t.List[t.Any]] = []
+        self._active: t.Dict[str, int] = {}
+        self._origin = time.perf_counter_ns()
+
+    def __enter__(self) -> 'Profiler':
+        return self.enable()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.disable()
+
+    def enable(self) -> 'Profiler':
+        EvaluationManager().set_profiler(self)
+        return self
+
+    def disable(self) -> None:
+        manager = EvaluationManager()
+        if manager.profiler() is self:
+            manager.set_profiler(None)
+
+    def is_enabled(self) -> bool:
+        return EvaluationManager().profiler() is self
+
+    def clear(self) -> None:
+        self._timings.clear()
+        self._stacks.clear()
+        self._events.clear()
+        self._origin = time.perf_counter_ns()
+
+    def timings(self) -> t.List[NodeTiming]:
+        return list(self._timings.values())
+
+    def timing(self, node: t.Any) -> t.Optional[NodeTiming]:
+        return self._timings.get(node.get_id())
+
+    # evaluation manager hooks
+
+    def call(self, node: t.Any, port: t.Optional[t.Any], proceed: t.Callable) -> t.Any:
+        timing = self._timing(node)
+        timing.calls += 1
+
+        node_id = timing.node_id
+        active = self._active
+        active[node_id] = active.get(node_id, 0) + 1
+
+        frame = [timing, time.perf_counter_ns(), 0]
+        self._frames.append(frame)
+        try:
+            return proceed(node, port)
+        finally:
+            end = time.perf_counter_ns()
+            self._frames.pop()
+
+            elapsed = end - frame[1]
+            timing.self_time += elapsed - frame[2]
+            if self._frames:
+                self._frames[-1][2] += elapsed
+
+            # re-entrant calls of a node are already part of its outermost call
+            active[node_id] -= 1
+            if not active[node_id]:
+                timing.cumulative += elapsed
+
+            stack = tuple(parent[0].label for parent in self._frames) + (timing.label, )
+            self._stacks[stack] = self._stacks.get(stack, 0) + elapsed - frame[2]
+
+            if self._trace:
+                self._events.append({'name': timing.label,
+                                     'cat': node.__class__.__name__,
+                                     'ph': 'X',
+                                     'ts': (frame[1] - self._origin) / 1e3,
+                                     'dur': elapsed / 1e3,
+                                     'pid': os.getpid(),
+                                     'tid': threading.get_ident(),
+                                     'args': {'node': node_id}})
+
+    def computed(self) -> None:
+        if self._frames:
+            self._frames[-1][0].computations += 1
+
+    def hit(self, node: t.Any) -> None:
+        self._timing(node).hits += 1
+
+    # exports
+
+    def table(self, sort: str = 'self_time', limit: t.Optional[int] = None) -> str:
+        timings = sorted(self._timings.values(), key=lambda timing: getattr(timing, sort), reverse=True)
+        rows = [f'{"node":<40} {"calls":>8} {"hits":>8} {"cumulative ms":>14} {"self ms":>10}']
+
+        for timing in timings[:limit]:
+            rows.append(f'{timing.label[:40]:<40} {timing.calls:>8} {timing.cache_hits():>8} '
+                        f'{timing.cumulative / 1e6:>14.3f} {timing.self_time / 1e6:>10.3f}')
+
+        return '\n'.join(rows)
+
+    def folded(self) -> str:
+        """Self time in microseconds per evaluation stack, in the folded format read by flame graph tools."""
+        return '\n'.join(f'{";".join(stack)} {duration // 1000}' for stack, duration in self._stacks.items())
+
+    def chrome_trace(self) -> t.Dict[str, t.Any]:
+        return {'traceEvents': list(self._events), 'displayTimeUnit': 'ms'}
+
+    def write_folded(self, file_path: pathlib.Path) -> pathlib.Path:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(self.folded() + '\n')
+        return file_path
+
+    def write_chrome_trace(self, file_path: pathlib.Path) -> pathlib.Path:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(json.dumps(self.chrome_trace()))
+        return file_path
+
+    def _timing(self, node: t.Any) -> NodeTiming:
+        node_id = node.get_id()
+
+        timing = self._timings.get(node_id)
+        if timing is None:
+            label = self._names.get(node_id) or f'{node.__class__.__name__}:{node_id[:8]}'
+            timing = self._timings[node_id] = NodeTiming(node_id, label)
+
+        return timing
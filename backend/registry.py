@@ -1,8 +1,13 @@
 import typing as t
 import enum
+import importlib
 from collections import defaultdict
 
-from backend.logger import logger
+from backend.logger import get_logger
+
+
+logger = get_logger(__name__)
+
 
 RegistryDict = t.Dict[str, t.Type]
 
@@ -18,23 +23,104 @@ class Category(enum.Enum):
 
 _Registry: t.DefaultDict[Category, RegistryDict] = defaultdict(dict)
 
+# classes whose registration is deferred until they are looked up : category -> class name -> module
+_Deferred: t.DefaultDict[Category, t.Dict[str, str]] = defaultdict(dict)
+
+# class name -> (category, class) across all categories, and the names registered in several categories
+_Classes: t.Dict[str, t.Tuple[Category, t.Type]] = {}
+_Conflicts: t.Dict[str, t.Set[Category]] = {}
+
 
 def register(category: Category):
     def decorator(cls: t.Type) -> t.Type:
-        _Registry[category][cls.__name__] = cls
-        logger.debug(f'New {category.name} has been registered: {cls.__name__}')
+        name = cls.__name__
+
+        _Registry[category][name] = cls
+        _Deferred[category].pop(name, None)
+
+        registered = _Classes.get(name)
+        if registered is not None and registered[0] is not category:
+            _add_conflict(name, registered[0], category)
+        else:
+            _Classes[name] = (category, cls)
+
+        for deferred_category, deferred in _Deferred.items():
+            if deferred_category is not category and name in deferred:
+                _add_conflict(name, deferred_category, category)
+
+        logger.debug('New %s has been registered: %s', category.name, name)
 
         return cls
 
     return decorator
 
 
+def register_deferred(category: Category, name: str, module: str) -> None:
+    """Declares a class registered by importing a module, the import happens on the first lookup by name."""
+    if name in _Registry[category]:
+        return
+
+    _Deferred[category][name] = module
+
+    registered = _Classes.get(name)
+    if registered is not None and registered[0] is not category:
+        _add_conflict(name, registered[0], category)
+
+
+def deregister_deferred(category: Category, name: str) -> None:
+    _Deferred[category].pop(name, None)
+
+
 def registered_type(category: Category, name: str) -> t.Optional[t.Type]:
-    return _Registry.get(category, {}).get(name)
+    registered = _Registry[category].get(name)
+
+    if registered is None and name in _Deferred[category]:
+        _import_deferred(_Deferred[category].pop(name))
+        registered = _Registry[category].get(name)
+
+    return registered
 
 
 def registered_types(category: Category) -> RegistryDict:
-    return _Registry.get(category, {})
+    for module in set(_Deferred.pop(category, {}).values()):
+        _import_deferred(module)
+
+    return _Registry[category]
+
+
+def resolve(name: str, *categories: Category) -> t.Type:
+    """Returns the class registered under a name, in any category, for deserialization.
+
+    Names are unique across categories, so one lookup serves every category the caller accepts. The given
+    categories are only searched for names registered in several categories, including deferred ones, for
+    classes whose registration is still deferred or for classes registered in another category.
+    """
+    registered = _Classes.get(name)
+    if registered is not None and name not in _Conflicts and (not categories or registered[0] in categories):
+        return registered[1]
+
+    for category in categories:
+        cls = registered_type(category, name)
+        if cls is not None:
+            return cls
+
+    raise KeyError(f'No class is registered under the name {name} in {[c.name for c in categories]}.')
+
+
+def conflicts() -> t.Dict[str, t.Set[Category]]:
+    return {name: set(categories) for name, categories in _Conflicts.items()}
+
+
+def _add_conflict(name: str, category: Category, other: Category) -> None:
+    _Conflicts.setdefault(name, {category}).add(other)
+    logger.warning(f'{name} is registered as {category.name} and {other.name}, it must be resolved by category.')
+
+
+def _import_deferred(module: str) -> None:
+    try:
+        importlib.import_module(module)
+    except ImportError as e:
+        logger.warning(f'Deferred registration module can not be imported : {module} : {e}')
 
 
 register_data_type = register(Category.TYPE)
@@ -1,4 +1,5 @@
-from backend.logger import logger
+from backend.logger import logger, configure
 
 if __name__ == '__main__':
+    configure()
     logger.info('Starting application core')
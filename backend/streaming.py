@@ -0,0 +1,221 @@
+import asyncio
+import itertools
+import threading
+import contextlib
+import typing as t
+
+from backend.registry import register_node
+from backend.attributes import IntAttribute
+from backend.aggregations import AttributeCollection, PortCollection
+from backend.ports import InputPort, OutputPort
+from backend.nodes import Node
+
+
+Chunk = t.List[t.Any]
+ChunkSource = t.Callable[[], t.Union[t.Iterable[Chunk], t.AsyncIterable[Chunk]]]
+
+
+class Stream:
+    """Lazily produced sequence of chunks flowing out of a streaming output port.
+
+    Chunks are produced on demand, one at a time, by the source function, which is called again for every
+    iteration. A consumer therefore holds at most the chunk it is processing and every consumer of a fan-out
+    sees the whole sequence, at the cost of running the upstream sources once per consumer: chunks are never
+    kept for the other consumers. Collect the stream once to share the values instead. The source may return an
+    iterator or an asynchronous iterator; both can be consumed with ``for`` and ``async for``.
+    """
+    __slots__ = ('_source', )
+
+    def __init__(self, source: ChunkSource):
+        self._source = source
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._source!r})'
+
+    def __iter__(self) -> t.Iterator[Chunk]:
+        chunks = self._source()
+
+        if not hasattr(chunks, '__anext__'):
+            yield from chunks
+            return
+
+        async def next_chunk():
+            return await chunks.__anext__()
+
+        # asynchronous sources consumed synchronously are driven by a private event loop, on a helper thread
+        # when the caller already runs a loop, which can not be nested
+        loop = asyncio.new_event_loop()
+        thread = None
+        if _running_loop():
+            thread = threading.Thread(target=loop.run_forever, name='stream', daemon=True)
+            thread.start()
+
+        try:
+            while True:
+                try:
+                    if thread is None:
+                        yield loop.run_until_complete(next_chunk())
+                    else:
+                        yield asyncio.run_coroutine_threadsafe(next_chunk(), loop).result()
+                except StopAsyncIteration:
+                    return
+        finally:
+            if thread is not None:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+            loop.close()
+
+    async def __aiter__(self) -> t.AsyncIterator[Chunk]:
+        chunks = self._source()
+
+        if hasattr(chunks, '__anext__'):
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        for chunk in chunks:
+            yield chunk
+
+    @classmethod
+    def from_value(cls, value: t.Any) -> 'Stream':
+        if isinstance(value, cls):
+            return value
+
+        return cls(lambda: iter([value if isinstance(value, list) else [value]]))
+
+    @classmethod
+    def concat(cls, streams: t.Sequence['Stream']) -> 'Stream':
+        return cls(lambda: itertools.chain.from_iterable(streams))
+
+    def map(self, function: t.Callable[[Chunk], Chunk]) -> 'Stream':
+        return Stream(lambda: map(function, self))
+
+    def items(self) -> t.Iterator[t.Any]:
+        for chunk in self:
+            yield from chunk
+
+    def collect(self) -> t.List[t.Any]:
+        return list(self.items())
+
+    async def buffered(self, max_chunks: int = 1) -> t.AsyncIterator[Chunk]:
+        """Produces chunks concurrently with their consumption, at most ``max_chunks`` ahead of the consumer."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_chunks)
+        done = object()
+
+        async def produce():
+            try:
+                async for chunk in self:
+                    await queue.put(chunk)
+            finally:
+                await queue.put(done)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is done:
+                    break
+
+                yield chunk
+        finally:
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+
+
+def _running_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+
+    return True
+
+
+class StreamingNode(Node):
+    """Node whose outputs are streams of chunks instead of materialized values."""
+    streaming = True
+    chunk_size = 1024
+
+    def data(self) -> Stream:
+        return Stream(self.chunks)
+
+    def chunks(self) -> t.Union[t.Iterable[Chunk], t.AsyncIterable[Chunk]]:
+        raise NotImplementedError('This method is not implemented and must be defined in the subclass.')
+
+
+@register_node
+class RangeNode(StreamingNode):
+    def init_attributes(self):
+        collection = AttributeCollection()
+
+        collection['start'] = IntAttribute(parent=self)
+        collection['stop'] = IntAttribute(parent=self)
+
+        return collection
+
+    def init_outputs(self):
+        collection = PortCollection()
+
+        collection['product'] = OutputPort(parent=self)
+
+        return collection
+
+    def chunks(self) -> t.Iterator[Chunk]:
+        start = self.attributes['start'].data() or 0
+        stop = self.attributes['stop'].data() or 0
+
+        for offset in range(start, stop, self.chunk_size):
+            yield list(range(offset, min(offset + self.chunk_size, stop)))
+
+
+@register_node
+class ScaleNode(StreamingNode):
+    def init_attributes(self):
+        collection = AttributeCollection()
+
+        collection['factor'] = IntAttribute(parent=self)
+
+        return collection
+
+    def init_inputs(self):
+        collection = PortCollection()
+
+        collection['entry0'] = InputPort(parent=self)
+
+        return collection
+
+    def init_outputs(self):
+        collection = PortCollection()
+
+        collection['product'] = OutputPort(parent=self)
+
+        return collection
+
+    def chunks(self) -> t.Iterator[Chunk]:
+        factor = self.attributes['factor'].data()
+
+        for chunk in self.inputs['entry0'].stream():
+            yield [item * factor for item in chunk]
+
+
+@register_node
+class StreamSumNode(Node):
+    """Reduces the streams of its input to their total one chunk at a time."""
+
+    def init_inputs(self):
+        collection = PortCollection()
+
+        collection['entry0'] = InputPort(parent=self)
+
+        return collection
+
+    def init_outputs(self):
+        collection = PortCollection()
+
+        collection['product'] = OutputPort(parent=self)
+
+        return collection
+
+    def data(self) -> t.Any:
+        return sum(sum(chunk) for chunk in self.inputs['entry0'].stream())
@@ -0,0 +1,350 @@
+import typing as t
+from collections import defaultdict
+
+from backend.logger import get_logger
+from backend.meta import SingletonMeta
+from backend.events import EventManager, Events
+from backend.abstracts import EntityType
+
+
+logger = get_logger(__name__)
+
+
+EdgeKey = t.Tuple[str, str]
+
+
+class TopologyManager(metaclass=SingletonMeta):
+    """Incrementally maintained topological order of nodes (Pearce-Kelly).
+
+    Edges are registered per connected port pair and counted per node pair. An inserted edge only
+    reorders the nodes that lie between its endpoints in the current order, so acyclic insertions cost
+    time proportional to the affected region instead of the whole graph.
+    """
+
+    def __init__(self) -> None:
+        self._positions: t.Dict[str, int] = {}
+        self._next_position = 0
+        self._first_position = 0
+        self._order: t.Optional[t.List[str]] = None
+
+        self._successors: t.DefaultDict[str, t.Dict[str, int]] = defaultdict(dict)
+        self._predecessors: t.DefaultDict[str, t.Dict[str, int]] = defaultdict(dict)
+
+        self._edges: t.Dict[EdgeKey, t.List[t.Any]] = {}
+        self._port_edges: t.DefaultDict[str, t.Set[EdgeKey]] = defaultdict(set)
+        self._node_edges: t.DefaultDict[str, t.Set[EdgeKey]] = defaultdict(set)
+        self._pending: t.Dict[EdgeKey, t.List[t.Any]] = {}
+
+        EventManager().get_event_by_name(Events.PostNodeDeleted.name).register(self._on_deleted)
+
+    def position(self, node_id: str) -> t.Optional[int]:
+        return self._positions.get(node_id)
+
+    def order(self) -> t.List[str]:
+        self.flush()
+
+        if self._order is None:
+            self._order = sorted(self._positions, key=self._positions.__getitem__)
+
+        return self._order
+
+    def sort(self, nodes: t.Iterable[t.Any]) -> t.List[t.Any]:
+        self.flush()
+
+        positions = self._positions
+        return sorted(nodes, key=lambda node: positions.get(node.get_id(), -1))
+
+    def successors(self, node_id: str) -> t.List[str]:
+        return list(self._successors.get(node_id, ()))
+
+    def predecessors(self, node_id: str) -> t.List[str]:
+        return list(self._predecessors.get(node_id, ()))
+
+    def port_edges(self, port_id: str) -> t.List[EdgeKey]:
+        """Returns the connections of a port, including the ones waiting for their nodes, as port id pairs."""
+        edges = list(self._port_edges.get(port_id, ()))
+        edges.extend(key for key in self._pending if port_id in key)
+        return edges
+
+    def has_edge(self, output_port_id: str, input_port_id: str) -> bool:
+        key = (output_port_id, input_port_id)
+        return key in self._edges or key in self._pending
+
+    def connect(self, output_port: t.Any, input_port: t.Any) -> bool:
+        return self.replace(input_port, (), [output_port])
+
+    def disconnect(self, output_port_id: str, input_port_id: str) -> None:
+        self._unlink((output_port_id, input_port_id))
+
+    def replace(self, input_port: t.Any, removed_ids: t.Iterable[str], added_ports: t.Iterable[t.Any]) -> bool:
+        input_port_id = input_port.get_id()
+
+        removed = [self._unlink((output_port_id, input_port_id)) for output_port_id in removed_ids]
+
+        added = []
+        for output_port in added_ports:
+            key = (output_port.get_id(), input_port_id)
+            if self._link(key, output_port, input_port):
+                added.append(key)
+                continue
+
+            logger.warning(f'Connection would create a cycle : {output_port.get_id()} -> {input_port_id}')
+
+            for added_key in added:
+                self._unlink(added_key)
+
+            for record in removed:
+                record and self._restore(record)
+
+            return False
+
+        return True
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+
+        # pending edges come in the order references were resolved, unrelated to the graph order, and
+        # inserting many of them one at a time reorders repeatedly, so large batches renumber everything once
+        if len(pending) * 4 >= len(self._edges):
+            self._renumber(pending.values())
+
+        for key, (output_port, input_port, count) in pending.items():
+            for _ in range(count):
+                if not self._link(key, output_port, input_port):
+                    logger.error(f'Pending connection creates a cycle and was not ordered : {key[0]} -> {key[1]}')
+                    break
+
+    def discard_port(self, port_id: str) -> None:
+        for key in list(self._port_edges.pop(port_id, ())):
+            while key in self._edges:
+                self._unlink(key)
+
+        for key in [key for key in self._pending if port_id in key]:
+            del self._pending[key]
+
+    def discard_node(self, node_id: str) -> None:
+        for key in list(self._node_edges.get(node_id, ())):
+            source, target, _ = self._edges.pop(key)
+            self._unindex(key, source, target)
+
+        for key in [key for key, (output_port, input_port, _) in self._pending.items()
+                    if node_id in (output_port.attributes['parent'].data(), input_port.attributes['parent'].data())]:
+            del self._pending[key]
+
+        for successor in list(self._successors.get(node_id, ())):
+            self._predecessors[successor].pop(node_id, None)
+
+        for predecessor in list(self._predecessors.get(node_id, ())):
+            self._successors[predecessor].pop(node_id, None)
+
+        self._successors.pop(node_id, None)
+        self._predecessors.pop(node_id, None)
+
+        if self._positions.pop(node_id, None) is not None:
+            self._order = None
+
+    def clear(self) -> None:
+        self._positions.clear()
+        self._next_position = 0
+        self._first_position = 0
+        self._order = None
+        self._successors.clear()
+        self._predecessors.clear()
+        self._edges.clear()
+        self._port_edges.clear()
+        self._node_edges.clear()
+        self._pending.clear()
+
+    def _on_deleted(self, instance, *args, **kwargs) -> None:
+        if instance.entity_type == EntityType.Port:
+            self.discard_port(instance.get_id())
+        elif instance.entity_type == EntityType.Node:
+            self.discard_node(instance.get_id())
+
+    def _link(self, key: EdgeKey, output_port: t.Any, input_port: t.Any) -> bool:
+        record = self._edges.get(key)
+        if record:
+            self._insert(record[0], record[1])
+            record[2] += 1
+            return True
+
+        source = output_port.attributes['parent'].data()
+        target = input_port.attributes['parent'].data()
+        if not source or not target:
+            pending = self._pending.setdefault(key, [output_port, input_port, 0])
+            pending[2] += 1
+            return True
+
+        if not self._insert(source, target):
+            return False
+
+        self._edges[key] = [source, target, 1]
+        self._index(key, source, target)
+        return True
+
+    def _unlink(self, key: EdgeKey) -> t.Optional[t.Tuple[EdgeKey, str, str]]:
+        pending = self._pending.get(key)
+        if pending:
+            pending[2] -= 1
+            if not pending[2]:
+                del self._pending[key]
+            return None
+
+        record = self._edges.get(key)
+        if not record:
+            return None
+
+        source, target = record[0], record[1]
+        record[2] -= 1
+        if not record[2]:
+            del self._edges[key]
+            self._unindex(key, source, target)
+
+        self._remove(source, target)
+        return key, source, target
+
+    def _restore(self, record: t.Tuple[EdgeKey, str, str]) -> None:
+        key, source, target = record
+
+        self._insert(source, target)
+        edge = self._edges.setdefault(key, [source, target, 0])
+        edge[2] += 1
+        self._index(key, source, target)
+
+    def _index(self, key: EdgeKey, source: str, target: str) -> None:
+        self._port_edges[key[0]].add(key)
+        self._port_edges[key[1]].add(key)
+        self._node_edges[source].add(key)
+        self._node_edges[target].add(key)
+
+    def _unindex(self, key: EdgeKey, source: str, target: str) -> None:
+        # empty entries are dropped, ports and nodes that lost their last edge leave no trace in the index
+        for index, index_key in ((self._port_edges, key[0]), (self._port_edges, key[1]),
+                                 (self._node_edges, source), (self._node_edges, target)):
+            keys = index.get(index_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[index_key]
+
+    def _renumber(self, pending: t.Iterable[t.List[t.Any]]) -> None:
+        successors = {node_id: list(targets) for node_id, targets in self._successors.items()}
+        in_degrees = {node_id: 0 for node_id in sorted(self._positions, key=self._positions.__getitem__)}
+
+        for output_port, input_port, _ in pending:
+            source = output_port.attributes['parent'].data()
+            target = input_port.attributes['parent'].data()
+            if source and target and source != target:
+                successors.setdefault(source, []).append(target)
+
+        for source, targets in successors.items():
+            in_degrees.setdefault(source, 0)
+            for target in targets:
+                in_degrees[target] = in_degrees.get(target, 0) + 1
+
+        order = [node_id for node_id, degree in in_degrees.items() if not degree]
+        for node_id in order:
+            for target in successors.get(node_id, ()):
+                in_degrees[target] -= 1
+                if not in_degrees[target]:
+                    order.append(target)
+
+        # nodes on a cycle keep their relative order after the others, linking their edges reports the cycle
+        ordered = set(order)
+        order.extend(node_id for node_id in in_degrees if node_id not in ordered)
+
+        self._positions = {node_id: position for position, node_id in enumerate(order)}
+        self._first_position = 0
+        self._next_position = len(order)
+        self._order = None
+
+    def _add_position(self, node_id: str, first: bool = False) -> None:
+        if node_id in self._positions:
+            return
+
+        # unseen sources are placed before every known node and unseen targets after, so building a
+        # graph from fresh nodes never requires reordering regardless of the order edges arrive in
+        if first:
+            self._first_position -= 1
+            self._positions[node_id] = self._first_position
+        else:
+            self._positions[node_id] = self._next_position
+            self._next_position += 1
+
+        self._order = None
+
+    def _insert(self, source: str, target: str) -> bool:
+        if source == target:
+            return False
+
+        successors = self._successors[source]
+        if target in successors:
+            successors[target] += 1
+            self._predecessors[target][source] += 1
+            return True
+
+        self._add_position(source, first=True)
+        self._add_position(target)
+
+        positions = self._positions
+        upper = positions[source]
+        lower = positions[target]
+
+        if lower < upper:
+            forward = self._search(target, self._successors, lambda position: position <= upper, source)
+            if forward is None:
+                return False
+
+            backward = self._search(source, self._predecessors, lambda position: position >= lower)
+            self._reorder(backward, forward)
+
+        successors[target] = 1
+        self._predecessors[target][source] = 1
+        return True
+
+    def _remove(self, source: str, target: str) -> None:
+        successors = self._successors.get(source, {})
+        if target not in successors:
+            return
+
+        successors[target] -= 1
+        self._predecessors[target][source] -= 1
+
+        if not successors[target]:
+            del successors[target]
+            del self._predecessors[target][source]
+
+    def _search(self, start: str, adjacency: t.Dict[str, t.Dict[str, int]],
+                in_bounds: t.Callable[[int], bool], forbidden: t.Optional[str] = None) -> t.Optional[t.List[str]]:
+        positions = self._positions
+
+        visited = {start}
+        stack = [start]
+        while stack:
+            node_id = stack.pop()
+            for neighbour in adjacency.get(node_id, ()):
+                if neighbour == forbidden:
+                    return None
+
+                if neighbour not in visited and in_bounds(positions[neighbour]):
+                    visited.add(neighbour)
+                    stack.append(neighbour)
+
+        return list(visited)
+
+    def _reorder(self, backward: t.List[str], forward: t.List[str]) -> None:
+        positions = self._positions
+
+        backward.sort(key=positions.__getitem__)
+        forward.sort(key=positions.__getitem__)
+
+        nodes = backward + forward
+        slots = sorted(positions[node_id] for node_id in nodes)
+
+        for node_id, slot in zip(nodes, slots):
+            positions[node_id] = slot
+
+        self._order = None
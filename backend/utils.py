@@ -0,0 +1,14 @@
+import sys
+import typing as t
+
+
+def estimate_size(value: t.Any) -> int:
+    """Approximate memory used by a value, including the items of lists and tuples and the buffer of views."""
+    size = sys.getsizeof(value)
+
+    if isinstance(value, (list, tuple)):
+        size += sum(sys.getsizeof(item) for item in value)
+    elif isinstance(value, memoryview):
+        size += value.nbytes
+
+    return size
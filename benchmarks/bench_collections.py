@@ -0,0 +1,43 @@
+"""Collection insertion benchmark.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_collections [count]
+"""
+import sys
+import time
+
+from backend.nodes import Node
+from backend.aggregations import NodeCollection
+
+
+def bench_insert(count: int) -> dict:
+    nodes = [Node() for _ in range(count)]
+
+    collection = NodeCollection()
+    start = time.perf_counter()
+    for index, node in enumerate(nodes):
+        collection[f'node{index}'] = node
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    NodeCollection().set_items({f'node{index}': node for index, node in enumerate(nodes)})
+    set_items_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = sum(collection.contains_item(node) for node in nodes)
+    lookup_time = time.perf_counter() - start
+
+    assert len(collection) == found == count
+
+    return {'count': count,
+            'insert_seconds': insert_time,
+            'set_items_seconds': set_items_time,
+            'lookup_seconds': lookup_time}
+
+
+if __name__ == '__main__':
+    result = bench_insert(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+
+    for key, value in result.items():
+        print(f'{key}: {value}')
@@ -0,0 +1,65 @@
+"""Nested collection decoding benchmark.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_decode [count]
+"""
+import sys
+import time
+
+from backend import registry
+from backend.meta import InstanceManager, ReferenceManager
+from backend.nodes import SumNode
+from backend.graphs import Graph
+
+
+def count_items(data) -> int:
+    if isinstance(data, dict):
+        return ('class' in data) + sum(count_items(value) for value in data.values())
+
+    if isinstance(data, list):
+        return sum(count_items(value) for value in data)
+
+    return 0
+
+
+def bench_decode(count: int) -> dict:
+    graph = Graph()
+    for index in range(count):
+        graph[f'sum{index}'] = SumNode()
+
+    data = graph.serialize()
+    items = count_items(data)
+
+    start = time.perf_counter()
+    for _ in range(items):
+        registry.resolve('IntAttribute', registry.Category.TYPE, registry.Category.ATTRIBUTE)
+    resolve_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(items):
+        (registry.registered_type(registry.Category.TYPE, 'IntAttribute')
+         or registry.registered_type(registry.Category.ATTRIBUTE, 'IntAttribute'))
+    registered_type_time = time.perf_counter() - start
+
+    InstanceManager().clear_all()
+    start = time.perf_counter()
+    with ReferenceManager():
+        loaded = Graph.deserialize(data)
+    decode_time = time.perf_counter() - start
+
+    assert len(loaded) == count
+
+    return {'count': count,
+            'items': items,
+            'decode_seconds': decode_time,
+            'items_per_second': items / decode_time,
+            'resolve_seconds': resolve_time,
+            'registered_type_seconds': registered_type_time}
+
+
+if __name__ == '__main__':
+    result = bench_decode(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
+
+    for key, value in result.items():
+        print(f'{key}: {value}')
@@ -0,0 +1,60 @@
+"""Large graph loading benchmark.
+
+Writes a random graph dump directly with the graph generator, then loads and evaluates it. Run from the
+repository root:
+
+    python -m benchmarks.bench_load [nodes]
+"""
+import sys
+import time
+import pathlib
+import tempfile
+
+from backend.meta import InstanceManager, ReferenceManager
+from backend.topology import TopologyManager
+from backend.evaluation import EvaluationManager
+from backend.generators import GraphGenerator
+from backend.graphs import Graph
+
+
+def bench_load(nodes: int, seed: int = 0) -> dict:
+    spec = GraphGenerator(seed).random_dag(nodes, fan_in=2, sources=max(nodes // 100, 1), window=100)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / 'graph.json'
+
+        start = time.perf_counter()
+        spec.dump(path)
+        dump_time = time.perf_counter() - start
+        file_size = path.stat().st_size
+
+        InstanceManager().clear_all()
+        TopologyManager().clear()
+
+        start = time.perf_counter()
+        with ReferenceManager():
+            graph = Graph.load(path)
+        load_time = time.perf_counter() - start
+
+    # every output is pulled within one pass, last generated first, so upstream values are computed on the way
+    start = time.perf_counter()
+    with EvaluationManager().evaluation():
+        for node in reversed(list(graph.values())):
+            node.outputs['product'].data()
+    evaluation_time = time.perf_counter() - start
+
+    assert len(graph) == nodes
+
+    return {'nodes': nodes,
+            'edges': len(spec.edges),
+            'bytes': file_size,
+            'generate_dump_seconds': dump_time,
+            'load_seconds': load_time,
+            'evaluation_seconds': evaluation_time}
+
+
+if __name__ == '__main__':
+    result = bench_load(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
+
+    for key, value in result.items():
+        print(f'{key}: {value}')
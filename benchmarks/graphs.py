@@ -0,0 +1,76 @@
+"""Graph shapes used by the benchmarks.
+
+Every builder returns a graph of ``ParameterNode`` sources feeding ``SumNode`` nodes, connected with one
+``connect_many`` call, and the node whose value depends on the whole graph.
+"""
+import typing as t
+
+from backend.nodes import ParameterNode, SumNode
+from backend.graphs import Graph
+
+
+def chain(size: int) -> t.Tuple[Graph, SumNode]:
+    """One parameter followed by ``size`` sum nodes, each reading the previous one."""
+    graph = Graph()
+    previous = graph['parameter'] = ParameterNode(value=1)
+
+    edges = []
+    for index in range(size):
+        node = graph[f'sum{index}'] = SumNode()
+        edges.append((previous.outputs['product'], node.inputs['entry0']))
+        previous = node
+
+    graph.connect_many(edges)
+    return graph, previous
+
+
+def fan_in(size: int) -> t.Tuple[Graph, SumNode]:
+    """``size`` parameters reduced pairwise by a balanced tree of sum nodes."""
+    graph = Graph()
+    layer = [ParameterNode(value=1) for _ in range(max(size, 2))]
+    for index, node in enumerate(layer):
+        graph[f'parameter{index}'] = node
+
+    edges = []
+    count = 0
+    while len(layer) > 1:
+        next_layer = []
+        for index in range(0, len(layer), 2):
+            node = graph[f'sum{count}'] = SumNode()
+            count += 1
+
+            for port_name, source in zip(('entry0', 'entry1'), layer[index:index + 2]):
+                edges.append((source.outputs['product'], node.inputs[port_name]))
+
+            next_layer.append(node)
+
+        layer = next_layer
+
+    graph.connect_many(edges)
+    return graph, layer[0]
+
+
+def diamond(size: int) -> t.Tuple[Graph, SumNode]:
+    """``size`` stacked diamonds, each splitting the previous value in two sum nodes and joining them."""
+    graph = Graph()
+    previous = graph['parameter'] = ParameterNode(value=1)
+
+    edges = []
+    for index in range(size):
+        left = graph[f'left{index}'] = SumNode()
+        right = graph[f'right{index}'] = SumNode()
+        join = graph[f'join{index}'] = SumNode()
+
+        edges.extend([(previous.outputs['product'], left.inputs['entry0']),
+                      (previous.outputs['product'], right.inputs['entry0']),
+                      (left.outputs['product'], join.inputs['entry0']),
+                      (right.outputs['product'], join.inputs['entry1'])])
+        previous = join
+
+    graph.connect_many(edges)
+    return graph, previous
+
+
+SHAPES: t.Dict[str, t.Callable[[int], t.Tuple[Graph, SumNode]]] = {'chain': chain,
+                                                                    'fan_in': fan_in,
+                                                                    'diamond': diamond}
@@ -0,0 +1,248 @@
+"""Benchmark suite.
+
+Measures node creation rate, evaluation latency, dump and load throughput and peak memory on generated chain,
+fan-in and diamond graphs, the cost of event dispatch, the loading of large generated graphs and the focused
+benchmarks of this package. Results are written as JSON and can be compared with the results of another commit.
+Run from the repository root:
+
+    python -m benchmarks.run [--size N] [--repeat N] [--shapes chain,fan_in,diamond] [--only name,...]
+                             [--output results.json] [--compare previous.json]
+"""
+import sys
+import json
+import time
+import pathlib
+import argparse
+import platform
+import tempfile
+import datetime
+import tracemalloc
+import subprocess
+import typing as t
+
+from backend.meta import InstanceManager, ReferenceManager
+from backend.events import EventManager, Events
+from backend.topology import TopologyManager
+from backend.data_types import GenericInt
+from backend.graphs import Graph
+
+from benchmarks.graphs import SHAPES
+from benchmarks.bench_collections import bench_insert
+from benchmarks.bench_set_data import bench_set_data
+from benchmarks.bench_decode import bench_decode
+from benchmarks.bench_load import bench_load
+from benchmarks.bench_startup import bench_startup
+
+
+def reset() -> None:
+    InstanceManager().clear_all()
+    TopologyManager().clear()
+
+
+def best_of(repeat: int, function: t.Callable[[], t.Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def bench_creation(shape: str, size: int, repeat: int) -> dict:
+    build = SHAPES[shape]
+
+    timings = []
+    nodes = 0
+    for _ in range(repeat):
+        reset()
+        start = time.perf_counter()
+        graph, _ = build(size)
+        timings.append(time.perf_counter() - start)
+        nodes = len(graph)
+
+    return {'nodes': nodes,
+            'seconds': min(timings),
+            'nodes_per_second': nodes / min(timings)}
+
+
+def bench_evaluation(shape: str, size: int, repeat: int) -> dict:
+    reset()
+    graph, sink = SHAPES[shape](size)
+
+    # the whole graph is pulled from its sink, as an application reads a value
+    sink.outputs['product'].data()
+    seconds = best_of(repeat, sink.outputs['product'].data)
+
+    return {'nodes': len(graph),
+            'seconds': seconds,
+            'microseconds_per_node': seconds / len(graph) * 1e6}
+
+
+def bench_serialization(shape: str, size: int, repeat: int) -> dict:
+    dump_timings, load_timings = [], []
+    nodes = 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / 'graph.json'
+
+        for _ in range(repeat):
+            reset()
+            graph, _ = SHAPES[shape](size)
+            nodes = len(graph)
+
+            start = time.perf_counter()
+            graph.dump(path)
+            dump_timings.append(time.perf_counter() - start)
+
+            reset()
+            start = time.perf_counter()
+            with ReferenceManager():
+                Graph.load(path)
+            load_timings.append(time.perf_counter() - start)
+
+        file_size = path.stat().st_size
+
+    return {'nodes': nodes,
+            'bytes': file_size,
+            'dump_seconds': min(dump_timings),
+            'load_seconds': min(load_timings),
+            'dump_nodes_per_second': nodes / min(dump_timings),
+            'load_nodes_per_second': nodes / min(load_timings)}
+
+
+def bench_memory(shape: str, size: int) -> dict:
+    reset()
+
+    tracemalloc.start()
+    try:
+        graph, _ = SHAPES[shape](size)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'nodes': len(graph),
+            'peak_bytes': peak,
+            'bytes_per_node': peak / len(graph)}
+
+
+def bench_events(count: int, repeat: int) -> dict:
+    reset()
+    constants = [GenericInt() for _ in range(count)]
+    event = EventManager().get_event_by_name(Events.PostTypeDataChanged.name)
+
+    def write():
+        for index, constant in enumerate(constants):
+            constant.set_data(index)
+
+    result = {'count': count}
+    registered = []
+    try:
+        for callbacks in (0, 1, 10):
+            while len(registered) < callbacks:
+                registered.append(lambda instance, *args, **kwargs: None)
+                event.register(registered[-1])
+
+            result[f'set_data_{callbacks}_callbacks_seconds'] = best_of(repeat, write)
+
+        result['trigger_10_callbacks_seconds'] = best_of(repeat, lambda: [event.trigger(constant)
+                                                                          for constant in constants])
+    finally:
+        for registered_callback in registered:
+            event.deregister(registered_callback)
+
+    return result
+
+
+def run(size: int, repeat: int, shapes: t.List[str], only: t.Optional[t.List[str]] = None) -> dict:
+    suites = {'creation': lambda: {shape: bench_creation(shape, size, repeat) for shape in shapes},
+              'evaluation': lambda: {shape: bench_evaluation(shape, size, repeat) for shape in shapes},
+              'serialization': lambda: {shape: bench_serialization(shape, size, repeat) for shape in shapes},
+              'memory': lambda: {shape: bench_memory(shape, size) for shape in shapes},
+              'events': lambda: bench_events(size * 10, repeat),
+              'collections': lambda: bench_insert(size * 10),
+              'set_data': lambda: bench_set_data(size * 10),
+              'decode': lambda: bench_decode(size),
+              'load': lambda: bench_load(size * 10),
+              'startup': lambda: bench_startup('backend.nodes', max(repeat, 5))}
+
+    results = {}
+    for name, suite in suites.items():
+        if only and name not in only:
+            continue
+
+        print(f'running {name}', file=sys.stderr)
+        results[name] = suite()
+        reset()
+
+    return {'metadata': metadata(size, repeat), 'results': results}
+
+
+def metadata(size: int, repeat: int) -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {'commit': commit,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'size': size,
+            'repeat': repeat}
+
+
+def flatten(results: dict, prefix: str = '') -> t.Dict[str, float]:
+    values = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f'{prefix}{key}.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[f'{prefix}{key}'] = value
+
+    return values
+
+
+def compare(current: dict, previous: dict) -> t.List[t.Tuple[str, float, float, float]]:
+    """Returns the measurements present in both results with their ratio, current over previous."""
+    current_values = flatten(current['results'])
+    previous_values = flatten(previous['results'])
+
+    return [(key, previous_values[key], value, value / previous_values[key])
+            for key, value in current_values.items()
+            if previous_values.get(key) and (key.endswith('seconds') or key.endswith('bytes')
+                                             or key.endswith('_us'))]
+
+
+def main(arguments: t.Optional[t.List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=1000, help='nodes, leaves or diamonds per generated graph')
+    parser.add_argument('--repeat', type=int, default=3, help='repetitions, the best one is reported')
+    parser.add_argument('--shapes', default=','.join(SHAPES), help='comma separated graph shapes')
+    parser.add_argument('--only', default=None, help='comma separated benchmarks to run')
+    parser.add_argument('--output', type=pathlib.Path, default=None, help='JSON file the results are written to')
+    parser.add_argument('--compare', type=pathlib.Path, default=None, help='JSON results to compare with')
+    options = parser.parse_args(arguments)
+
+    results = run(options.size, options.repeat, options.shapes.split(','),
+                  options.only.split(',') if options.only else None)
+
+    if options.output is not None:
+        options.output.parent.mkdir(parents=True, exist_ok=True)
+        options.output.write_text(json.dumps(results, indent=4))
+
+    if options.compare is not None:
+        previous = json.loads(options.compare.read_text())
+        print(f'{"measurement":<60} {"previous":>14} {"current":>14} {"ratio":>8}')
+        for key, previous_value, value, ratio in compare(results, previous):
+            print(f'{key:<60} {previous_value:>14.6g} {value:>14.6g} {ratio:>8.2f}')
+    else:
+        for key, value in flatten(results['results']).items():
+            print(f'{key}: {value:.6g}')
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,7 @@ import unittest
 
 from backend.meta import ReferenceManager, InstanceManager
 from backend.data_types import GenericStr
-from backend.attributes import StringAttribute
+from backend.attributes import StringAttribute, ReferenceCycleError, AttributeResolver
 
 
 class TestAttributeNode(unittest.TestCase):
@@ -66,6 +66,58 @@ class TestAttributeNode(unittest.TestCase):
         # driver object is loaded so referencing that
         self.assertEqual(loaded_driver.get_id(), loaded_driven.attributes['reference'].data())
 
+    def test_reference_chain(self):
+        source = StringAttribute(value='source')
+        middle = StringAttribute(value='middle')
+        driven = StringAttribute(value='driven')
+
+        middle.attributes['reference'].set_data(source)
+        driven.attributes['reference'].set_data(middle)
+        self.assertEqual(driven.data(), 'source')
+
+        source.attributes['value'].set_data('changed')
+        self.assertEqual(driven.data(), 'changed')
+
+        source.attributes['reference'].set_data(StringAttribute(value='extended'))
+        self.assertEqual(driven.data(), 'extended')
+
+        middle.attributes['reference'].del_data()
+        self.assertEqual(driven.data(), 'middle')
+
+    def test_deleted_attributes_evicted(self):
+        resolver = AttributeResolver()
+        source = StringAttribute(value='source')
+        other = StringAttribute(value='other')
+        self.assertEqual(other.data(), 'other')
+
+        for _ in range(3):
+            driven = StringAttribute()
+            driven.attributes['reference'].set_data(source)
+            self.assertEqual(driven.data(), 'source')
+
+            driven.delete()
+
+        self.assertNotIn(driven.get_id(), resolver._values)
+        self.assertEqual(resolver._dependents[source.attributes['value'].get_id()], {source.get_id()})
+        self.assertIn(other.get_id(), resolver._values)
+
+        middle = StringAttribute(value='middle')
+        middle.attributes['reference'].set_data(source)
+        self.assertEqual(middle.data(), 'source')
+
+        source.delete()
+        self.assertEqual(middle.data(), 'middle')
+
+    def test_reference_cycle(self):
+        first = StringAttribute(value='first')
+        second = StringAttribute(value='second')
+
+        first.attributes['reference'].set_data(second)
+        second.attributes['reference'].set_data(first)
+
+        with self.assertRaises(ReferenceCycleError):
+            first.data()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,235 @@
+import array
+import pathlib
+import unittest
+
+from backend.nodes import ParameterNode, SumNode
+from backend.streaming import StreamingNode, StreamSumNode
+from backend.aggregations import PortCollection
+from backend.ports import OutputPort
+from backend.evaluation import EvaluationManager
+from backend.caching import (NodeHasher,
+                             PersistentResultCache,
+                             SQLiteResultStore,
+                             DirectoryResultStore,
+                             MemoizationCache)
+
+
+class CountingSumNode(SumNode):
+    persistent_cache = True
+    calls = 0
+
+    def data(self):
+        CountingSumNode.calls += 1
+        return super().data()
+
+
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self):
+        self.path = pathlib.Path("../dump/cache/results.sqlite")
+        self.path.unlink(missing_ok=True)
+
+        self.parameter = ParameterNode(value=4)
+        self.node = CountingSumNode()
+        self.node.inputs['entry0'].attributes['connections'].set_data([self.parameter.outputs['product']])
+
+        self.consumer = SumNode()
+        self.consumer.inputs['entry0'].attributes['connections'].set_data([self.node.outputs['product']])
+
+        CountingSumNode.calls = 0
+
+    def evaluate(self, store):
+        cache = PersistentResultCache(store).install()
+        try:
+            return self.consumer.data(), cache
+        finally:
+            cache.uninstall()
+
+    def test_hash_changes_with_upstream(self):
+        hasher = NodeHasher()
+        original = hasher.hash(self.node)
+
+        self.parameter.attributes['value'].attributes['value'].set_data(5)
+        self.assertNotEqual(hasher.hash(self.node), original)
+
+    def test_hash_encodes_buffers(self):
+        hasher = NodeHasher()
+        value = self.parameter.attributes['value'].attributes['value']
+
+        value.set_data_unchecked(array.array('d', [0.0] * 1000))
+        original = hasher.hash(self.parameter)
+
+        value.set_data_unchecked(array.array('d', [0.0] * 999 + [1.0]))
+        self.assertNotEqual(hasher.hash(self.parameter), original)
+
+        value.set_data_unchecked(object())
+        with self.assertRaises(TypeError):
+            hasher.hash(self.parameter)
+
+    def test_reuse_across_stores(self):
+        value, cache = self.evaluate(SQLiteResultStore(self.path))
+        self.assertEqual((value, cache.misses, CountingSumNode.calls), (4, 1, 1))
+
+        value, cache = self.evaluate(SQLiteResultStore(self.path))
+        self.assertEqual((value, cache.hits, CountingSumNode.calls), (4, 1, 1))
+
+        self.parameter.attributes['value'].attributes['value'].set_data(6)
+        value, cache = self.evaluate(SQLiteResultStore(self.path))
+        self.assertEqual((value, cache.misses, CountingSumNode.calls), (6, 1, 2))
+
+    def test_lru_eviction(self):
+        store = DirectoryResultStore(pathlib.Path("../dump/cache/results"))
+        store.clear()
+
+        store.set('first', b'x' * 10)
+        store.set('second', b'x' * 10)
+        store.get('first')
+        store.set('third', b'x' * 10)
+
+        self.assertEqual(store.evict(20), 1)
+        self.assertIsNone(store.get('second'))
+        self.assertIsNotNone(store.get('first'))
+
+    def test_sqlite_lru_eviction(self):
+        store = SQLiteResultStore(self.path)
+
+        store.set('first', b'x' * 10)
+        store.set('second', b'x' * 10)
+        store.get('first')
+        store.set('third', b'x' * 10)
+
+        self.assertEqual(store.evict(20), 1)
+        self.assertIsNone(store.get('second'))
+        self.assertIsNotNone(store.get('first'))
+        store.close()
+
+    def test_directory_keys(self):
+        store = DirectoryResultStore(pathlib.Path("../dump/cache/results"))
+        store.clear()
+
+        store.set('node:a_b', b'first')
+        store.set('node_a:b', b'second')
+        store.set('node:a/b', b'third')
+
+        self.assertEqual((store.get('node:a_b'), store.get('node_a:b'), store.get('node:a/b')),
+                         (b'first', b'second', b'third'))
+
+    def test_pass_evaluates_once(self):
+        diamond = SumNode()
+        diamond.inputs['entry0'].attributes['connections'].set_data([self.node.outputs['product']])
+        diamond.inputs['entry1'].attributes['connections'].set_data([self.node.outputs['product']])
+
+        with EvaluationManager().evaluation():
+            self.assertEqual(diamond.data(), 8)
+
+        self.assertEqual(CountingSumNode.calls, 1)
+
+
+class MemoizedSumNode(SumNode):
+    memoize = True
+    calls = 0
+
+    def data(self):
+        MemoizedSumNode.calls += 1
+        return super().data()
+
+
+class RandomSumNode(MemoizedSumNode):
+    deterministic = False
+
+
+class CountingRangeNode(StreamingNode):
+    def __init__(self, **kwargs):
+        self.produced = 0
+
+        super().__init__(**kwargs)
+
+    def init_outputs(self):
+        collection = PortCollection()
+
+        collection['product'] = OutputPort(parent=self)
+
+        return collection
+
+    def chunks(self):
+        for offset in range(0, 100, 10):
+            self.produced += 1
+            yield list(range(offset, offset + 10))
+
+
+class MemoizedStreamSumNode(StreamSumNode):
+    memoize = True
+
+
+class TestMemoization(unittest.TestCase):
+    def setUp(self):
+        self.cache = MemoizationCache()
+        self.cache.clear()
+        self.cache.configure(MemoizationCache.default_max_bytes)
+        self.cache.install()
+
+        self.parameter = ParameterNode(value=1)
+        self.consumer = SumNode()
+
+        MemoizedSumNode.calls = 0
+
+    def tearDown(self):
+        self.cache.uninstall()
+
+    def connect(self, node):
+        node.inputs['entry0'].attributes['connections'].set_data([self.parameter.outputs['product']])
+        self.consumer.inputs['entry0'].attributes['connections'].set_data([node.outputs['product']])
+
+    def set_value(self, value):
+        self.parameter.attributes['value'].attributes['value'].set_data(value)
+
+    def test_alternating_inputs(self):
+        self.connect(MemoizedSumNode())
+
+        for value in (1, 2, 1, 2):
+            self.set_value(value)
+            self.assertEqual(self.consumer.data(), value)
+
+        self.assertEqual(MemoizedSumNode.calls, 2)
+        self.assertEqual(self.cache.stats()['hits'], 2)
+        self.assertEqual(self.cache.stats()['classes']['MemoizedSumNode'], {'hits': 2, 'misses': 2})
+
+    def test_non_deterministic_opt_out(self):
+        self.connect(RandomSumNode())
+
+        self.consumer.data()
+        self.consumer.data()
+
+        self.assertEqual(MemoizedSumNode.calls, 2)
+        self.assertEqual(self.cache.stats()['misses'], 0)
+
+    def test_memory_budget(self):
+        self.connect(MemoizedSumNode())
+
+        for value in range(10):
+            self.set_value(value)
+            self.consumer.data()
+
+        budget = self.cache.size() // 2
+        self.cache.configure(budget)
+        self.assertLessEqual(self.cache.size(), budget)
+        self.assertGreater(self.cache.stats()['evictions'], 0)
+
+        self.set_value(9)
+        self.consumer.data()
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_streamed_inputs_not_materialized(self):
+        source = CountingRangeNode()
+        total = MemoizedStreamSumNode()
+        total.inputs['entry0'].attributes['connections'].set_data([source.outputs['product']])
+
+        self.assertEqual(total.outputs['product'].data(), sum(range(100)))
+        self.assertEqual(source.produced, 10)
+
+        self.assertEqual(total.outputs['product'].data(), sum(range(100)))
+        self.assertEqual(source.produced, 10)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
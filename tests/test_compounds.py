@@ -0,0 +1,164 @@
+import pathlib
+import unittest
+
+from backend.meta import InstanceManager
+from backend.evaluation import EvaluationManager
+from backend.caching import PersistentResultCache, DirectoryResultStore
+from backend.compounds import CompoundDefinition, CompoundLibrary, CompoundNode
+from backend.nodes import ParameterNode, SumNode
+
+
+class PersistentSumNode(SumNode):
+    persistent_cache = True
+
+
+class TestCompounds(unittest.TestCase):
+    def setUp(self):
+        CompoundLibrary().clear()
+
+        self.definition = CompoundDefinition('double')
+
+        value = self.definition.add_input('value')
+        offset = self.definition.add_input('offset')
+
+        double = self.definition.body['double'] = SumNode()
+        self.connect(value.outputs['product'], double.inputs['entry0'])
+        self.connect(value.outputs['product'], double.inputs['entry1'])
+
+        shifted = self.definition.body['shifted'] = SumNode()
+        self.connect(double.outputs['product'], shifted.inputs['entry0'])
+        self.connect(offset.outputs['product'], shifted.inputs['entry1'])
+
+        self.definition.expose_output('double', double.outputs['product'])
+        self.definition.expose_output('shifted', shifted.outputs['product'])
+
+        CompoundLibrary().register(self.definition)
+
+    def tearDown(self):
+        CompoundLibrary().clear()
+
+    def connect(self, output_port, input_port):
+        input_port.attributes['connections'].append_data(output_port)
+
+    @staticmethod
+    def count(cls):
+        return sum(isinstance(instance, cls) for instance in InstanceManager().instances().values())
+
+    def instance(self, value, offset=0):
+        compound = CompoundNode(definition='double')
+
+        self.connect(ParameterNode(value=value).outputs['product'], compound.inputs['value'])
+        self.connect(ParameterNode(value=offset).outputs['product'], compound.inputs['offset'])
+
+        return compound
+
+    def test_instances_share_body(self):
+        sum_nodes = self.count(SumNode)
+        compounds = [self.instance(value) for value in range(10)]
+
+        self.assertEqual(self.count(SumNode), sum_nodes)
+        self.assertEqual(len(self.definition.body), 4)
+
+        self.assertEqual([compound.outputs['double'].data() for compound in compounds],
+                         [value * 2 for value in range(10)])
+
+    def test_outputs_evaluated_per_instance(self):
+        first = self.instance(1, offset=5)
+        second = self.instance(2, offset=7)
+
+        consumer = SumNode()
+        self.connect(first.outputs['shifted'], consumer.inputs['entry0'])
+        self.connect(second.outputs['double'], consumer.inputs['entry1'])
+
+        self.assertEqual(first.outputs['double'].data(), 2)
+        self.assertEqual(first.outputs['shifted'].data(), 7)
+        self.assertEqual(consumer.data(), 7 + 4)
+
+    def test_plan_shared_and_recompiled(self):
+        first = self.instance(1)
+        first.outputs['shifted'].data()
+        plan = self.definition.plan('shifted')
+
+        self.instance(2).outputs['shifted'].data()
+        self.assertIs(self.definition.plan('shifted'), plan)
+        self.assertEqual(len(plan.steps), 3)
+
+        self.connect(self.definition.input_node('offset').outputs['product'],
+                     self.definition.body['shifted'].inputs['entry0'])
+        self.assertIsNot(self.definition.plan('shifted'), plan)
+        self.assertEqual(first.outputs['shifted'].data(), 2)
+
+    def test_nested_compounds(self):
+        outer = CompoundDefinition('quadruple')
+        value = outer.add_input('value')
+
+        inner = outer.body['inner'] = CompoundNode(definition='double')
+        self.connect(value.outputs['product'], inner.inputs['value'])
+        self.connect(value.outputs['product'], inner.inputs['offset'])
+        outer.expose_output('product', inner.outputs['shifted'])
+        CompoundLibrary().register(outer)
+
+        compounds = []
+        for number in (1, 2):
+            compound = CompoundNode(definition='quadruple')
+            self.connect(ParameterNode(value=number).outputs['product'], compound.inputs['value'])
+            compounds.append(compound)
+
+        consumer = SumNode()
+        self.connect(compounds[0].outputs['product'], consumer.inputs['entry0'])
+        self.connect(compounds[1].outputs['product'], consumer.inputs['entry1'])
+
+        self.assertEqual(consumer.data(), 3 + 6)
+
+    def test_persistent_cache_per_instance(self):
+        definition = CompoundDefinition('cached_double')
+        value = definition.add_input('value')
+
+        double = definition.body['double'] = PersistentSumNode()
+        self.connect(value.outputs['product'], double.inputs['entry0'])
+        self.connect(value.outputs['product'], double.inputs['entry1'])
+        definition.expose_output('double', double.outputs['product'])
+        CompoundLibrary().register(definition)
+
+        compounds = []
+        for number in (1, 10):
+            compound = CompoundNode(definition='cached_double')
+            self.connect(ParameterNode(value=number).outputs['product'], compound.inputs['value'])
+            compounds.append(compound)
+
+        store = DirectoryResultStore(pathlib.Path("../dump/cache/compounds"))
+        store.clear()
+
+        cache = PersistentResultCache(store).install()
+        try:
+            self.assertEqual([compound.outputs['double'].data() for compound in compounds], [2, 20])
+            self.assertEqual([compound.outputs['double'].data() for compound in compounds], [2, 20])
+        finally:
+            cache.uninstall()
+
+        self.assertEqual((cache.misses, cache.hits), (2, 2))
+
+    def test_retained_until_body_changes(self):
+        compound = self.instance(1, offset=5)
+
+        EvaluationManager().enable_retention()
+        try:
+            self.assertEqual(compound.outputs['shifted'].data(), 7)
+            self.assertTrue(EvaluationManager().retained(compound))
+
+            self.definition.body['shifted'].inputs['entry1'].attributes['connections'].set_data([])
+            self.assertFalse(EvaluationManager().retained(compound))
+            self.assertEqual(compound.outputs['shifted'].data(), 2)
+        finally:
+            EvaluationManager().disable_retention()
+
+    def test_serialize_definition(self):
+        data = self.definition.serialize()
+
+        self.assertEqual(data['inputs'], {'value': 'input_value', 'offset': 'input_offset'})
+        self.assertEqual(data['outputs']['shifted'], ['shifted', 'product'])
+        self.assertEqual(set(data['body']), {'class', 'input_value', 'input_offset', 'double', 'shifted'})
+
+
+if __name__ == '__main__':
+    unittest.main()
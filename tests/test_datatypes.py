@@ -1,8 +1,12 @@
+import array
+import ctypes
 import pathlib
 import unittest
 
 from backend.meta import InstanceManager
-from backend.data_types import GenericInt
+from backend.events import EventManager, Events
+from backend.data_types import (GenericInt, GenericFloat, GenericStr, GenericList, GenericBuffer, FloatBuffer,
+                                DataTypeEnum, encode_buffer, decode_buffer)
 
 
 class TestDataTypes(unittest.TestCase):
@@ -90,5 +94,130 @@ class TestDataTypes(unittest.TestCase):
         self.assertEqual(loaded_constant.get_id(), self.constant.get_id())
 
 
+class StrList(GenericList):
+    valid_types = (str, )
+
+
+class TestValidationFastPath(unittest.TestCase):
+    def test_validator_compiled_per_class(self):
+        self.assertIs(GenericInt.validator(), GenericInt.validator())
+        self.assertIsNot(GenericInt.validator(), GenericStr.validator())
+
+        self.assertTrue(StrList.validator()(['a', 'b'] * 1000))
+        self.assertFalse(StrList.validator()(['a', 1]))
+        self.assertFalse(StrList().set_data(['a', 1]))
+
+    def test_unchecked_write(self):
+        constant = GenericStr()
+
+        self.assertTrue(constant.set_data_unchecked(10))
+        self.assertEqual(constant.data(), 10)
+
+    def test_set_data_many(self):
+        constants = [GenericInt() for _ in range(3)]
+
+        self.assertFalse(GenericInt.set_data_many(constants, [1, 'b', 3]))
+        self.assertEqual([constant.data() for constant in constants], [0, 0, 0])
+
+        self.assertTrue(GenericInt.set_data_many(constants, [1, 2, 3]))
+        self.assertEqual([constant.data() for constant in constants], [1, 2, 3])
+
+        with self.assertRaises(ValueError):
+            GenericInt.set_data_many(constants, [1])
+
+    def test_set_data_many_converts(self):
+        integers = [GenericInt() for _ in range(2)]
+        self.assertTrue(GenericInt.set_data_many(integers, [1.7, 2.2]))
+        self.assertEqual([integer.data() for integer in integers], [1, 2])
+        self.assertIsInstance(integers[0].data(), int)
+
+        floats = [GenericFloat()]
+        self.assertTrue(GenericFloat.set_data_many(floats, [3]))
+        self.assertIsInstance(floats[0].data(), float)
+
+        enums = [DataTypeEnum() for _ in range(2)]
+        self.assertTrue(DataTypeEnum.set_data_many(enums, ['Int', DataTypeEnum.DataType.Str]))
+        self.assertEqual([enum.data() for enum in enums], [DataTypeEnum.DataType.Int, DataTypeEnum.DataType.Str])
+        self.assertFalse(DataTypeEnum.set_data_many(enums, ['Complex', 'Int']))
+
+        buffers = [FloatBuffer()]
+        self.assertTrue(FloatBuffer.set_data_many(buffers, [encode_buffer(array.array('d', [1.5, 2.0]))]))
+        self.assertEqual(memoryview(buffers[0].data()).tolist(), [1.5, 2.0])
+
+    def test_unchecked_write_triggers_events(self):
+        changed = []
+
+        def callback(instance, *args, **kwargs):
+            changed.append(instance)
+
+        event = EventManager().get_event_by_name(Events.PostTypeDataChanged.name)
+        event.register(callback)
+
+        constant = GenericInt()
+        try:
+            constant.set_data_unchecked(5)
+        finally:
+            event.deregister(callback)
+
+        self.assertIn(constant, changed)
+
+
+class MatrixBuffer(FloatBuffer):
+    shape = (None, 3)
+
+
+class TestBufferTypes(unittest.TestCase):
+    def setUp(self):
+        self.values = array.array('d', [1.5, 2.0, 3.0, 4.0, 5.0, 6.0])
+
+    def test_stored_without_copy(self):
+        buffer = FloatBuffer(data=self.values)
+
+        self.assertIs(buffer.data(), self.values)
+
+    def test_validation(self):
+        buffer = FloatBuffer()
+
+        self.assertFalse(buffer.set_data(array.array('i', [1, 2])))
+        self.assertFalse(buffer.set_data(array.array('f', [1.0])))
+        self.assertFalse(buffer.set_data([1.0, 2.0]))
+        self.assertTrue(GenericBuffer().set_data(array.array('i', [1, 2])))
+
+    def test_shape_validation(self):
+        buffer = MatrixBuffer()
+
+        self.assertFalse(buffer.set_data(self.values))
+        self.assertTrue(buffer.set_data(memoryview(self.values).cast('B').cast('d', [2, 3])))
+
+    def test_serialization(self):
+        buffer = FloatBuffer(data=self.values)
+        data = buffer.serialize()
+        buffer.delete()
+
+        deserialized = FloatBuffer.deserialize(data)
+        self.assertIsNot(deserialized.data(), self.values)
+        self.assertEqual(deserialized.data(), self.values)
+
+    def test_binary_block(self):
+        matrix = memoryview(self.values).cast('B').cast('d', [2, 3])
+
+        decoded = decode_buffer(encode_buffer(matrix, binary=True))
+        self.assertEqual(decoded.shape, (2, 3))
+        self.assertEqual(decoded.tolist(), matrix.tolist())
+
+    def test_byte_order(self):
+        # a buffer in the byte order the machine does not use
+        big_endian = (ctypes.c_double.__ctype_be__ * 3)(1.5, 2.0, 3.0)
+        little_endian = (ctypes.c_double.__ctype_le__ * 3)(1.5, 2.0, 3.0)
+
+        for value in (big_endian, little_endian):
+            for binary in (False, True):
+                self.assertEqual(decode_buffer(encode_buffer(value, binary=binary)).tolist(), [1.5, 2.0, 3.0])
+
+        self.assertIn(encode_buffer(self.values)['format'], ('<d', '>d'))
+        self.assertEqual(decode_buffer({'kind': 'array', 'format': 'd', 'shape': [6],
+                                        'bytes': encode_buffer(self.values)['bytes']}), self.values)
+
+
 if __name__ == '__main__':
     unittest.main()
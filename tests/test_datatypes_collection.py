@@ -6,6 +6,10 @@ from backend.data_types import GenericStr, GenericInt
 from backend.aggregations import DataTypeCollection
 
 
+class SharedDataTypeCollection(DataTypeCollection):
+    validate_uniqueness = False
+
+
 class TestDataTypeCollection(unittest.TestCase):
     def setUp(self):
         self.collection = DataTypeCollection()
@@ -20,6 +24,40 @@ class TestDataTypeCollection(unittest.TestCase):
         self.assertIn('label', self.collection)
         self.assertIn('size', self.collection)
 
+    def test_uniqueness(self):
+        label = self.collection['label']
+
+        self.assertFalse(self.collection.set_items({'other': label}))
+        self.assertNotIn('other', self.collection)
+        self.assertTrue(self.collection.contains_item(label))
+
+        del self.collection['label']
+        self.assertFalse(self.collection.contains_item(label))
+        self.assertTrue(self.collection.set_items({'other': label}))
+        self.assertIn('other', self.collection)
+
+    def test_shared_item_without_uniqueness(self):
+        collection = SharedDataTypeCollection()
+        value = GenericInt(data=1)
+
+        self.assertTrue(collection.set_items({'first': value, 'second': value}))
+
+        del collection['first']
+        self.assertTrue(collection.contains_item(value))
+        self.assertIs(collection.get_item_by_id(value.get_id()), value)
+
+        del collection['second']
+        self.assertFalse(collection.contains_id(value.get_id()))
+
+    def test_set_items_uniqueness(self):
+        value = GenericInt(data=1)
+
+        self.assertFalse(self.collection.set_items({'first': value, 'second': value}))
+        self.assertNotIn('first', self.collection)
+
+        self.assertTrue(self.collection.set_items({'size': value}))
+        self.assertTrue(self.collection.contains_id(value.get_id()))
+
     def test_item_data(self):
         self.assertEqual(self.collection['size'].data(), 5)
 
@@ -0,0 +1,84 @@
+import pathlib
+import tempfile
+import unittest
+
+from backend.meta import InstanceManager, ReferenceManager
+from backend.topology import TopologyManager
+from backend.evaluation import EvaluationManager
+from backend.generators import GraphGenerator
+from backend.nodes import ParameterNode, SumNode
+from backend.graphs import Graph
+
+
+def evaluate(graph):
+    # last generated first, so the upstream of each node is pulled through it
+    with EvaluationManager().evaluation():
+        return {name: node.outputs['product'].data() for name, node in reversed(list(graph.items()))}
+
+
+class TestGenerators(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name) / 'graph.json'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_topologies(self):
+        generator = GraphGenerator(seed=1)
+
+        chain = generator.chain(10)
+        self.assertEqual((len(chain), len(chain.edges)), (11, 10))
+
+        tree = generator.tree(depth=3, fan_in=3)
+        self.assertEqual((len(tree), len(tree.edges)), (27 + 9 + 3 + 1, 39))
+        self.assertEqual(len(tree.sinks()), 1)
+
+        layered = generator.layered(layers=4, width=5, fan_in=2)
+        self.assertEqual((len(layered), len(layered.edges)), (20, 30))
+
+        fan_out = generator.fan_out(8)
+        self.assertEqual(len(fan_out.sinks()), 8)
+
+        dag = generator.random_dag(100, fan_in=3, sources=4, window=10)
+        self.assertEqual(len(dag), 100)
+        self.assertTrue(all(target - source <= 10 for source, target, _ in dag.edges))
+        self.assertEqual(dag.classes.count(ParameterNode), 4)
+
+    def test_build(self):
+        graph = GraphGenerator().tree(depth=4).build()
+
+        self.assertEqual(len(graph), 31)
+        self.assertEqual(len(graph.edges()), 30)
+        self.assertEqual(evaluate(graph)['sumnode30'], 16)
+
+    def test_dump_matches_build(self):
+        spec = GraphGenerator(seed=2).random_dag(200, fan_in=2, sources=5, window=20)
+        expected = evaluate(spec.build())
+
+        spec.dump(self.path)
+        InstanceManager().clear_all()
+        TopologyManager().clear()
+        with ReferenceManager():
+            loaded = Graph.load(self.path)
+
+        self.assertEqual(evaluate(loaded), expected)
+        self.assertEqual(len(loaded.edges()), len(spec.edges))
+        self.assertIsInstance(loaded['sumnode199'], SumNode)
+
+        positions = {node.get_id(): position for position, node in enumerate(loaded.topological_order())}
+        for node in loaded.values():
+            for input_port in node.inputs.values():
+                for output_port in input_port.attributes['connections'].references():
+                    self.assertLess(positions[output_port.attributes['parent'].data()], positions[node.get_id()])
+
+    def test_seeded_dump(self):
+        GraphGenerator(seed=3).layered(layers=3, width=4).dump(self.path)
+        other_path = self.path.with_name('other.json')
+        GraphGenerator(seed=3).layered(layers=3, width=4).dump(other_path)
+
+        self.assertEqual(self.path.read_text(), other_path.read_text())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import pathlib
+import unittest
+
+from backend.meta import InstanceManager, ReferenceManager
+from backend.events import EventManager, Events
+from backend.nodes import ParameterNode, SumNode
+from backend.graphs import Graph
+
+
+class TestGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph()
+
+        self.graph['first'] = ParameterNode(value=2)
+        self.graph['second'] = ParameterNode(value=3)
+        self.graph['sum'] = SumNode()
+
+        self.edges = [(self.graph['first'].outputs['product'], self.graph['sum'].inputs['entry0']),
+                      (self.graph['second'].outputs['product'], self.graph['sum'].inputs['entry0']),
+                      (self.graph['second'].outputs['product'], self.graph['sum'].inputs['entry1'])]
+
+        self.path = pathlib.Path("../dump/graphs/graph.json")
+
+    def test_connect_many(self):
+        self.assertTrue(self.graph.connect_many(self.edges))
+
+        self.assertEqual(len(self.graph.edges()), 3)
+        self.assertEqual(self.graph['sum'].data(), 8)
+
+    def test_connect_is_idempotent(self):
+        self.graph.connect_many(self.edges)
+        self.graph.connect_many(self.edges)
+
+        self.assertEqual(len(self.graph['sum'].inputs['entry0'].attributes['connections'].data()), 2)
+
+    def test_disconnect_many(self):
+        self.graph.connect_many(self.edges)
+        self.assertTrue(self.graph.disconnect_many(self.edges[1:]))
+
+        self.assertEqual(len(self.graph.edges()), 1)
+        self.assertEqual(self.graph['sum'].data(), 2)
+        self.assertEqual(self.graph.downstream(self.graph['second'].outputs['product']), set())
+
+    def test_edges_follow_direct_connections(self):
+        self.graph.connect_many(self.edges[:1])
+
+        connections = self.graph['sum'].inputs['entry1'].attributes['connections']
+        connections.append_data(self.graph['second'].outputs['product'])
+        self.assertEqual(len(self.graph.edges()), 2)
+        self.assertTrue(self.graph.is_connected(*self.edges[2]))
+
+        self.graph['sum'].inputs['entry0'].attributes['connections'].del_data()
+        self.assertEqual(self.graph.downstream(self.graph['first'].outputs['product']), set())
+
+        self.assertTrue(self.graph.connect_many(self.edges))
+        self.assertEqual(len(connections.data()), 1)
+        self.assertEqual(self.graph['sum'].data(), 8)
+
+    def test_invalid_edge_rejects_batch(self):
+        outsider = ParameterNode(value=1)
+        edges = self.edges + [(outsider.outputs['product'], self.graph['sum'].inputs['entry1'])]
+
+        self.assertFalse(self.graph.connect_many(edges))
+        self.assertEqual(self.graph.edges(), [])
+
+    def test_single_batched_event(self):
+        calls = []
+
+        def callback(graph, edges):
+            calls.append(len(edges))
+
+        event = EventManager().get_event_by_name(Events.PostGraphConnected.name)
+        event.register(callback)
+
+        try:
+            self.graph.connect_many(self.edges)
+        finally:
+            event.deregister(callback)
+
+        self.assertEqual(calls, [3])
+
+    def test_dump_and_load(self):
+        self.graph.connect_many(self.edges)
+        self.graph.dump(self.path, indent=4)
+
+        InstanceManager().clear_all()
+        with ReferenceManager():
+            loaded_graph = Graph.load(self.path)
+
+        self.assertIsInstance(loaded_graph, Graph)
+        self.assertEqual(sorted(loaded_graph.edges()), sorted(self.graph.edges()))
+        self.assertEqual(loaded_graph['sum'].data(), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+
+from backend.meta import InstanceManager
+from backend.history import HistoryManager
+from backend.data_types import GenericInt, FloatBuffer
+from backend.ports import InputPort, OutputPort
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        self.history = HistoryManager()
+        self.history.clear()
+        self.history.configure(max_steps=HistoryManager.default_max_steps,
+                               max_memory=HistoryManager.default_max_memory)
+        self.history.enable()
+
+    def tearDown(self):
+        self.history.disable()
+        self.history.clear()
+
+    def test_undo_redo_data(self):
+        constant = GenericInt(data=1)
+        constant.set_data(2)
+        constant.set_data(3)
+
+        self.assertTrue(self.history.undo())
+        self.assertEqual(constant.data(), 2)
+
+        self.assertTrue(self.history.undo())
+        self.assertEqual(constant.data(), 1)
+
+        self.assertTrue(self.history.redo())
+        self.assertEqual(constant.data(), 2)
+
+    def test_invalid_data_not_recorded(self):
+        constant = GenericInt(data=1)
+        steps = len(self.history.undo_steps())
+
+        self.assertFalse(constant.set_data('hello'))
+        self.assertEqual(len(self.history.undo_steps()), steps)
+
+    def test_creation_is_single_step(self):
+        port = InputPort(label='input')
+        self.assertIn(port.get_id(), InstanceManager().instances())
+        self.assertEqual(len(self.history.undo_steps()), 1)
+
+        self.history.undo()
+        self.assertNotIn(port.get_id(), InstanceManager().instances())
+
+        self.history.redo()
+        self.assertIn(port.get_id(), InstanceManager().instances())
+
+    def test_delete(self):
+        constant = GenericInt(data=1)
+        constant.delete()
+        self.assertNotIn(constant.get_id(), InstanceManager().instances())
+
+        self.history.undo()
+        self.assertIn(constant.get_id(), InstanceManager().instances())
+
+    def test_delete_connected_and_undo(self):
+        out_port = OutputPort(label='output')
+        other_port = OutputPort(label='other')
+        connections = InputPort(label='input').attributes['connections']
+        connections.set_data([out_port, other_port])
+
+        other_port.delete()
+        self.assertEqual(connections.references(), [out_port])
+
+        self.history.undo()
+        self.assertEqual(connections.references(), [out_port, other_port])
+
+    def test_transaction_and_append(self):
+        out_port = OutputPort(label='output')
+        in_port = InputPort(label='input')
+        connections = in_port.attributes['connections']
+
+        with self.history.transaction('connect'):
+            connections.append_data(out_port)
+            connections.append_data(out_port)
+
+        self.assertEqual(self.history.undo_steps()[-1].label, 'connect')
+        self.assertEqual(len(connections.data()), 2)
+
+        self.history.undo()
+        self.assertEqual(connections.data(), [])
+
+        self.history.redo()
+        self.assertEqual(connections.data(), [out_port.get_id(), out_port.get_id()])
+
+    def test_new_change_clears_redo(self):
+        constant = GenericInt(data=1)
+        constant.set_data(2)
+
+        self.history.undo()
+        self.assertTrue(self.history.can_redo())
+
+        constant.set_data(5)
+        self.assertFalse(self.history.can_redo())
+
+    def test_eviction(self):
+        self.history.configure(max_steps=3)
+        constant = GenericInt(data=0)
+
+        for value in range(10):
+            constant.set_data(value + 1)
+
+        self.assertEqual(len(self.history.undo_steps()), 3)
+
+        self.history.configure(max_memory=0)
+        self.assertEqual(len(self.history.undo_steps()), 0)
+        self.assertEqual(self.history.memory(), 0)
+
+    def test_eviction_drops_redo_first(self):
+        constant = GenericInt(data=0)
+        for value in range(4):
+            constant.set_data(value + 1)
+
+        self.history.undo()
+        self.history.undo()
+        steps = len(self.history.undo_steps())
+        self.history.configure(max_memory=self.history.memory() - 1)
+
+        self.assertEqual(len(self.history.redo_steps()), 1)
+        self.assertEqual(len(self.history.undo_steps()), steps)
+
+    def test_failed_change_keeps_auto_commit(self):
+        buffer = FloatBuffer()
+        with self.assertRaises(KeyError):
+            buffer.set_data({'x': 1})
+
+        constant = GenericInt(data=1)
+        steps = len(self.history.undo_steps())
+        constant.set_data(2)
+        constant.set_data(3)
+
+        self.assertEqual(len(self.history.undo_steps()), steps + 2)
+        self.history.undo()
+        self.assertEqual(constant.data(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import logging
+import unittest
+
+import backend.nodes
+from backend.logger import logger, get_logger, configure
+
+
+class TestLogger(unittest.TestCase):
+    def test_no_configuration_on_import(self):
+        self.assertTrue(any(isinstance(handler, logging.NullHandler) for handler in logger.handlers))
+        self.assertEqual(logger.level, logging.NOTSET)
+
+    def test_subsystem_loggers(self):
+        self.assertEqual(get_logger('backend.meta').name, 'backend.meta')
+        self.assertEqual(get_logger('plugins').name, 'backend.plugins')
+        self.assertIs(get_logger('backend.meta').parent, logger)
+
+    def test_configure(self):
+        handler = configure(logging.WARNING, handler=logging.NullHandler())
+        try:
+            self.assertIn(handler, logger.handlers)
+            self.assertFalse(get_logger('backend.meta').isEnabledFor(logging.DEBUG))
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(logging.NOTSET)
+
+
+if __name__ == '__main__':
+    unittest.main()
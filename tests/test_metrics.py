@@ -0,0 +1,89 @@
+import pathlib
+import tempfile
+import unittest
+import urllib.request
+
+from backend.meta import InstanceManager
+from backend.events import EventManager, Events
+from backend.data_types import GenericInt
+from backend.metrics import MetricsRegistry
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.event = EventManager().get_event_by_name(Events.PostTypeDataChanged.name)
+        self.callbacks = len(self.event.callbacks())
+        self.event.register(self.callback)
+
+    def tearDown(self):
+        self.event.deregister(self.callback)
+        self.registry.stop()
+
+    def callback(self, instance, *args, **kwargs):
+        pass
+
+    def test_snapshot(self):
+        constant = GenericInt()
+        constant.set_data(1)
+
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot['opennode_instances'], len(InstanceManager().instances()))
+        self.assertEqual(snapshot['opennode_event_callbacks']['PostTypeDataChanged'], self.callbacks + 1)
+        self.assertGreaterEqual(snapshot['opennode_events_triggered_total']['PostTypeDataChanged'], 1)
+
+        before = snapshot['opennode_events_triggered_total']['PostTypeDataChanged']
+        constant.set_data(2)
+        self.assertEqual(self.registry.snapshot()['opennode_events_triggered_total']['PostTypeDataChanged'],
+                         before + 1)
+
+    def test_events_without_callbacks_counted(self):
+        event = EventManager().get_event_by_name(Events.PreTypeDataChanged.name)
+        self.assertFalse(event.callbacks())
+
+        triggered = event.triggered()
+        GenericInt().set_data(1)
+        self.assertEqual(event.triggered(), triggered + 2)
+
+    def test_event_rate(self):
+        first = self.registry.snapshot()
+        GenericInt().set_data(1)
+        second = self.registry.snapshot(previous=first)
+
+        self.assertGreater(second['opennode_events_per_second'], 0)
+        self.assertEqual(self.registry.rate(first, second), second['opennode_events_per_second'])
+        self.assertNotIn('opennode_events_per_second', self.registry.snapshot())
+
+    def test_custom_metrics(self):
+        counter = self.registry.counter('test_loads_total', 'Loads.')
+        counter.inc(kind='graph')
+        counter.inc(2, kind='graph')
+        self.assertIs(self.registry.counter('test_loads_total'), counter)
+
+        gauge = self.registry.gauge('test_queue', 'Queue length.', lambda: 7)
+        try:
+            snapshot = self.registry.snapshot()
+            self.assertEqual(snapshot['opennode_test_loads_total'], {'graph': 3})
+            self.assertEqual(snapshot['opennode_test_queue'], 7)
+
+            text = self.registry.prometheus()
+            self.assertIn('# TYPE opennode_test_loads_total counter\nopennode_test_loads_total{kind="graph"} 3',
+                          text)
+            self.assertIn('opennode_test_queue 7\n', text)
+        finally:
+            self.registry.deregister(counter.name)
+            self.registry.deregister(gauge.name)
+
+    def test_exports(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.registry.write(pathlib.Path(directory) / 'opennode.prom')
+            self.assertIn('opennode_instances ', path.read_text())
+
+        server = self.registry.serve(port=0)
+        url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+        with urllib.request.urlopen(url, timeout=5) as response:
+            self.assertIn('# TYPE opennode_event_callbacks gauge', response.read().decode())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+import unittest
+
+from backend.aggregations import PortCollection
+from backend.data_types import GenericInt
+from backend.evaluation import EvaluationManager
+from backend.nodes import Node, ParameterNode, SumNode, SwitchNode
+from backend.ports import InputPort, OutputPort
+
+
+class CountingNode(ParameterNode):
+    calls = 0
+
+    def data(self):
+        CountingNode.calls += 1
+        return super().data()
+
+
+class CountingSumNode(SumNode):
+    calls = 0
+
+    def data(self):
+        CountingSumNode.calls += 1
+        return super().data()
+
+
+class SplitNode(Node):
+    output_dependencies = {'first': ('entry0', ),
+                           'second': ('entry1', )}
+
+    def init_inputs(self):
+        collection = PortCollection()
+
+        collection['entry0'] = InputPort(parent=self)
+        collection['entry1'] = InputPort(parent=self)
+
+        return collection
+
+    def init_outputs(self):
+        collection = PortCollection()
+
+        collection['first'] = OutputPort(parent=self)
+        collection['second'] = OutputPort(parent=self)
+
+        return collection
+
+    def compute_first(self):
+        return self.inputs['entry0'].data() * 10
+
+    def compute_second(self):
+        return self.inputs['entry1'].data() * 100
+
+
+class TestLazyEvaluation(unittest.TestCase):
+    def setUp(self):
+        self.first = CountingNode(value=1)
+        self.second = CountingNode(value=2)
+
+        CountingNode.calls = 0
+
+    def connect(self, output_port, input_port):
+        input_port.attributes['connections'].append_data(output_port)
+
+    def test_per_output_functions(self):
+        split = SplitNode()
+        self.connect(self.first.outputs['product'], split.inputs['entry0'])
+        self.connect(self.second.outputs['product'], split.inputs['entry1'])
+
+        consumer = SumNode()
+        self.connect(split.outputs['second'], consumer.inputs['entry0'])
+
+        self.assertEqual(consumer.data(), 200)
+        self.assertEqual(CountingNode.calls, 1)
+        self.assertEqual([name for name, _ in split.dependencies(split.outputs['first'])], ['entry0'])
+
+    def test_switch_evaluates_selected_branch(self):
+        switch = SwitchNode(selector=1)
+        self.connect(self.first.outputs['product'], switch.inputs['entry0'])
+        self.connect(self.second.outputs['product'], switch.inputs['entry1'])
+
+        consumer = SumNode()
+        self.connect(switch.outputs['product'], consumer.inputs['entry0'])
+
+        self.assertEqual(consumer.data(), 2)
+        self.assertEqual(CountingNode.calls, 1)
+
+        switch.attributes['selector'].attributes['value'].set_data(0)
+        self.assertEqual(consumer.data(), 1)
+        self.assertEqual(CountingNode.calls, 2)
+
+    def test_deep_chain(self):
+        previous = self.first
+        for _ in range(1000):
+            node = SumNode()
+            self.connect(previous.outputs['product'], node.inputs['entry0'])
+            self.connect(self.second.outputs['product'], node.inputs['entry1'])
+            previous = node
+
+        self.assertEqual(previous.outputs['product'].data(), 2001)
+        self.assertEqual(CountingNode.calls, 2)
+
+    def test_switch_out_of_range(self):
+        switch = SwitchNode(selector=5)
+
+        self.assertIsNone(switch.data())
+        self.assertEqual(switch.dependencies(), [])
+
+
+class TestBypassDisable(unittest.TestCase):
+    def setUp(self):
+        EvaluationManager().enable_retention()
+
+        self.parameter = ParameterNode(value=3)
+        self.first = CountingSumNode()
+        self.second = CountingSumNode()
+        self.sibling = CountingSumNode()
+
+        self.connect(self.parameter.outputs['product'], self.first.inputs['entry0'])
+        self.connect(self.parameter.outputs['product'], self.first.inputs['entry1'])
+        self.connect(self.first.outputs['product'], self.second.inputs['entry0'])
+        self.connect(self.parameter.outputs['product'], self.sibling.inputs['entry0'])
+
+        CountingSumNode.calls = 0
+
+    def tearDown(self):
+        EvaluationManager().disable_retention()
+
+    def connect(self, output_port, input_port):
+        input_port.attributes['connections'].append_data(output_port)
+
+    def test_bypass_routes_input(self):
+        self.assertEqual(self.first.outputs['product'].data(), 6)
+
+        self.first.set_bypassed(True)
+        self.assertEqual(self.first.outputs['product'].data(), 3)
+        self.assertEqual(self.first.dependencies(), [('entry0', self.first.inputs['entry0'])])
+
+        self.first.set_bypassed(False)
+        self.assertEqual(self.first.outputs['product'].data(), 6)
+
+    def test_disable_produces_default(self):
+        self.first.set_disabled(True)
+
+        self.assertIsNone(self.first.outputs['product'].data())
+        self.assertEqual(self.first.dependencies(), [])
+        self.assertEqual(CountingSumNode.calls, 0)
+
+    def test_disabled_node_feeds_consumer(self):
+        self.assertEqual(self.second.outputs['product'].data(), 6)
+
+        self.first.set_disabled(True)
+        self.assertEqual(self.second.outputs['product'].data(), 0)
+
+        self.first.set_disabled(False)
+        self.assertEqual(self.second.outputs['product'].data(), 6)
+
+    def test_toggle_invalidates_downstream_cone(self):
+        self.assertEqual(self.second.outputs['product'].data(), 6)
+        self.assertEqual(self.sibling.outputs['product'].data(), 3)
+        self.assertEqual(CountingSumNode.calls, 3)
+
+        self.first.set_bypassed(True)
+        self.assertFalse(EvaluationManager().retained(self.second))
+        self.assertTrue(EvaluationManager().retained(self.sibling))
+
+        self.assertEqual(self.second.outputs['product'].data(), 3)
+        self.assertEqual(self.sibling.outputs['product'].data(), 3)
+        self.assertEqual(CountingSumNode.calls, 4)
+
+    def test_attribute_change_invalidates_downstream_cone(self):
+        self.assertEqual(self.second.outputs['product'].data(), 6)
+        self.assertEqual(self.sibling.outputs['product'].data(), 3)
+
+        self.parameter.attributes['value'].attributes['value'].set_data(4)
+        self.assertEqual(self.second.outputs['product'].data(), 8)
+        self.assertEqual(self.sibling.outputs['product'].data(), 4)
+        self.assertEqual(CountingSumNode.calls, 6)
+
+    def test_new_types_keep_retained_results(self):
+        self.assertEqual(self.second.outputs['product'].data(), 6)
+
+        SumNode()
+        GenericInt(data=1).set_data(2)
+
+        self.assertTrue(EvaluationManager().retained(self.second))
+        self.assertEqual(self.second.outputs['product'].data(), 6)
+        self.assertEqual(CountingSumNode.calls, 2)
+
+    def test_serialized_state(self):
+        self.first.set_disabled(True)
+
+        data = self.first.serialize()
+        self.assertTrue(data['disabled'])
+        self.assertFalse(data['bypassed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
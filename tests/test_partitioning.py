@@ -0,0 +1,61 @@
+import unittest
+
+from backend.nodes import ParameterNode, SumNode
+from backend.graphs import Graph
+from backend.partitioning import GraphPartitioner, ParallelEvaluator
+
+
+class TestPartitioning(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph()
+
+        edges = []
+        for chain in range(3):
+            self.graph[f'parameter{chain}'] = ParameterNode(value=chain + 1)
+            previous = self.graph[f'parameter{chain}']
+
+            for depth in range(4):
+                node = self.graph[f'sum{chain}_{depth}'] = SumNode()
+                edges.append((previous.outputs['product'], node.inputs['entry0']))
+                edges.append((self.graph[f'parameter{chain}'].outputs['product'], node.inputs['entry1']))
+                previous = node
+
+        self.graph.connect_many(edges)
+        self.expected = {name: {'product': node.outputs['product'].data()} for name, node in self.graph.items()}
+
+    def test_partitions_cover_graph(self):
+        partitions = GraphPartitioner(4).partition(self.graph)
+
+        node_ids = [node_id for partition in partitions for node_id in partition.node_ids]
+        self.assertEqual(sorted(node_ids), sorted(node.get_id() for node in self.graph.values()))
+
+        for partition in partitions:
+            self.assertTrue(all(dependency < partition.index for dependency in partition.dependencies))
+
+    def test_split_component_exchanges_boundary(self):
+        partitions = GraphPartitioner(6).partition(self.graph)
+
+        self.assertTrue(any(partition.imports for partition in partitions))
+        for partition in partitions:
+            for port_id in partition.imports:
+                self.assertTrue(any(port_id in other.exports for other in partitions))
+
+    def test_parallel_evaluation(self):
+        results = ParallelEvaluator(processes=2, partitioner=GraphPartitioner(6)).evaluate(self.graph)
+
+        self.assertEqual(results, self.expected)
+
+    def test_parallel_evaluation_honors_node_state(self):
+        # a node inside the chain, its consumers still evaluate
+        self.graph['sum1_1'].set_disabled(True)
+        expected = {name: {'product': node.outputs['product'].data()} for name, node in self.graph.items()}
+
+        results = ParallelEvaluator(processes=2, partitioner=GraphPartitioner(6)).evaluate(self.graph)
+
+        self.assertIsNone(results['sum1_1']['product'])
+        self.assertEqual(results['sum1_2']['product'], 2)
+        self.assertEqual(results, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+import json
+import pathlib
+import tempfile
+import textwrap
+import unittest
+
+import backend.nodes
+from backend import registry
+from backend.plugins import PluginLoader, scan_source
+
+
+PLUGIN_SOURCE = textwrap.dedent('''
+    from backend import registry
+    from backend.registry import register_node, register_data_type
+    from backend.data_types import GenericStr
+    from backend.nodes import Node
+
+    LOADED = True
+
+
+    @register_node
+    class PluginNode(Node):
+        pass
+
+
+    @registry.register(registry.Category.TYPE)
+    class PluginName(GenericStr):
+        pass
+
+
+    class Helper:
+        pass
+''')
+
+
+class TestPlugins(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self.directory.name)
+
+        package = self.root / 'lazy_plugins'
+        package.mkdir()
+        (package / '__init__.py').write_text('')
+        (package / 'math_nodes.py').write_text(PLUGIN_SOURCE)
+
+        self.loader = PluginLoader()
+        self.loader.clear()
+        self.loader.configure([self.root], entry_points=False, cache_path=self.root / 'cache' / 'plugins.json')
+
+    def tearDown(self):
+        self.loader.configure()
+        self.loader.clear()
+
+        # classes registered by importing the plugin module must not leak into other tests
+        for category, name in ((registry.Category.NODE, 'PluginNode'), (registry.Category.TYPE, 'PluginName')):
+            registry._Registry[category].pop(name, None)
+            registry._Classes.pop(name, None)
+
+        if self.root.as_posix() in sys.path:
+            sys.path.remove(self.root.as_posix())
+        sys.modules.pop('lazy_plugins.math_nodes', None)
+        sys.modules.pop('lazy_plugins', None)
+        self.directory.cleanup()
+
+    def test_scan_source(self):
+        self.assertEqual(scan_source(PLUGIN_SOURCE), {'nodes': ['PluginNode'], 'types': ['PluginName']})
+
+    def test_lazy_import(self):
+        manifest = self.loader.discover()
+
+        self.assertEqual(manifest['nodes'], {'PluginNode': 'lazy_plugins.math_nodes'})
+        self.assertNotIn('lazy_plugins.math_nodes', sys.modules)
+
+        node_class = registry.registered_type(registry.Category.NODE, 'PluginNode')
+        self.assertEqual(node_class.__name__, 'PluginNode')
+        self.assertTrue(sys.modules['lazy_plugins.math_nodes'].LOADED)
+        self.assertEqual(registry.registered_type(registry.Category.TYPE, 'PluginName').__module__,
+                         'lazy_plugins.math_nodes')
+
+    def test_cache(self):
+        self.loader.discover()
+
+        cache = json.loads((self.root / 'cache' / 'plugins.json').read_text())
+        self.assertIn((self.root / 'lazy_plugins' / 'math_nodes.py').as_posix(), cache['files'])
+
+        # unchanged files are taken from the cache without being parsed
+        self.loader.clear()
+        path = (self.root / 'lazy_plugins' / 'math_nodes.py').as_posix()
+        cache['files'][path][3] = {'nodes': ['CachedNode']}
+        (self.root / 'cache' / 'plugins.json').write_text(json.dumps(cache))
+
+        self.assertEqual(self.loader.discover()['nodes'], {'CachedNode': 'lazy_plugins.math_nodes'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
 import pathlib
 import unittest
 
-from backend.meta import InstanceManager, ReferenceManager
-from backend.data_types import GenericStr
+from backend.meta import InstanceManager, ReferenceManager, UnresolvedReferencesError
+from backend.events import EventManager, Events
+from backend.data_types import GenericStr, DataTypeEnum
+from backend.compatibility import CompatibilityTable
+from backend.nodes import ParameterNode, SumNode
 from backend.ports import InputPort, OutputPort
 
 
@@ -33,6 +36,109 @@ class TestAttributeNode(unittest.TestCase):
 
         self.assertIn(out_port.get_id(), in_port.attributes['connections'].data())
 
+    def test_connection_references(self):
+        out_port = OutputPort(label='test_output')
+        other_port = OutputPort(label='test_other')
+        in_port = InputPort(label='test_input')
+
+        connections = in_port.attributes['connections']
+        connections.set_data([out_port])
+        connections.append_data(other_port)
+        self.assertEqual(connections.references(), [out_port, other_port])
+
+        other_port.delete()
+        self.assertEqual(connections.references(), [out_port])
+        self.assertIn(other_port.get_id(), connections.data())
+
+    def test_typed_connections(self):
+        str_port = OutputPort(data_type='Str')
+        int_port = OutputPort(data_type='Int')
+        untyped_port = OutputPort()
+        in_port = InputPort(data_type='Float')
+
+        connections = in_port.attributes['connections']
+        self.assertFalse(connections.append_data(str_port))
+        self.assertFalse(connections.extend_data([untyped_port, str_port]))
+        self.assertEqual(connections.data(), [])
+
+        self.assertTrue(connections.extend_data([int_port, untyped_port]))
+        self.assertEqual(in_port.data_type(), DataTypeEnum.DataType.Float)
+        self.assertEqual(in_port.serialize()['attributes']['data_type']['data'], 'Float')
+
+    def test_connection_conversion(self):
+        parameter = ParameterNode(value=3)
+        in_port = InputPort(data_type='Float')
+
+        in_port.attributes['connections'].append_data(parameter.outputs['product'])
+        self.assertIsInstance(in_port.data(), float)
+
+        in_port.attributes['connections'].set_data([])
+        self.assertEqual(in_port.data(), 0)
+
+    def test_retyped_connections(self):
+        parameter = ParameterNode(value=3)
+        in_port = InputPort()
+        in_port.attributes['connections'].append_data(parameter.outputs['product'])
+        self.assertIsInstance(in_port.data(), int)
+
+        self.assertTrue(in_port.attributes['data_type'].set_data('Float'))
+        self.assertIsInstance(in_port.data(), float)
+
+        self.assertFalse(in_port.attributes['data_type'].set_data('Str'))
+        self.assertEqual(in_port.data_type(), DataTypeEnum.DataType.Float)
+
+        output_type = parameter.outputs['product'].attributes['data_type']
+        self.assertFalse(output_type.set_data('Str'))
+        self.assertEqual(parameter.outputs['product'].data_type(), DataTypeEnum.DataType.Int)
+
+        self.assertTrue(in_port.attributes['data_type'].set_data('Int'))
+        self.assertIsInstance(in_port.data(), int)
+
+    def test_set_data_many_refused_type(self):
+        parameter = ParameterNode(value=3)
+        in_ports = [InputPort(), InputPort()]
+        for in_port in in_ports:
+            in_port.attributes['connections'].append_data(parameter.outputs['product'])
+
+        data_types = [in_port.attributes['data_type'] for in_port in in_ports]
+        self.assertFalse(DataTypeEnum.set_data_many(data_types, ['Float', 'Str']))
+
+        self.assertEqual([in_port.data_type() for in_port in in_ports], [None, None])
+        self.assertIsInstance(in_ports[0].data(), int)
+
+    def test_rejected_connections_keep_converters(self):
+        parameter = ParameterNode(value=3)
+        node = SumNode()
+        in_port = node.inputs['entry0']
+        in_port.attributes['data_type'].set_data('Float')
+        in_port.attributes['connections'].append_data(parameter.outputs['product'])
+        self.assertIsInstance(in_port.data(), float)
+
+        # the output of its own node makes a cycle
+        self.assertFalse(in_port.attributes['connections'].set_data([parameter.outputs['product'],
+                                                                     node.outputs['product']]))
+        self.assertIsInstance(in_port.data(), float)
+
+        other = ParameterNode(value=4)
+        self.assertTrue(in_port.attributes['connections'].set_data([other.outputs['product']]))
+        self.assertEqual(list(in_port._converters), [other.outputs['product'].get_id()])
+
+    def test_compatibility_table(self):
+        table = CompatibilityTable()
+        data_type = DataTypeEnum.DataType
+
+        self.assertTrue(table.is_compatible(data_type.Bool, data_type.Float))
+        self.assertFalse(table.is_compatible(data_type.Float, data_type.Int))
+        self.assertTrue(table.is_compatible(None, data_type.Str))
+        self.assertEqual(table.converter(data_type.Bool, data_type.Float)(True), 1.0)
+        self.assertIsNone(table.converter(data_type.Int, data_type.Int))
+
+        table.register_conversion(data_type.Float, data_type.Str, str)
+        self.assertEqual(table.converter(data_type.Bool, data_type.Str)(True), '1.0')
+
+        table.deregister_conversion(data_type.Float, data_type.Str)
+        self.assertFalse(table.is_compatible(data_type.Int, data_type.Str))
+
     def test_serialization(self):
         out_port = OutputPort(label='test_output')
         in_port = InputPort(label='test_input')
@@ -77,5 +183,65 @@ class TestAttributeNode(unittest.TestCase):
         self.assertIn(loaded_out_port.get_id(), loaded_in_port.attributes['connections'].data())
 
 
+class TestDeferredReferences(unittest.TestCase):
+    def setUp(self):
+        self.out_ports = [OutputPort(label=f'test_output{index}', mode='OUTPUT') for index in range(3)]
+        self.in_port = InputPort(label='test_input', mode='INPUT')
+        self.in_port.attributes['connections'].set_data(self.out_ports)
+
+        self.data = self.in_port.serialize()
+        self.out_port_data = [out_port.serialize() for out_port in self.out_ports]
+
+    def test_list_bound_once(self):
+        changed = []
+
+        def callback(instance, *args, **kwargs):
+            changed.append(instance)
+
+        InstanceManager().clear_all()
+        event = EventManager().get_event_by_name(Events.PostTypeDataChanged.name)
+        try:
+            with ReferenceManager():
+                loaded_in_port = InputPort.deserialize(self.data)
+                loaded_out_ports = [OutputPort.deserialize(data) for data in self.out_port_data]
+
+                # only the changes made when references are resolved
+                event.register(callback)
+        finally:
+            event.deregister(callback)
+
+        connections = loaded_in_port.attributes['connections']
+        self.assertEqual(connections.data(), [out_port.get_id() for out_port in loaded_out_ports])
+        self.assertEqual(changed.count(connections), 1)
+        self.assertEqual(ReferenceManager().unresolved(), {})
+
+    def test_unresolved_references_reported(self):
+        InstanceManager().clear_all()
+
+        with ReferenceManager():
+            loaded_in_port = InputPort.deserialize(self.data)
+            loaded_out_port = OutputPort.deserialize(self.out_port_data[0])
+
+        missing = ReferenceManager().unresolved()
+        self.assertEqual(set(missing), {out_port.get_id() for out_port in self.out_ports[1:]})
+        self.assertEqual(loaded_in_port.attributes['connections'].data(), [loaded_out_port.get_id()])
+
+    def test_strict_mode_raises(self):
+        InstanceManager().clear_all()
+
+        with self.assertRaises(UnresolvedReferencesError) as context:
+            with ReferenceManager().load(strict=True):
+                InputPort.deserialize(self.data)
+
+        self.assertEqual(len(context.exception.missing), 3)
+        self.assertEqual(ReferenceManager().pending(), 0)
+
+        # strict applies to that load only
+        InstanceManager().clear_all()
+        with ReferenceManager():
+            InputPort.deserialize(self.data)
+        self.assertEqual(len(ReferenceManager().unresolved()), 3)
+
+
 if __name__ == '__main__':
     unittest.main()
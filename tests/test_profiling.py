@@ -0,0 +1,80 @@
+import json
+import pathlib
+import tempfile
+import unittest
+
+from backend.nodes import ParameterNode, SumNode
+from backend.graphs import Graph
+from backend.evaluation import EvaluationManager
+from backend.caching import MemoizationCache
+from backend.profiling import Profiler
+
+
+class MemoizedSum(SumNode):
+    memoize = True
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        # parameter feeds both inputs of the sum node, the second read is served by the evaluation pass
+        self.graph = Graph()
+        self.parameter = self.graph['parameter'] = ParameterNode(value=2)
+        self.sum = self.graph['sum'] = MemoizedSum()
+        self.sink = self.graph['sink'] = SumNode()
+
+        self.graph.connect_many([(self.parameter.outputs['product'], self.sum.inputs['entry0']),
+                                 (self.parameter.outputs['product'], self.sum.inputs['entry1']),
+                                 (self.sum.outputs['product'], self.sink.inputs['entry0'])])
+
+    def test_timings(self):
+        with Profiler(names=self.graph) as profiler:
+            self.assertEqual(self.sink.outputs['product'].data(), 4)
+
+        self.assertIsNone(EvaluationManager().profiler())
+
+        parameter, sum_node, sink = (profiler.timing(node) for node in (self.parameter, self.sum, self.sink))
+        self.assertEqual((parameter.label, parameter.calls, parameter.hits), ('parameter', 1, 1))
+        self.assertEqual((sink.calls, sink.computations), (1, 1))
+        self.assertGreaterEqual(sink.cumulative, sum_node.cumulative + sink.self_time)
+        self.assertGreaterEqual(sum_node.cumulative, parameter.cumulative)
+
+        self.assertIn('sink;sum;parameter ', profiler.folded())
+        self.assertTrue(profiler.table().splitlines()[0].startswith('node'))
+        self.assertEqual(len(profiler.table(limit=1).splitlines()), 2)
+
+    def test_middleware_cache_hits(self):
+        cache = MemoizationCache()
+        cache.clear()
+        cache.install()
+        try:
+            with Profiler() as profiler:
+                self.sink.outputs['product'].data()
+                self.sink.outputs['product'].data()
+        finally:
+            cache.uninstall()
+
+        timing = profiler.timing(self.sum)
+        self.assertEqual((timing.calls, timing.computations, timing.cache_hits()), (2, 1, 1))
+
+    def test_chrome_trace(self):
+        with Profiler(trace=True) as profiler:
+            self.sink.outputs['product'].data()
+
+        events = profiler.chrome_trace()['traceEvents']
+        self.assertEqual(len(events), 3)
+        self.assertTrue(all(event['ph'] == 'X' for event in events))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = profiler.write_chrome_trace(pathlib.Path(directory) / 'trace.json')
+            self.assertEqual(json.loads(path.read_text())['traceEvents'], events)
+
+    def test_disabled(self):
+        profiler = Profiler()
+        self.sink.outputs['product'].data()
+
+        self.assertFalse(profiler.is_enabled())
+        self.assertEqual(profiler.timings(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
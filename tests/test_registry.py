@@ -0,0 +1,72 @@
+import sys
+import unittest
+import subprocess
+
+import backend.nodes
+from backend import registry
+
+
+class TestRegistry(unittest.TestCase):
+    def test_deferred_lookup(self):
+        # a fresh interpreter, modules already imported by other tests would hide the deferred import
+        code = ('import sys\n'
+                'from backend import registry\n'
+                'registry.register_deferred(registry.Category.NODE, "RangeNode", "backend.streaming")\n'
+                'assert "backend.streaming" not in sys.modules\n'
+                'assert registry.registered_type(registry.Category.NODE, "RangeNode").__name__ == "RangeNode"\n'
+                'assert "backend.streaming" in sys.modules\n'
+                'assert "numpy" not in sys.modules\n')
+
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    def test_deferred_does_not_override(self):
+        registry.register_deferred(registry.Category.NODE, 'SumNode', 'backend.missing')
+
+        self.assertIsNotNone(registry.registered_type(registry.Category.NODE, 'SumNode'))
+
+    def test_registered_types_imports_deferred(self):
+        registry.register_deferred(registry.Category.NODE, 'CompoundNode', 'backend.compounds')
+
+        self.assertIn('CompoundNode', registry.registered_types(registry.Category.NODE))
+
+    def test_resolve(self):
+        self.assertEqual(registry.resolve('SumNode').__name__, 'SumNode')
+        self.assertEqual(registry.resolve('IntAttribute', registry.Category.ATTRIBUTE).__name__, 'IntAttribute')
+
+        with self.assertRaises(KeyError):
+            registry.resolve('MissingNode', registry.Category.NODE)
+
+    def test_resolve_conflict(self):
+        port_class = registry.register(registry.Category.PORT)(type('ConflictingName', (), {}))
+        collection_class = registry.register(registry.Category.COLLECTION)(type('ConflictingName', (), {}))
+
+        try:
+            self.assertEqual(registry.conflicts()['ConflictingName'],
+                             {registry.Category.PORT, registry.Category.COLLECTION})
+            self.assertIs(registry.resolve('ConflictingName', registry.Category.COLLECTION), collection_class)
+            self.assertIs(registry.resolve('ConflictingName', registry.Category.PORT), port_class)
+        finally:
+            registry._Registry[registry.Category.PORT].pop('ConflictingName')
+            registry._Registry[registry.Category.COLLECTION].pop('ConflictingName')
+            registry._Classes.pop('ConflictingName')
+            registry._Conflicts.pop('ConflictingName')
+
+    def test_resolve_checks_category(self):
+        type_class = registry.register(registry.Category.TYPE)(type('CategorizedName', (), {}))
+
+        try:
+            with self.assertRaises(KeyError):
+                registry.resolve('CategorizedName', registry.Category.NODE)
+
+            registry.register_deferred(registry.Category.NODE, 'CategorizedName', 'backend.missing')
+            self.assertEqual(registry.conflicts()['CategorizedName'], {registry.Category.TYPE, registry.Category.NODE})
+            self.assertIs(registry.resolve('CategorizedName', registry.Category.TYPE), type_class)
+        finally:
+            registry.deregister_deferred(registry.Category.NODE, 'CategorizedName')
+            registry._Registry[registry.Category.TYPE].pop('CategorizedName')
+            registry._Classes.pop('CategorizedName')
+            registry._Conflicts.pop('CategorizedName', None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import unittest
+
+from backend.nodes import ParameterNode, SumNode
+from backend.streaming import Stream, StreamingNode, RangeNode, ScaleNode, StreamSumNode
+from backend.aggregations import PortCollection
+from backend.ports import OutputPort
+
+
+class CountingRangeNode(StreamingNode):
+    chunk_size = 10
+
+    def __init__(self, **kwargs):
+        self.produced = 0
+
+        super().__init__(**kwargs)
+
+    def init_outputs(self):
+        collection = PortCollection()
+
+        collection['product'] = OutputPort(parent=self)
+
+        return collection
+
+    def chunks(self):
+        for offset in range(0, 100, self.chunk_size):
+            self.produced += 1
+            yield list(range(offset, offset + self.chunk_size))
+
+
+class AsyncRangeNode(StreamingNode):
+    def init_outputs(self):
+        collection = PortCollection()
+
+        collection['product'] = OutputPort(parent=self)
+
+        return collection
+
+    async def chunks(self):
+        for offset in range(0, 6, 2):
+            await asyncio.sleep(0)
+            yield [offset, offset + 1]
+
+
+class TestStreaming(unittest.TestCase):
+    def connect(self, output_port, input_port):
+        input_port.attributes['connections'].append_data(output_port)
+
+    def test_pipeline(self):
+        source = RangeNode(start=0, stop=5000)
+        scale = ScaleNode(factor=2)
+        total = StreamSumNode()
+
+        self.connect(source.outputs['product'], scale.inputs['entry0'])
+        self.connect(scale.outputs['product'], total.inputs['entry0'])
+
+        self.assertTrue(scale.outputs['product'].is_streaming())
+        self.assertFalse(total.outputs['product'].is_streaming())
+        self.assertEqual(total.outputs['product'].data(), 2 * sum(range(5000)))
+
+        chunks = list(scale.outputs['product'].data())
+        self.assertEqual(len(chunks), 5)
+        self.assertTrue(all(len(chunk) <= RangeNode.chunk_size for chunk in chunks))
+
+    def test_chunks_produced_on_demand(self):
+        source = CountingRangeNode()
+        chunks = iter(source.outputs['product'].data())
+
+        next(chunks)
+        next(chunks)
+        self.assertEqual(source.produced, 2)
+
+    def test_materialized_for_regular_consumers(self):
+        source = RangeNode(start=0, stop=3)
+        parameter = ParameterNode(value=4)
+
+        consumer = SumNode()
+        self.connect(source.outputs['product'], consumer.inputs['entry0'])
+        self.assertEqual(consumer.inputs['entry0'].data(), [0, 1, 2])
+
+        scale = ScaleNode(factor=3)
+        self.connect(parameter.outputs['product'], scale.inputs['entry0'])
+        self.assertEqual(scale.outputs['product'].data().collect(), [12])
+
+    def test_async_source(self):
+        source = AsyncRangeNode()
+        stream = source.outputs['product'].data()
+
+        self.assertEqual(stream.collect(), list(range(6)))
+
+        async def consume():
+            return [chunk async for chunk in stream]
+
+        self.assertEqual(asyncio.run(consume()), [[0, 1], [2, 3], [4, 5]])
+
+    def test_async_source_inside_running_loop(self):
+        stream = AsyncRangeNode().outputs['product'].data()
+
+        async def consume():
+            return stream.collect()
+
+        self.assertEqual(asyncio.run(consume()), list(range(6)))
+
+    def test_fan_out_runs_source_per_consumer(self):
+        source = CountingRangeNode()
+        first = ScaleNode(factor=1)
+        second = ScaleNode(factor=2)
+        self.connect(source.outputs['product'], first.inputs['entry0'])
+        self.connect(source.outputs['product'], second.inputs['entry0'])
+
+        self.assertEqual(first.outputs['product'].data().collect(), list(range(100)))
+        self.assertEqual(second.outputs['product'].data().collect(), [item * 2 for item in range(100)])
+        self.assertEqual(source.produced, 20)
+
+    def test_buffered_back_pressure(self):
+        source = CountingRangeNode()
+        stream = source.outputs['product'].data()
+
+        async def consume():
+            ahead = []
+            consumed = 0
+            async for _ in stream.buffered(max_chunks=2):
+                consumed += 1
+                await asyncio.sleep(0)
+                ahead.append(source.produced - consumed)
+
+            return ahead
+
+        self.assertLessEqual(max(asyncio.run(consume())), 3)
+        self.assertEqual(source.produced, 10)
+
+    def test_from_value(self):
+        self.assertEqual(Stream.from_value([1, 2]).collect(), [1, 2])
+        self.assertEqual(Stream.from_value(3).collect(), [3])
+        self.assertEqual(Stream.from_value(Stream.from_value(3)).map(lambda chunk: chunk * 2).collect(), [3, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
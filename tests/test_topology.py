@@ -0,0 +1,79 @@
+import unittest
+
+from backend.topology import TopologyManager
+from backend.nodes import ParameterNode, SumNode
+from backend.graphs import Graph
+
+
+class TestTopology(unittest.TestCase):
+    def setUp(self):
+        self.parameter = ParameterNode(value=1)
+        self.first = SumNode()
+        self.second = SumNode()
+
+        self.first.inputs['entry0'].attributes['connections'].set_data([self.parameter.outputs['product']])
+        self.second.inputs['entry0'].attributes['connections'].set_data([self.first.outputs['product']])
+
+    def assertOrdered(self, *nodes):
+        positions = [TopologyManager().position(node.get_id()) for node in nodes]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_order(self):
+        self.assertOrdered(self.parameter, self.first, self.second)
+
+    def test_reorder_on_connect(self):
+        upstream = SumNode()
+
+        self.assertTrue(self.first.inputs['entry1'].attributes['connections'].append_data(upstream.outputs['product']))
+        self.assertTrue(upstream.inputs['entry1'].attributes['connections'].append_data(
+            self.parameter.outputs['product']))
+
+        self.assertOrdered(self.parameter, upstream, self.first, self.second)
+
+    def test_reject_cycle(self):
+        connections = self.first.inputs['entry1'].attributes['connections']
+
+        self.assertFalse(connections.append_data(self.second.outputs['product']))
+        self.assertEqual(connections.data(), [])
+
+        self.assertFalse(connections.set_data([self.first.outputs['product']]))
+        self.assertEqual(self.second.data(), 1)
+
+    def test_replace_rolls_back(self):
+        connections = self.second.inputs['entry0'].attributes['connections']
+        self.assertFalse(connections.set_data([self.parameter.outputs['product'], self.second.outputs['product']]))
+
+        self.assertEqual(connections.data(), [self.first.outputs['product'].get_id()])
+        self.assertFalse(self.first.inputs['entry1'].attributes['connections'].append_data(
+            self.second.outputs['product']))
+
+    def test_disconnect_allows_reverse_edge(self):
+        self.second.inputs['entry0'].attributes['connections'].del_data()
+
+        self.assertTrue(self.first.inputs['entry1'].attributes['connections'].append_data(
+            self.second.outputs['product']))
+        self.assertOrdered(self.second, self.first)
+
+    def test_discard_node_drops_edges(self):
+        topology = TopologyManager()
+        output_id = self.parameter.outputs['product'].get_id()
+        input_id = self.second.inputs['entry0'].get_id()
+
+        self.first.delete()
+
+        self.assertEqual(topology.port_edges(output_id), [])
+        self.assertEqual(topology.port_edges(input_id), [])
+        self.assertEqual(topology.predecessors(self.second.get_id()), [])
+        self.assertIsNone(topology.position(self.first.get_id()))
+
+    def test_graph_rejects_cycle_batch(self):
+        graph = Graph(parameter=self.parameter, first=self.first, second=self.second)
+        self.assertFalse(graph.connect_many([(self.parameter.outputs['product'], self.second.inputs['entry1']),
+                                             (self.second.outputs['product'], self.first.inputs['entry1'])]))
+
+        self.assertEqual(self.second.inputs['entry1'].attributes['connections'].data(), [])
+        self.assertEqual(graph.topological_order(), [self.parameter, self.first, self.second])
+
+
+if __name__ == '__main__':
+    unittest.main()